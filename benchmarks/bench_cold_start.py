@@ -0,0 +1,63 @@
+"""Cold-start time of an API worker: importing backend.main in a fresh interpreter.
+
+Each sample is a new Python process, as an autoscaler would start one, so
+nothing is shared through the module cache. The "eager" rows preload the
+Gemini SDK and pdfplumber first, which is what importing the app used to do,
+to show what lazy loading saves. With --startup the app's startup work
+(schema check and category seeding) is timed too, against the database named
+by the db_* environment variables.
+
+    python -m benchmarks.bench_cold_start [--repeat 10] [--startup]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import SRC, describe_ms
+
+EAGER_PRELOAD = "import pdfplumber\nfrom google import genai\ngenai.Client(api_key='benchmark')"
+
+PROBE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+{preload}
+import backend.main
+imported = time.perf_counter()
+result = {{
+    "import": imported - started,
+    "heavy_loaded": sorted(m for m in ("google.genai", "pdfplumber") if m in sys.modules),
+}}
+if {startup}:
+    from backend.database.database_connection.database_client import init_db
+    asyncio.run(init_db())
+    result["startup"] = time.perf_counter() - imported
+print(json.dumps(result))
+"""
+
+
+def _sample(preload: str, startup: bool) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(preload=preload, startup=startup)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(repeat: int, startup: bool) -> None:
+    for label, preload in (("lazy (as shipped)", ""), ("eager genai + pdfplumber", EAGER_PRELOAD)):
+        samples = [_sample(preload, startup) for _ in range(repeat)]
+        print(describe_ms(f"import, {label}", [s["import"] for s in samples]))
+        if startup:
+            print(describe_ms(f"init_db, {label}", [s["startup"] for s in samples]))
+        print(f"  heavy modules loaded at import: {', '.join(samples[0]['heavy_loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--startup", action="store_true", help="also time init_db against the configured database")
+    args = parser.parse_args()
+    main(args.repeat, args.startup)
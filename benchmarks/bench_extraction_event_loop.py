@@ -0,0 +1,95 @@
+"""Unrelated-endpoint latency while statement extraction waits on a slow model.
+
+Compares a stub model that blocks the event loop (what calling the synchronous
+SDK from an async handler does) with one that awaits (the async SDK client the
+service now uses). Extraction runs on the API's event loop, as the ingestion
+workers do, so with the async client /income_summary latency should stay flat
+while uploads are being processed.
+
+    python -m benchmarks.bench_extraction_event_loop [--uploads 4] [--model-delay 1.0]
+"""
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from benchmarks.common import build_app, describe_ms
+
+import httpx
+
+import backend.services.transaction_service as transaction_service_module
+from backend.services.transaction_service import transaction_service
+
+STATEMENT = "01/03/2024 UBER TRIP 2,500.00 DR\n"
+
+
+class StubModels:
+    def __init__(self, delay: float, blocking: bool):
+        self.delay = delay
+        self.blocking = blocking
+
+    async def generate_content(self, model, contents, config):
+        if self.blocking:
+            time.sleep(self.delay)
+        else:
+            await asyncio.sleep(self.delay)
+        return SimpleNamespace(text=json.dumps([{
+            "date": "2024-03-01", "amount": 2500, "category": "Transport",
+            "transaction_type": "EXPENSE", "to_from": "Uber", "description": "Trip",
+        }]))
+
+
+class SummaryDb:
+    async def scalar(self, statement):
+        return 0.0
+
+
+PROBE_INTERVAL = 0.02
+
+
+async def _probe(client: httpx.AsyncClient, stop: asyncio.Event, samples: list[float]) -> None:
+    # latency is measured from when each probe was *due*, so time spent waiting for a
+    # blocked event loop to send it counts (no coordinated omission)
+    due = time.perf_counter()
+    while not stop.is_set():
+        response = await client.get("/transactions/income_summary")
+        response.raise_for_status()
+        samples.append(time.perf_counter() - due)
+        due += PROBE_INTERVAL
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+
+async def _extract() -> None:
+    # what an ingestion worker does for each queued upload
+    await transaction_service.extraction_transactions_from_text(STATEMENT)
+
+
+async def run_scenario(label: str, uploads: int, delay: float, blocking: bool) -> None:
+    transaction_service_module.client = SimpleNamespace(aio=SimpleNamespace(models=StubModels(delay, blocking)))
+    app = build_app(db_factory=SummaryDb)
+    samples: list[float] = []
+    stop = asyncio.Event()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        probe = asyncio.create_task(_probe(client, stop, samples))
+        if uploads:
+            await asyncio.gather(*(_extract() for _ in range(uploads)))
+        else:
+            await asyncio.sleep(delay)
+        stop.set()
+        await probe
+    print(describe_ms(label, samples))
+
+
+async def main(uploads: int, delay: float) -> None:
+    await run_scenario("idle (no uploads)", 0, delay, blocking=False)
+    await run_scenario(f"{uploads} uploads, blocking model call", uploads, delay, blocking=True)
+    await run_scenario(f"{uploads} uploads, async model call", uploads, delay, blocking=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=4)
+    parser.add_argument("--model-delay", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.uploads, args.model_delay))
@@ -0,0 +1,90 @@
+"""Unrelated-endpoint latency and login throughput during a login storm.
+
+Fires a burst of concurrent logins (real Argon2 verification, user lookup
+stubbed) while probing /income_summary, first with verification called
+directly on the event loop (the old behaviour), then on the bounded hashing
+executor. Logins refused with 503 by the executor's queue limit are counted.
+
+    python -m benchmarks.bench_login_storm [--logins 60] [--max-pending 32]
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from benchmarks.common import build_app, describe_ms
+
+import httpx
+
+import backend.services.user_service as user_service_module
+from backend.services.user_service import PasswordHashExecutor, user_service
+
+PASSWORD = "S3cureP@ss!"
+PROBE_INTERVAL = 0.02
+
+
+class SummaryDb:
+    async def scalar(self, statement):
+        return 0.0
+
+
+async def _probe(client: httpx.AsyncClient, stop: asyncio.Event, samples: list[float]) -> None:
+    # measured from when each probe was due, so time stuck behind a blocked loop counts
+    due = time.perf_counter()
+    while not stop.is_set():
+        response = await client.get("/transactions/income_summary")
+        response.raise_for_status()
+        samples.append(time.perf_counter() - due)
+        due += PROBE_INTERVAL
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+
+async def _login(client: httpx.AsyncClient, statuses: list[int]) -> None:
+    response = await client.post("/users/login", data={"username": "storm@example.com", "password": PASSWORD})
+    statuses.append(response.status_code)
+
+
+async def run_scenario(label: str, logins: int, on_loop: bool, max_pending: int) -> None:
+    user_service_module.password_hash_executor = PasswordHashExecutor(user_service_module.PASSWORD_HASH_WORKERS, max_pending)
+    if on_loop:
+        async def verify_on_loop(plain_password, hashed_password):
+            return user_service.verify_password(plain_password, hashed_password)
+
+        user_service.verify_password_async = verify_on_loop
+    else:
+        user_service.__dict__.pop("verify_password_async", None)
+
+    app = build_app(db_factory=SummaryDb)
+    samples: list[float] = []
+    statuses: list[int] = []
+    stop = asyncio.Event()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        probe = asyncio.create_task(_probe(client, stop, samples))
+        await asyncio.sleep(0.1)
+        started = time.perf_counter()
+        await asyncio.gather(*(_login(client, statuses) for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+    ok = statuses.count(200)
+    print(describe_ms(label, samples))
+    print(f"{'':<40} logins ok={ok} shed(503)={statuses.count(503)} throughput={ok / elapsed:.1f}/s")
+
+
+async def main(logins: int, max_pending: int) -> None:
+    hashed = user_service.hash_password(PASSWORD)
+
+    async def get_user_by_email(db, email):
+        return SimpleNamespace(user_id="storm-user", password=hashed)
+
+    user_service.get_user_by_email = get_user_by_email
+    await run_scenario(f"{logins} logins, verify on event loop", logins, True, max_pending)
+    await run_scenario(f"{logins} logins, bounded executor", logins, False, max_pending)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=60)
+    parser.add_argument("--max-pending", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.max_pending))
@@ -0,0 +1,65 @@
+"""PDF text extraction throughput vs process-pool size.
+
+Generates a synthetic multi-page statement and extracts every page's text with
+1, 2, 4 ... processes (up to the core count), the same page-range split and
+ordered reassembly ingestion uses for large PDFs. Throughput should scale with
+cores until pages per process get small.
+
+    python -m benchmarks.bench_pdf_text [--pages 120] [--pages-per-task 8] [--repeat 3] [--processes 1 2 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import ROOT  # noqa: F401 - puts src/ on sys.path
+
+from backend.services import pdf_text
+from tests.pdf_factory import make_table_pdf
+
+HEADER = ["Trans. Date", "Value Date", "Reference", "Debits", "Credits", "Balance", "Originating Branch", "Remarks"]
+
+
+def _pool_sizes() -> list[int]:
+    cores = os.cpu_count() or 1
+    sizes = [1]
+    while sizes[-1] * 2 <= cores:
+        sizes.append(sizes[-1] * 2)
+    if sizes[-1] != cores:
+        sizes.append(cores)
+    return sizes
+
+
+def main(pages: int, pages_per_task: int, repeat: int, pool_sizes: list[int]) -> None:
+    rows = [
+        ["02-Mar-2024", "02-Mar-2024", f"REF{i}", "2,500.00", "", "60,000.00", "Lekki", f"POS UBER TRIP {i}"]
+        for i in range(pages * 30)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "statement.pdf")
+        with open(path, "wb") as handle:
+            handle.write(make_table_pdf(HEADER, rows, rows_per_page=30))
+
+        baseline = None
+        for processes in pool_sizes:
+            # warm-up run starts the pool so process start-up is not timed
+            list(pdf_text.iter_pdf_pages(path, processes=processes, pages_per_task=pages_per_task, min_parallel_pages=1))
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                texts = list(pdf_text.iter_pdf_pages(path, processes=processes, pages_per_task=pages_per_task, min_parallel_pages=1))
+                best = min(best, time.perf_counter() - started)
+            assert len(texts) == pages
+            baseline = baseline or best
+            print(f"{processes:>3} processes  {best * 1000:9.1f}ms  {pages / best:8.1f} pages/s  speedup x{baseline / best:.2f}")
+        pdf_text.shutdown_pdf_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=120)
+    parser.add_argument("--pages-per-task", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--processes", type=int, nargs="+", help="pool sizes to compare (default: 1, 2, 4 ... cores)")
+    args = parser.parse_args()
+    main(args.pages, args.pages_per_task, args.repeat, args.processes or _pool_sizes())
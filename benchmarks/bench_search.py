@@ -0,0 +1,102 @@
+"""Latency of /transactions/search over a large multi-user transaction table.
+
+Seeds --rows transactions (one million by default) spread over --users users
+with realistic card-statement merchants, then times ranked searches for one
+user: a common merchant, a rare one, a prefix and a two-word query. Needs a
+disposable PostgreSQL database migrated to head (alembic upgrade head), named
+by the db_* environment variables or --url. Reports whether pg_trgm fuzzy
+matching was in use.
+
+    python -m benchmarks.bench_search [--rows 1000000] [--users 200] [--repeat 100] [--url URL]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import describe_ms
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.services.search_service import SearchService
+
+PROBE_USER = "bench-search-7"
+MERCHANTS = [
+    "UBER *TRIP HELP.UBER.COM", "UBER *EATS", "NETFLIX.COM", "SPOTIFY P1A2B3", "AMAZON MKTPLACE PMTS",
+    "TESCO STORES 3021", "SAINSBURYS S/MKTS", "SHELL ELSTREE", "TFL TRAVEL CH", "PRET A MANGER",
+    "STARBUCKS COFFEE", "APPLE.COM/BILL", "GOOGLE *YOUTUBE", "DELIVEROO", "BOOTS 1142",
+    "VODAFONE LTD", "BRITISH GAS", "THAMES WATER", "COSTA COFFEE", "MCDONALDS 1203",
+    "AIRBNB * HMQ2", "RYANAIR", "TRAINLINE", "JUST EAT", "ARGOS LTD",
+    "CURRYS PC WORLD", "H&M 0421", "ZARA UK", "IKEA LTD", "WAITROSE 772",
+    "LIDL GB", "ALDI STORES", "GYMSHARK", "PUREGYM", "PAYPAL *STEAM",
+    "NINTENDO ESHOP", "DISNEY PLUS", "AUDIBLE UK", "ODEON CINEMAS", "KINDLE SVCS",
+]
+QUERIES = {
+    "common merchant (uber)": "uber",
+    "rare merchant (odeon)": "odeon",
+    "prefix (netfl)": "netfl",
+    "two words (costa coffee)": "costa coffee",
+}
+
+
+async def _seed(engine, sessionmaker, rows: int, users: int) -> None:
+    async with sessionmaker() as db:
+        if await db.scalar(text("SELECT count(*) FROM transactions WHERE user_id = :u"), {"u": PROBE_USER}):
+            return
+        await db.execute(text(
+            "INSERT INTO users (user_id, first_name, last_name, email, password, create_date) "
+            "SELECT 'bench-search-' || u, 'Bench', 'Search', 'bench-search-' || u || '@example.com', 'x', now() "
+            "FROM generate_series(1, :users) AS u ON CONFLICT DO NOTHING"
+        ), {"users": users})
+        await db.execute(text(
+            "INSERT INTO categories (category_name, user_id, create_date, is_system, is_deleted) "
+            "SELECT 'bench ' || c, NULL, now(), true, false FROM generate_series(1, 12) AS c "
+            "WHERE NOT EXISTS (SELECT 1 FROM categories)"
+        ))
+        await db.execute(text(
+            "INSERT INTO transactions (transaction_id, fingerprint, user_id, date, amount, transaction_type, category_id, to_from, description) "
+            "SELECT md5('search' || t), md5('search' || t), 'bench-search-' || (1 + t % :users), DATE '2016-01-01' + (t % 3650), "
+            "(t % 300) + 0.99, 'EXPENSE'::transactiontypeenum, (SELECT min(category_id) FROM categories) + (t % 12), "
+            # skewed so merchants early in the list are common and late ones rare
+            "(CAST(:merchants AS text[]))[1 + floor(:merchant_count * power((t / :users) % 1000 / 1000.0, 2))::int], "
+            "'Card payment ref ' || t "
+            "FROM generate_series(1, :rows) AS t"
+        ), {"users": users, "rows": rows, "merchants": MERCHANTS, "merchant_count": len(MERCHANTS)})
+        await db.commit()
+    # flush the GIN pending list as autovacuum eventually would, so scans see the built index
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE transactions"))
+
+
+async def main(rows: int, users: int, repeat: int, url: str | None) -> None:
+    if url:
+        engine = create_async_engine(url)
+    else:
+        from backend.database.database_connection.database_config import engine
+    sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await _seed(engine, sessionmaker, rows, users)
+
+    service = SearchService()
+    async with sessionmaker() as db:
+        total = await db.scalar(text("SELECT count(*) FROM transactions"))
+        print(f"{total} transactions, {rows // users} for the probe user; pg_trgm fuzzy matching: {await service._has_trigram(db)}")
+        for label, query in QUERIES.items():
+            await service.search_transactions(db, PROBE_USER, query, 20)
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await service.search_transactions(db, PROBE_USER, query, 20)
+                samples.append(time.perf_counter() - started)
+            print(describe_ms(label, samples))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--url", help="database URL (defaults to the app's db_* settings)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.users, args.repeat, args.url))
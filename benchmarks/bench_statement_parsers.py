@@ -0,0 +1,82 @@
+"""Deterministic table parser vs LLM extraction for a known bank statement layout.
+
+Generates GTBank-layout PDFs of increasing length and times both extraction
+paths an ingestion job can take: the registered table parser, and text
+extraction followed by the chunked model calls (stubbed with a fixed
+per-call latency standing in for a Gemini round trip).
+
+    python -m benchmarks.bench_statement_parsers [--rows 50 500] [--repeat 5] [--model-delay 3.0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.common import describe_ms
+
+import backend.services.transaction_service as transaction_service_module
+from backend.services.transaction_service import transaction_service
+from tests.pdf_factory import make_table_pdf
+
+HEADER = ["Trans. Date", "Value Date", "Reference", "Debits", "Credits", "Balance", "Originating Branch", "Remarks"]
+
+
+class StubModels:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def generate_content(self, model, contents, config):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(text=json.dumps([{
+            "date": "2024-03-02", "amount": 2500, "category": "Transport",
+            "transaction_type": "EXPENSE", "to_from": "Uber", "description": "Trip",
+        }]))
+
+
+def _statement(rows: int) -> bytes:
+    body = [
+        ["02-Mar-2024", "02-Mar-2024", f"REF{i}", "2,500.00", "", "60,000.00", "Lekki", f"POS UBER TRIP {i}"]
+        for i in range(rows)
+    ]
+    return make_table_pdf(HEADER, body, rows_per_page=30)
+
+
+async def _time(repeat: int, func) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def main(row_counts: list[int], repeat: int, delay: float) -> None:
+    transaction_service_module.client = SimpleNamespace(aio=SimpleNamespace(models=StubModels(delay)))
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            path = os.path.join(tmp, f"statement-{rows}.pdf")
+            with open(path, "wb") as handle:
+                handle.write(_statement(rows))
+
+            async def parser_path():
+                parsed = await transaction_service.parse_statement_tables(path, "statement.pdf")
+                assert parsed is not None and len(parsed.transactions) == rows
+
+            async def llm_path():
+                chunks = await transaction_service.read_statement_chunks(path, "statement.pdf")
+                await transaction_service.extract_statement_chunks(chunks)
+
+            print(describe_ms(f"{rows} rows, table parser", await _time(repeat, parser_path)))
+            print(describe_ms(f"{rows} rows, text + LLM ({delay:.1f}s/call)", await _time(max(1, repeat // 5), llm_path)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--model-delay", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat, args.model_delay))
@@ -0,0 +1,120 @@
+"""Latency of /transactions/query against the per-month service methods it replaces.
+
+Answers "this month's expenses over 50 in two categories" both ways: the old
+path lists the whole month with get_transactions_by_month (full ORM rows plus
+a category load) and filters client-side, then fetches the month's expense
+total; the new path sends one filtered, projected query. A plain month listing
+is timed both ways too. Needs a disposable PostgreSQL database with the schema
+in place (alembic upgrade head), named by the db_* environment variables or
+--url; a benchmark user is seeded on first run.
+
+    python -m benchmarks.bench_transaction_query [--rows 50000] [--repeat 200] [--url URL]
+"""
+import argparse
+import asyncio
+import datetime
+import time
+
+from benchmarks.common import describe_ms
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.services.rollup_service import rollup_service
+from backend.services.transaction_service import TransactionFilter, transaction_service
+
+USER_ID = "bench-query-user"
+MONTH, YEAR = 6, 2023
+CATEGORY_IDS = (3, 5)
+MIN_AMOUNT = 50.0
+
+
+async def _seed(sessionmaker, rows: int) -> None:
+    async with sessionmaker() as db:
+        if await db.scalar(text("SELECT count(*) FROM transactions WHERE user_id = :u"), {"u": USER_ID}):
+            return
+        await db.execute(text(
+            "INSERT INTO users (user_id, first_name, last_name, email, password, create_date) "
+            "VALUES (:u, 'Bench', 'Query', 'bench-query@example.com', 'x', now()) ON CONFLICT DO NOTHING"
+        ), {"u": USER_ID})
+        await db.execute(text(
+            "INSERT INTO categories (category_name, user_id, create_date, is_system, is_deleted) "
+            "SELECT 'bench ' || c, NULL, now(), true, false FROM generate_series(1, 12) AS c "
+            "WHERE NOT EXISTS (SELECT 1 FROM categories)"
+        ))
+        await db.execute(text(
+            "INSERT INTO transactions (transaction_id, fingerprint, user_id, date, amount, transaction_type, category_id, to_from, description) "
+            "SELECT md5(:u || t), md5(:u || t), :u, DATE '2020-01-01' + (t % 1460), (t % 200) + 0.5, "
+            "CASE WHEN t % 6 = 0 THEN 'INCOME'::transactiontypeenum ELSE 'EXPENSE'::transactiontypeenum END, "
+            "(SELECT min(category_id) FROM categories) + (t % 12), 'Merchant ' || (t % 40), 'Purchase ' || t "
+            "FROM generate_series(1, :rows) AS t"
+        ), {"u": USER_ID, "rows": rows})
+        await db.commit()
+        await rollup_service.rebuild(db)
+        await db.execute(text("ANALYZE transactions"))
+
+
+async def _time(sessionmaker, repeat: int, call) -> list[float]:
+    samples = []
+    async with sessionmaker() as db:
+        await call(db)  # warm the connection and statement cache
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await call(db)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def main(rows: int, repeat: int, url: str | None) -> None:
+    if url:
+        engine = create_async_engine(url)
+    else:
+        from backend.database.database_connection.database_config import engine
+    sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await _seed(sessionmaker, rows)
+
+    month_start = datetime.date(YEAR, MONTH, 1)
+    month_end = datetime.date(YEAR, MONTH + 1, 1)
+
+    async def old_month_listing(db):
+        return await transaction_service.get_transactions_by_month(db, USER_ID, MONTH, YEAR)
+
+    async def new_month_listing(db):
+        month = TransactionFilter(start_date=month_start, end_date=month_end)
+        return await transaction_service.query_transactions(db, USER_ID, month, limit=1000)
+
+    async def old_filtered(db):
+        listed = await transaction_service.get_transactions_by_month(db, USER_ID, MONTH, YEAR)
+        await transaction_service.get_expense_by_month(db, USER_ID, MONTH, YEAR)
+        names = {f"bench {category_id}" for category_id in CATEGORY_IDS}
+        return [
+            tx for tx in listed
+            if tx["transaction_type"].name == "EXPENSE" and tx["amount"] >= MIN_AMOUNT and tx["category"] in names
+        ]
+
+    async def new_filtered(db):
+        filters = TransactionFilter(
+            start_date=month_start, end_date=month_end, transaction_types=("EXPENSE",),
+            category_ids=CATEGORY_IDS, min_amount=MIN_AMOUNT,
+        )
+        return await transaction_service.query_transactions(
+            db, USER_ID, filters, ["date", "amount", "category_id"], limit=1000
+        )
+
+    for label, call in (
+        ("month listing, get_transactions_by_month", old_month_listing),
+        ("month listing, query_transactions", new_month_listing),
+        ("filtered, by_month + client-side filter", old_filtered),
+        ("filtered, one projected query", new_filtered),
+    ):
+        print(describe_ms(label, await _time(sessionmaker, repeat, call)))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--url", help="database URL (defaults to the app's db_* settings)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat, args.url))
@@ -0,0 +1,71 @@
+"""Shared setup for the benchmark scripts (run them from the repo root with `python -m benchmarks.<name>`)."""
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+# same defaults as tests/conftest.py so services import without a .env file
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("GOOGLE_API_KEY2", "benchmark-google-api-key")
+os.environ.setdefault("db_user", "bench")
+os.environ.setdefault("db_password", "bench")
+os.environ.setdefault("db_host", "localhost")
+os.environ.setdefault("db_port", "5432")
+os.environ.setdefault("dbname", "finanlytics_bench")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe_ms(label: str, samples: list[float]) -> str:
+    """Format latency samples (seconds) as a one-line p50/p99/max summary in milliseconds."""
+    return (
+        f"{label:<40} n={len(samples):<5} p50={percentile(samples, 50) * 1000:8.2f}ms "
+        f"p99={percentile(samples, 99) * 1000:8.2f}ms max={max(samples, default=0) * 1000:8.2f}ms"
+    )
+
+
+def build_app(db_factory=None, user_id: str = "bench-user"):
+    """Build a FastAPI app with the real routers and DB/auth dependencies stubbed out.
+
+    Args:
+        db_factory: Callable returning the object injected as the DB session.
+        user_id (str): Id of the fake authenticated user.
+
+    Returns:
+        FastAPI: App ready for httpx.ASGITransport.
+    """
+    from fastapi import FastAPI
+
+    from backend.database.database_connection.database_client import get_db
+    from backend.routers.category_router import category_router
+    from backend.routers.transaction_router import transaction_router
+    from backend.routers.user_router import user_router
+    from backend.services.user_service import user_service
+
+    app = FastAPI()
+    app.include_router(user_router, prefix="/users")
+    app.include_router(transaction_router, prefix="/transactions")
+    app.include_router(category_router, prefix="/categories")
+
+    async def fake_db():
+        yield db_factory() if db_factory else None
+
+    async def fake_user():
+        return SimpleNamespace(user_id=user_id)
+
+    app.dependency_overrides[get_db] = fake_db
+    app.dependency_overrides[user_service.get_current_user] = fake_user
+    return app
@@ -0,0 +1,76 @@
+"""Baseline schema: users, categories and transactions.
+
+These are exactly the tables the startup create_all hook built before
+migrations existed, so such databases are marked as migrated with
+`alembic stamp 0001` and upgraded from there. Everything added since,
+starting with monthly_rollups in 0002, lives in later revisions.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("first_name", sa.String(), nullable=False),
+        sa.Column("last_name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("create_date", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_users_user_id", "users", ["user_id"])
+
+    op.create_table(
+        "categories",
+        sa.Column("category_id", sa.Integer(), primary_key=True),
+        sa.Column("category_name", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.user_id"), nullable=True),
+        sa.Column("create_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_system", sa.Boolean(), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.UniqueConstraint("category_name", "user_id", name="uq_category_name_per_user"),
+    )
+
+    transaction_type = postgresql.ENUM("INCOME", "EXPENSE", name="transactiontypeenum")
+    transaction_type.create(op.get_bind(), checkfirst=True)
+    transaction_type_column = postgresql.ENUM("INCOME", "EXPENSE", name="transactiontypeenum", create_type=False)
+
+    op.create_table(
+        "transactions",
+        sa.Column("transaction_id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.user_id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("transaction_type", transaction_type_column, nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.category_id"), nullable=False),
+        sa.Column("to_from", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=False),
+    )
+    op.create_index("ix_transactions_transaction_id", "transactions", ["transaction_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_transaction_id", table_name="transactions")
+    op.drop_table("transactions")
+    postgresql.ENUM(name="transactiontypeenum").drop(op.get_bind(), checkfirst=True)
+    op.drop_table("categories")
+    op.drop_index("ix_users_user_id", table_name="users")
+    op.drop_table("users")
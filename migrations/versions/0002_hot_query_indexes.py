@@ -0,0 +1,95 @@
+"""Monthly rollups, plus composite and covering indexes for the transaction, summary and category queries.
+
+monthly_rollups is created only when missing (earlier deployments got it from
+0001 or create_all); migration 0012 fills it from existing transactions.
+Indexes are built CONCURRENTLY so existing deployments keep accepting writes
+while they are created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    transaction_type = postgresql.ENUM("INCOME", "EXPENSE", name="transactiontypeenum", create_type=False)
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.user_id"), primary_key=True),
+        sa.Column("year", sa.Integer(), primary_key=True),
+        sa.Column("month", sa.Integer(), primary_key=True),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.category_id"), primary_key=True),
+        sa.Column("transaction_type", transaction_type, primary_key=True),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+    with op.get_context().autocommit_block():
+        # list_transactions, per-month listings and date-window summaries
+        op.create_index(
+            "ix_transactions_user_date",
+            "transactions",
+            ["user_id", "date", "transaction_id"],
+            postgresql_include=["transaction_type", "category_id", "amount"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # SUM(amount) per user and type over a date range
+        op.create_index(
+            "ix_transactions_user_type_date",
+            "transactions",
+            ["user_id", "transaction_type", "date"],
+            postgresql_include=["amount", "category_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_transactions_category_id",
+            "transactions",
+            ["category_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_categories_user_name_active",
+            "categories",
+            ["user_id", "category_name", "is_deleted"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_monthly_rollups_user_type_month",
+            "monthly_rollups",
+            ["user_id", "transaction_type", "year", "month"],
+            postgresql_include=["total_amount", "transaction_count", "category_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ("ix_monthly_rollups_user_type_month", "monthly_rollups"),
+            ("ix_categories_user_name_active", "categories"),
+            ("ix_transactions_category_id", "transactions"),
+            ("ix_transactions_user_type_date", "transactions"),
+            ("ix_transactions_user_date", "transactions"),
+        ):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+    op.drop_table("monthly_rollups", if_exists=True)
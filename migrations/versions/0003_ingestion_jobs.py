@@ -0,0 +1,57 @@
+"""Persisted ingestion jobs for background statement uploads.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    status = postgresql.ENUM("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="ingestionstatusenum")
+    status.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("job_id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.user_id"), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("source_path", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="ingestionstatusenum", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("stage", sa.String(), nullable=True),
+        sa.Column("stage_timings", sa.JSON(), nullable=False),
+        sa.Column("rows_extracted", sa.Integer(), nullable=True),
+        sa.Column("rows_inserted", sa.Integer(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_ingestion_jobs_status_updated", "ingestion_jobs", ["status", "updated_at"])
+    op.create_index("ix_ingestion_jobs_user_created", "ingestion_jobs", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingestion_jobs_user_created", table_name="ingestion_jobs")
+    op.drop_index("ix_ingestion_jobs_status_updated", table_name="ingestion_jobs")
+    op.drop_table("ingestion_jobs")
+    postgresql.ENUM(name="ingestionstatusenum").drop(op.get_bind(), checkfirst=True)
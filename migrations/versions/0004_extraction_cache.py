@@ -0,0 +1,39 @@
+"""Content-addressed cache of statement extraction results.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "extraction_cache",
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.user_id"), primary_key=True),
+        sa.Column("cache_key", sa.String(), primary_key=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_extraction_cache_last_accessed", "extraction_cache", ["last_accessed_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_extraction_cache_last_accessed", table_name="extraction_cache")
+    op.drop_table("extraction_cache")
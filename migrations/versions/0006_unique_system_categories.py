@@ -0,0 +1,63 @@
+"""Make system category names unique so seeding can be a single INSERT ... ON CONFLICT.
+
+The existing (category_name, user_id) constraint never fires for system rows
+because NULL user_ids compare as distinct, so workers seeding concurrently
+could insert the same default twice. Any such duplicates are merged into the
+oldest row before the partial unique index is built.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# system category rows that repeat an earlier row's name, with the row they fold into
+_DUPLICATES = """
+    SELECT category_id AS duplicate_id, keep_id FROM (
+        SELECT category_id, min(category_id) OVER (PARTITION BY category_name) AS keep_id
+        FROM categories WHERE user_id IS NULL
+    ) ranked
+    WHERE category_id <> keep_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"""
+        INSERT INTO monthly_rollups (user_id, year, month, category_id, transaction_type, total_amount, transaction_count)
+        SELECT r.user_id, r.year, r.month, d.keep_id, r.transaction_type, sum(r.total_amount), sum(r.transaction_count)
+        FROM monthly_rollups r JOIN ({_DUPLICATES}) d ON r.category_id = d.duplicate_id
+        GROUP BY r.user_id, r.year, r.month, d.keep_id, r.transaction_type
+        ON CONFLICT (user_id, year, month, category_id, transaction_type) DO UPDATE SET
+            total_amount = monthly_rollups.total_amount + excluded.total_amount,
+            transaction_count = monthly_rollups.transaction_count + excluded.transaction_count
+    """)
+    op.execute(f"DELETE FROM monthly_rollups WHERE category_id IN (SELECT duplicate_id FROM ({_DUPLICATES}) d)")
+    op.execute(f"""
+        UPDATE transactions t SET category_id = d.keep_id
+        FROM ({_DUPLICATES}) d WHERE t.category_id = d.duplicate_id
+    """)
+    op.execute(f"DELETE FROM categories WHERE category_id IN (SELECT duplicate_id FROM ({_DUPLICATES}) d)")
+    op.create_index(
+        "uq_categories_system_name",
+        "categories",
+        ["category_name"],
+        unique=True,
+        postgresql_where=sa.text("user_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_categories_system_name", table_name="categories")
@@ -0,0 +1,81 @@
+"""Stored search document and full-text/trigram indexes for transaction search.
+
+transactions.search_vector is a stored generated tsvector, so ranking reads it
+instead of re-parsing every match. Adding it rewrites the table under an
+ACCESS EXCLUSIVE lock (about 30s per million rows on modest hardware), so run
+this migration in a maintenance window on large deployments. The GIN index keyed
+by owner and document is always built. The trigram indexes behind the
+typo-tolerant fallback need the pg_trgm extension, so they are only built where
+the server offers it. Search detects this at runtime and does without the
+fallback when it is missing. Indexes are built CONCURRENTLY.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# must match SEARCH_OWNER in transaction_model
+SEARCH_KEYS = ("(ARRAY[user_id])", "search_vector")
+TRIGRAM_INDEXES = (
+    ("ix_transactions_to_from_trgm", "to_from"),
+    ("ix_transactions_description_trgm", "description"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    trigram_available = bind.scalar(sa.text("SELECT count(*) FROM pg_available_extensions WHERE name = 'pg_trgm'"))
+    if trigram_available:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "transactions",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple'::regconfig, (to_from || ' ') || description)", persisted=True),
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_search",
+            "transactions",
+            [sa.text(key) for key in SEARCH_KEYS],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        if trigram_available:
+            for index_name, column in TRIGRAM_INDEXES:
+                op.create_index(
+                    index_name,
+                    "transactions",
+                    [column],
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # pg_trgm is left installed; other objects in the database may use it
+    with op.get_context().autocommit_block():
+        for index_name, _ in TRIGRAM_INDEXES:
+            op.drop_index(index_name, table_name="transactions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_transactions_search", table_name="transactions", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("transactions", "search_vector")
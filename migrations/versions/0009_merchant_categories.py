@@ -0,0 +1,38 @@
+"""Per-user merchant-to-category index consulted before LLM categorization.
+
+The table starts empty; backfill it from existing transactions with
+python -m backend.scripts.rebuild_merchant_index.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 22:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "merchant_categories",
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.user_id"), primary_key=True),
+        sa.Column("merchant_key", sa.String(), primary_key=True),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.category_id"), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("merchant_categories")
@@ -0,0 +1,77 @@
+"""Content fingerprints that make statement ingestion idempotent.
+
+Existing rows are fingerprinted with the same recipe as
+transaction_service.transaction_fingerprint, numbering identical rows of a
+user in transaction_id order as their occurrences, so re-uploading a statement
+that is already stored skips its rows. Counterparties or descriptions with
+non-ASCII whitespace or letters may hash differently from the application and
+will not be recognized as duplicates. The backfill rewrites every transactions
+row; the unique index is built CONCURRENTLY.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 23:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONTENT_KEY = (
+    "user_id",
+    "to_char(date, 'YYYY-MM-DD')",
+    "round(amount * 100)::bigint::text",
+    "transaction_type::text",
+    r"lower(btrim(regexp_replace(to_from, '\s+', ' ', 'g')))",
+    r"lower(btrim(regexp_replace(description, '\s+', ' ', 'g')))",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("transactions", sa.Column("fingerprint", sa.String(), nullable=True))
+    key = ", ".join(CONTENT_KEY)
+    op.execute(f"""
+        UPDATE transactions AS t
+        SET fingerprint = encode(sha256(convert_to(
+            concat_ws('|', {key}, f.occurrence::text), 'UTF8'
+        )), 'hex')
+        FROM (
+            SELECT transaction_id,
+                   row_number() OVER (PARTITION BY {key} ORDER BY transaction_id) - 1 AS occurrence
+            FROM transactions
+        ) AS f
+        WHERE t.transaction_id = f.transaction_id
+    """)
+    op.alter_column("transactions", "fingerprint", nullable=False)
+    op.add_column("ingestion_jobs", sa.Column("rows_skipped", sa.Integer(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_transactions_user_fingerprint",
+            "transactions",
+            ["user_id", "fingerprint"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_transactions_user_fingerprint",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("ingestion_jobs", "rows_skipped")
+    op.drop_column("transactions", "fingerprint")
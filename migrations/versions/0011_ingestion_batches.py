@@ -0,0 +1,35 @@
+"""Group ingestion jobs uploaded together through /transactions/upload/batch.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("ingestion_jobs", sa.Column("batch_id", sa.String(), nullable=True))
+    op.create_index(
+        "ix_ingestion_jobs_batch",
+        "ingestion_jobs",
+        ["batch_id"],
+        postgresql_where=sa.text("batch_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingestion_jobs_batch", table_name="ingestion_jobs")
+    op.drop_column("ingestion_jobs", "batch_id")
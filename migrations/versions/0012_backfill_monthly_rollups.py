@@ -0,0 +1,51 @@
+"""Backfill monthly_rollups from the transactions already stored.
+
+Rollups are only maintained on writes, so databases that had transactions
+before rollups existed (including those stamped at 0001) would report zero
+totals for them. The table is recomputed from transactions, the same query
+rollup_service.rebuild runs, and every user's data_version is bumped so
+summary ETags served before the backfill stop matching. Transaction writes
+wait on a SHARE lock while it runs, so none can slip between the recompute
+and the commit.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, Sequence[str], None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("LOCK TABLE transactions IN SHARE MODE")
+    op.execute("DELETE FROM monthly_rollups")
+    op.execute("""
+        INSERT INTO monthly_rollups
+            (user_id, year, month, category_id, transaction_type, total_amount, transaction_count)
+        SELECT user_id,
+               CAST(EXTRACT(year FROM date) AS INTEGER),
+               CAST(EXTRACT(month FROM date) AS INTEGER),
+               category_id,
+               transaction_type,
+               sum(amount),
+               count(*)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+    op.execute("UPDATE users SET data_version = data_version + 1")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # data only: the recomputed rollups are what writes would have produced
+    pass
@@ -0,0 +1,68 @@
+"""Key the merchant index by transaction type as well as merchant.
+
+A counterparty that both pays and is paid by a user (an employer that also
+sells to them, a refunding shop) needs a category per direction. The primary
+key becomes (user_id, merchant_key, transaction_type). Each existing entry is
+given the type its category is most used with in the user's transactions
+(EXPENSE when the category has none). Run
+python -m backend.scripts.rebuild_merchant_index afterwards so learned entries
+are recomputed per type.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0013"
+down_revision: Union[str, Sequence[str], None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    transaction_type = postgresql.ENUM("INCOME", "EXPENSE", name="transactiontypeenum", create_type=False)
+    op.add_column("merchant_categories", sa.Column("transaction_type", transaction_type, nullable=True))
+    op.execute("""
+        UPDATE merchant_categories AS m
+        SET transaction_type = coalesce(
+            (
+                SELECT t.transaction_type
+                FROM transactions AS t
+                WHERE t.user_id = m.user_id AND t.category_id = m.category_id
+                GROUP BY t.transaction_type
+                ORDER BY count(*) DESC, t.transaction_type
+                LIMIT 1
+            ),
+            'EXPENSE'
+        )
+    """)
+    op.alter_column("merchant_categories", "transaction_type", nullable=False)
+    op.drop_constraint("merchant_categories_pkey", "merchant_categories", type_="primary")
+    op.create_primary_key(
+        "merchant_categories_pkey", "merchant_categories", ["user_id", "merchant_key", "transaction_type"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # one entry per merchant survives: the expense one where both types are indexed
+    op.execute("""
+        DELETE FROM merchant_categories AS m
+        WHERE m.transaction_type = 'INCOME'
+          AND EXISTS (
+              SELECT 1 FROM merchant_categories AS e
+              WHERE e.user_id = m.user_id AND e.merchant_key = m.merchant_key AND e.transaction_type = 'EXPENSE'
+          )
+    """)
+    op.drop_constraint("merchant_categories_pkey", "merchant_categories", type_="primary")
+    op.create_primary_key("merchant_categories_pkey", "merchant_categories", ["user_id", "merchant_key"])
+    op.drop_column("merchant_categories", "transaction_type")
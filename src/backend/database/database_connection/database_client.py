@@ -1,10 +1,12 @@
-from backend.database.database_connection.database_config import AsyncSessionLocal, Base, engine
+from backend.database.database_connection.database_config import AsyncSessionLocal, Base, DB_CREATE_ALL_ON_STARTUP, engine
 
 async def init_db() -> None:
     # Import all models to register them with Base
-    from backend.database.models import user_model, transaction_model, categories_model
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    from backend.database.models import user_model, transaction_model, categories_model, monthly_rollup_model, ingestion_job_model, extraction_cache_model
+    if DB_CREATE_ALL_ON_STARTUP:
+        # one existence check per table; skipped when migrations manage the schema
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
     
     # Seed categories after tables are created
     from backend.database.models.categories_model import seed_categories
@@ -1,11 +1,10 @@
 import os
-import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
-db_url = os.getenv("DATABASE_URL_ORIGINAL")
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from uuid import uuid4
+from backend.database.database_connection.pool_metrics import InstrumentedAsyncAdaptedQueuePool
 from dotenv import load_dotenv
-import os
 
 # Load environment variables from .env
 load_dotenv()
@@ -20,17 +19,86 @@ DBNAME = os.getenv("dbname")
 # SQLAlchemy connection string
 DATABASE_URL = f"postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}"
 
-# Create the SQLAlchemy engine
-engine = create_async_engine(DATABASE_URL, echo=False)
+# Connection pool; sizes are per API process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# prepared statements cached per connection by asyncpg and by SQLAlchemy's asyncpg adapter
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+# "off" for a direct connection or session pooling; "transaction" for PgBouncer transaction
+# pooling, where a prepared statement may not exist on the next transaction's server connection
+DB_PGBOUNCER_MODE = os.getenv("DB_PGBOUNCER_MODE", "off").lower()
+# with an external pooler, "null" opens a fresh client connection per checkout
+DB_POOL_CLASS = os.getenv("DB_POOL_CLASS", "queue").lower()
+# `alembic upgrade head` owns the schema; creating tables at startup is only for throwaway
+# databases, since migrations cannot run over tables create_all already made
+DB_CREATE_ALL_ON_STARTUP = os.getenv("DB_CREATE_ALL_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+
+def engine_options() -> dict:
+    """Build create_async_engine keyword arguments from the DB_* environment settings."""
+    statement_cache_size = 0 if DB_PGBOUNCER_MODE == "transaction" else DB_STATEMENT_CACHE_SIZE
+    connect_args = {
+        "statement_cache_size": statement_cache_size,
+        "prepared_statement_cache_size": statement_cache_size,
+    }
+    if DB_PGBOUNCER_MODE == "transaction":
+        # unnamed-statement collisions across server connections are what PgBouncer trips on
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+
+    options = {"echo": False, "pool_pre_ping": DB_POOL_PRE_PING, "connect_args": connect_args}
+    if DB_POOL_CLASS == "null":
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def pool_stats(pool=None) -> dict:
+    """Pool occupancy, saturation and checkout wait times for the metrics endpoint.
 
-async def test_connection():
+    Args:
+        pool: Pool to describe (the application engine's by default).
+
+    Returns:
+        dict: Pool settings, occupancy and checkout wait metrics.
+    """
+    pool = pool or engine.pool
+    stats = {"pool_class": type(pool).__name__, "pgbouncer_mode": DB_PGBOUNCER_MODE}
+    if isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=checked_out,
+            idle=pool.checkedin(),
+            overflow=pool.overflow(),
+            saturation=round(checked_out / capacity, 4) if capacity else 0.0,
+            **pool.metrics.snapshot(),
+        )
+    return stats
+
+
+# Create the SQLAlchemy engine; no connection is opened until first use
+engine = create_async_engine(DATABASE_URL, **engine_options())
+
+async def test_connection() -> bool:
+    """Open and release one connection; for health checks and scripts, never run at import."""
     try:
-        async with engine.connect() as connection:
-            print("Connection successful!")
+        async with engine.connect():
+            return True
     except Exception as e:
         print(f"Failed to connect: {e}")
-
-asyncio.run(test_connection())
+        return False
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -1,5 +1,9 @@
 from backend.database.models.user_model import User
 from backend.database.models.categories_model import Category
 from backend.database.models.transaction_model import Transactions
+from backend.database.models.monthly_rollup_model import MonthlyRollup
+from backend.database.models.ingestion_job_model import IngestionJob
+from backend.database.models.extraction_cache_model import ExtractionCacheEntry
+from backend.database.models.merchant_category_model import MerchantCategory
 
-__all__ = ["User", "Category", "Transactions"]
+__all__ = ["User", "Category", "Transactions", "MonthlyRollup", "IngestionJob", "ExtractionCacheEntry", "MerchantCategory"]
@@ -1,4 +1,5 @@
-from sqlalchemy import Column,Integer, String,Boolean,ForeignKey, DateTime,UniqueConstraint,select
+from sqlalchemy import Column,Integer, String,Boolean,ForeignKey, DateTime,UniqueConstraint,Index,text
+from sqlalchemy.dialects.postgresql import insert
 from backend.database.database_connection.database_client import Base
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -35,28 +36,28 @@ class Category(Base):
     __table_args__ = (
         # Prevent duplicate category names per user
         UniqueConstraint("category_name", "user_id", name="uq_category_name_per_user"),
+        # NULL user_ids never collide above, so system names need their own unique index
+        Index("uq_categories_system_name", "category_name", unique=True, postgresql_where=text("user_id IS NULL")),
+        # lookups by (user_id, category_name, is_deleted) and listing a user's categories
+        Index("ix_categories_user_name_active", "user_id", "category_name", "is_deleted"),
     )
 
 #seed default categories for system (user_id=None) categories
 async def seed_categories(session: AsyncSession) -> None:
-    result = await session.execute(
-        select(Category.category_name).where(
-            Category.user_id == None,
-            Category.is_system == True,
+    """Insert any missing system categories in one idempotent statement.
+
+    Safe for several workers starting at once: rows another worker already
+    inserted are skipped by the unique index on system category names.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    stmt = insert(Category).values([
+        {"category_name": name, "user_id": None, "is_system": True, "is_deleted": False, "create_date": now}
+        for name in DEFAULT_CATEGORIES
+    ])
+    await session.execute(
+        stmt.on_conflict_do_nothing(
+            index_elements=[Category.category_name],
+            index_where=Category.user_id.is_(None),
         )
     )
-
-    existing = set(result.scalars().all())
-
-    for name in DEFAULT_CATEGORIES:
-        if name not in existing:
-            session.add(
-                Category(
-                    category_name=name,
-                    user_id=None,
-                    is_system=True,
-                    create_date=datetime.datetime.now(datetime.timezone.utc),
-                ),
-            )
-
     await session.commit()
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, JSON
+from backend.database.database_connection.database_client import Base
+
+class ExtractionCacheEntry(Base):
+    """Validated extraction output for a statement, keyed by a hash of its raw bytes or normalized text."""
+    __tablename__ = "extraction_cache"
+    #entries are per user so a hit never returns rows extracted from someone else's upload
+    user_id = Column(String, ForeignKey("users.user_id"), primary_key=True)
+    cache_key = Column(String, primary_key=True) #"raw:<sha256>" or "text:<sha256>"
+    payload = Column(JSON, nullable=False) #TransactionList dumped as JSON
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True), nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # LRU eviction walks entries from the most recently used down
+        Index("ix_extraction_cache_last_accessed", "last_accessed_at"),
+    )
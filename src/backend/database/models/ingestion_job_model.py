@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, JSON, Enum as SqlEnum, text
+from backend.database.database_connection.database_client import Base
+from enum import Enum
+
+class IngestionStatusEnum(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class IngestionJob(Base):
+    """A statement upload queued for background parsing, extraction and persistence."""
+    __tablename__ = "ingestion_jobs"
+    job_id = Column(String, primary_key=True)
+    user_id = Column(String, ForeignKey("users.user_id"), nullable=False)
+    batch_id = Column(String, nullable=True) #set for statements uploaded together through /upload/batch
+    filename = Column(String, nullable=False)
+    source_path = Column(String, nullable=False) #spooled upload on local disk, removed once the job finishes
+    status = Column(SqlEnum(IngestionStatusEnum), nullable=False)
+    stage = Column(String, nullable=True)
+    stage_timings = Column(JSON, nullable=False, default=dict) #stage name -> seconds
+    extraction_path = Column(String, nullable=True) #"cache", "parser:<name>" or "llm"
+    rows_extracted = Column(Integer, nullable=True)
+    rows_inserted = Column(Integer, nullable=True)
+    rows_skipped = Column(Integer, nullable=True) #already stored, e.g. from an overlapping statement
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # resume scan for queued/stale jobs at worker start
+        Index("ix_ingestion_jobs_status_updated", "status", "updated_at"),
+        Index("ix_ingestion_jobs_user_created", "user_id", "created_at"),
+        Index("ix_ingestion_jobs_batch", "batch_id", postgresql_where=text("batch_id IS NOT NULL")),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum as SqlEnum
+from backend.database.database_connection.database_client import Base
+from backend.database.models.transaction_model import TransactionTypeEnum
+
+class MerchantCategory(Base):
+    """A user's category for a counterparty, keyed by its normalized merchant name and transaction type."""
+    __tablename__ = "merchant_categories"
+    #the primary key is the whole index for a user, read in one range scan
+    user_id = Column(String, ForeignKey("users.user_id"), primary_key=True)
+    merchant_key = Column(String, primary_key=True) #see merchant_index_service.normalize_merchant
+    #money paid to and received from the same counterparty usually belong in different categories
+    transaction_type = Column(SqlEnum(TransactionTypeEnum), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.category_id"), nullable=False)
+    source = Column(String, nullable=False) #"learned" from ingested history or "user" when the user chose it
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Float, ForeignKey, Integer, Index, Enum as SqlEnum
+from backend.database.database_connection.database_client import Base
+from backend.database.models.transaction_model import TransactionTypeEnum
+
+class MonthlyRollup(Base):
+    """Per-user monthly totals by category and type, maintained on every transaction write."""
+    __tablename__ = "monthly_rollups"
+    #composite primary key doubles as the upsert target and the (user_id, year, month) lookup index
+    user_id = Column(String, ForeignKey("users.user_id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.category_id"), primary_key=True)
+    transaction_type = Column(SqlEnum(TransactionTypeEnum), primary_key=True)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # covering index for per-type totals across months
+        Index(
+            "ix_monthly_rollups_user_type_month",
+            "user_id", "transaction_type", "year", "month",
+            postgresql_include=["total_amount", "transaction_count", "category_id"],
+        ),
+    )
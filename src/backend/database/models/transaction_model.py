@@ -1,5 +1,7 @@
-from sqlalchemy import Column, String, Float, Date, ForeignKey, Integer, Enum as SqlEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Float, Date, ForeignKey, Integer, Index, Enum as SqlEnum, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR, array
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql.elements import Grouping
 from backend.database.database_connection.database_client import Base
 from enum import Enum
 
@@ -17,7 +19,46 @@ class Transactions(Base):
     category_id = Column(Integer, ForeignKey("categories.category_id"), nullable=False)
     to_from = Column(String, nullable=False)
     description = Column(String, nullable=False)
+    # deterministic hash of the transaction's content (see transaction_service.transaction_fingerprint);
+    # unique per user so re-uploading an overlapping statement cannot insert a row twice
+    fingerprint = Column(String, nullable=False)
+    # full-text document behind /transactions/search, kept by Postgres. The "simple"
+    # configuration lower-cases without stemming, which suits merchant names. Deferred so
+    # ORM loads of whole rows do not carry it.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple'::regconfig, (to_from || ' ') || description)", persisted=True),
+    ))
 
     #defining relationships to user and category
     category = relationship("Category", back_populates="transactions") #category.transactions each category has many transactions
     user = relationship("User", back_populates="transactions") #user.transactions a user has many transactions
+
+    __table_args__ = (
+        # list_transactions / per-month listings: user filter, date range, (date, transaction_id) ordering;
+        # INCLUDE lets date-window summaries run as index-only scans
+        Index(
+            "ix_transactions_user_date",
+            "user_id", "date", "transaction_id",
+            postgresql_include=["transaction_type", "category_id", "amount"],
+        ),
+        # covering index for SUM(amount) by user and type over a date range
+        Index(
+            "ix_transactions_user_type_date",
+            "user_id", "transaction_type", "date",
+            postgresql_include=["amount", "category_id"],
+        ),
+        Index("ix_transactions_category_id", "category_id"),
+        # conflict target of the ON CONFLICT DO NOTHING in bulk writes
+        Index("uq_transactions_user_fingerprint", "user_id", "fingerprint", unique=True),
+    )
+
+
+# the owner is a second GIN key of ix_transactions_search (as a one-element array, which GIN
+# indexes natively), so a search scans one user's postings instead of every user's; queries
+# must use this exact expression for the planner to match the index
+SEARCH_OWNER = array([Transactions.__table__.c.user_id])
+# index expressions other than function calls must be parenthesized in CREATE INDEX
+Index("ix_transactions_search", Grouping(SEARCH_OWNER), Transactions.__table__.c.search_vector, postgresql_using="gin")
+# trigram indexes on to_from and description need the pg_trgm extension and are created by
+# migration 0008 only where it is available; see search_service
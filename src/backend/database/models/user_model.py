@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, String, DateTime
+from sqlalchemy.orm import deferred, relationship
 from backend.database.database_connection.database_client import Base
 
 class User(Base):
@@ -10,6 +10,9 @@ class User(Base):
     email = Column(String, nullable=False,unique=True)
     password = Column(String, nullable=False)
     create_date = Column(DateTime(timezone=True), nullable=False) 
+    # bumped with every write that changes the user's summaries; deferred so users held in the
+    # auth cache never carry a stale copy (read it with data_version_service.get_version)
+    data_version = deferred(Column(BigInteger, nullable=False, default=0, server_default="0"))
 
     #defining relationships to categories and transactions
     categories = relationship("Category", back_populates="owner") #user.categories a user has many categories
@@ -1,8 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from backend.middleware.upload_limit import UploadSizeLimitMiddleware
+from backend.services.ingestion_service import MAX_BATCH_UPLOAD_BYTES, MAX_UPLOAD_BYTES
 
 app = FastAPI()
 
+# refuse oversized statements before the multipart body is read (added first so CORS wraps its 413s)
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_UPLOAD_BYTES, paths=("/transactions/upload",))
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_BATCH_UPLOAD_BYTES, paths=("/transactions/upload/batch",))
+
 # CORS middleware for frontend-backend communication
 app.add_middleware(
     CORSMiddleware,
@@ -12,17 +18,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from routers.user_router import user_router
-from routers.transaction_router import transaction_router
-from routers.category_router import category_router
+from backend.routers.user_router import user_router
+from backend.routers.transaction_router import transaction_router
+from backend.routers.category_router import category_router
+from backend.routers.metrics_router import metrics_router
 from backend.database.database_connection.database_client import init_db
+from backend.services.ingestion_service import ingestion_service, ingestion_worker_pool
+from backend.services.pdf_text import shutdown_pdf_executor
 
 app.include_router(user_router, prefix="/users", tags=["users"])
 app.include_router(transaction_router, prefix="/transactions", tags=["transactions"])
 app.include_router(category_router, prefix="/categories", tags=["categories"])
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    ingestion_service.check_spool_dir()
+    await ingestion_worker_pool.start()
+    # pick up uploads queued or interrupted before the last shutdown
+    await ingestion_service.resume_pending_jobs()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await ingestion_worker_pool.stop()
+    shutdown_pdf_executor()
 
 @app.get("/")
 def home():
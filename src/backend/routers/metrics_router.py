@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.database_connection.database_client import get_db
+from backend.database.database_connection.database_config import pool_stats
+from backend.services.analytics_service import analytics_service
+from backend.services.category_service import category_service
+from backend.services.data_version_service import data_version_service
+from backend.services.extraction_cache_service import extraction_cache_service
+from backend.services.merchant_index_service import merchant_index_service
+from backend.services.user_service import user_service
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/extraction_cache")
+async def get_extraction_cache_metrics(db: AsyncSession = Depends(get_db)):
+    """Return extraction cache hit/miss counters and current size, for sizing the cache.
+
+    Args:
+        db (AsyncSession): Database session.
+
+    Returns:
+        dict: Hits (by key kind), misses, hit rate, entries and bytes used.
+    """
+    return await extraction_cache_service.stats(db)
+
+
+@metrics_router.get("/auth_cache")
+async def get_auth_cache_metrics():
+    """Return hit rates of the user and token caches and the user lookups they saved.
+
+    Returns:
+        dict: Per-cache hits, misses, evictions and size, plus db_queries_avoided.
+    """
+    return user_service.cache_stats()
+
+
+@metrics_router.get("/category_cache")
+async def get_category_cache_metrics():
+    """Return hit rate of the per-user category map cache and the lookups it saved.
+
+    Returns:
+        dict: Hits, misses, evictions and size, plus db_queries_avoided.
+    """
+    return category_service.cache_stats()
+
+
+@metrics_router.get("/merchant_index")
+async def get_merchant_index_metrics():
+    """Return hit rate of the per-user merchant index cache and how many ingested rows it categorized.
+
+    Returns:
+        dict: Hits, misses, evictions and size, plus rows_resolved and rows_unresolved.
+    """
+    return merchant_index_service.cache_stats()
+
+
+@metrics_router.get("/analytics_cache")
+async def get_analytics_cache_metrics():
+    """Return hit rate of the per-user analytics frame cache and rows applied incrementally.
+
+    Returns:
+        dict: Hits, misses, evictions and size, plus rows_appended.
+    """
+    return analytics_service.cache_stats()
+
+
+@metrics_router.get("/summary_cache")
+async def get_summary_cache_metrics():
+    """Return hit rate of the summary response cache and conditional GETs answered with 304.
+
+    Returns:
+        dict: Hits, misses, evictions and size, plus not_modified.
+    """
+    return data_version_service.cache_stats()
+
+
+@metrics_router.get("/db_pool")
+async def get_db_pool_metrics():
+    """Return database pool occupancy, saturation and checkout wait times.
+
+    Returns:
+        dict: Pool size/overflow, checked-out connections, saturation (checked out over
+            size + max_overflow), checkout count, timeouts and wait percentiles.
+    """
+    return pool_stats()
@@ -1,109 +1,378 @@
-from fastapi import APIRouter, Depends
+import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import UploadFile, Query
 from backend.database.database_connection.database_client import get_db
-from backend.services.transaction_service import transaction_service
-from backend.services.user_service import user_service
-from backend.database.models import User
-from backend.schemas.transaction_schema import TransactionCreate, TransactionList, TransactionRead
+from backend.services.transaction_service import (
+    transaction_service,
+    DuplicateTransactionError,
+    InvalidCursorError,
+    TransactionFilter,
+    TransactionNotFoundError,
+    UnknownQueryFieldError,
+)
+from backend.services.user_service import AuthenticatedUser, user_service
+from backend.services.ingestion_service import (
+    ingestion_service,
+    summarize_batch,
+    TooManyFilesError,
+    UnsupportedStatementError,
+    UploadTooLargeError,
+    MAX_BATCH_FILES,
+    MAX_UPLOAD_BYTES,
+)
+from backend.services.search_service import search_service, EmptySearchQueryError
+from backend.services.export_service import export_service, EXPORT_MEDIA_TYPES, ExportFormatUnavailableError
+from backend.services import analytics_service as analytics
+from backend.services.analytics_service import analytics_service
+from backend.services.data_version_service import data_version_service, etag_matches, summary_etag
+from backend.schemas.transaction_schema import TransactionCreate, TransactionList, TransactionRead, TransactionRecategorize, TransactionTypeEnum
+from backend.schemas.ingestion_schema import IngestionBatchRead, IngestionJobRead
 
 
 transaction_router = APIRouter()
 
 
-@transaction_router.post("/upload")
-async def upload_tx_and_save(file: UploadFile,db: AsyncSession = Depends(get_db),current_user: User = Depends(user_service.get_current_user)):
-    """Upload a statement, extract transactions, and persist them for the user.
+async def conditional_summary(request: Request, db: AsyncSession, user_id: str, compute) -> Response:
+    """Serve a summary with an ETag tied to the user's data version.
+
+    The version is one primary-key read on users. When it matches the client's
+    If-None-Match the answer is 304 without touching transactions; otherwise the
+    body comes from the summary response cache, computed only on a miss.
+
+    Args:
+        request (Request): Incoming request (its path and query identify the summary).
+        db (AsyncSession): Database session.
+        user_id (str): Authenticated user.
+        compute: Zero-argument coroutine function returning the summary.
+
+    Returns:
+        Response: 304, or 200 with the JSON body.
+    """
+    # read before computing: a write landing in between can only make the cached body newer than its key
+    version = await data_version_service.get_version(db, user_id)
+    resource = f"{request.url.path}?{request.url.query}"
+    etag = summary_etag(user_id, version, resource)
+    # private: bodies are per user; no-cache: clients revalidate every time, which costs them a 304
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        data_version_service.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    async def render() -> bytes:
+        return JSONResponse(jsonable_encoder(await compute())).body
+
+    body = await data_version_service.cached_response(user_id, version, resource, render)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@transaction_router.post("/upload", response_model=IngestionJobRead, status_code=202)
+async def upload_tx_and_save(file: UploadFile,db: AsyncSession = Depends(get_db),current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
+    """Queue a statement for background extraction and persistence.
+
+    The file is spooled to disk and recorded as an ingestion job; parsing, LLM
+    extraction and database writes run in the worker pool. Poll
+    /transactions/upload/{job_id} for progress.
 
     Args:
         file (UploadFile): Statement file (txt/pdf).
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
-        dict: Confirmation message.
+        IngestionJobRead: The queued job.
     """
     user_id = current_user.user_id
-    raw_text = await transaction_service.upload_transactions(db, file)
-    extracted_transactions = await transaction_service.extraction_transactions_from_text(raw_text)
-    saved_transactions = []
-    for tx in extracted_transactions:
-        saved_tx = await transaction_service.create_transaction(db, tx, user_id)
-        saved_transactions.append(saved_tx)
+    try:
+        job = await ingestion_service.enqueue_upload(db, user_id, file)
+    except UnsupportedStatementError:
+        raise HTTPException(status_code=400, detail="Unsupported file type. Upload a .pdf or .txt statement.")
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit.")
+    return job
+
+
+@transaction_router.post("/upload/batch", response_model=IngestionBatchRead, status_code=202)
+async def upload_batch(files: List[UploadFile], db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
+    """Queue many statements at once, as separate files and/or zip archives.
+
+    Each statement becomes its own ingestion job, so the worker pool reads and
+    extracts them in parallel and writes each with one bulk commit. Poll
+    /transactions/upload/batch/{batch_id} for per-file progress.
+
+    Args:
+        files (list[UploadFile]): Statements (txt/pdf) and zip archives of statements.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        IngestionBatchRead: The queued jobs and any files refused up front.
+    """
+    try:
+        batch = await ingestion_service.enqueue_batch(db, current_user.user_id, files)
+    except TooManyFilesError:
+        raise HTTPException(status_code=413, detail=f"A batch can hold at most {MAX_BATCH_FILES} statements.")
+    if not batch.jobs:
+        raise HTTPException(status_code=400, detail={"message": "No statement in the upload could be processed.", "rejected": batch.rejected})
+    return summarize_batch(batch.batch_id, batch.jobs, batch.rejected)
+
+
+@transaction_router.get("/upload/batch/{batch_id}", response_model=IngestionBatchRead)
+async def get_batch_status(batch_id: str, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
+    """Return the per-file outcomes of a batch upload.
+
+    Args:
+        batch_id (str): Batch identifier returned by /transactions/upload/batch.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        IngestionBatchRead: Overall status, row totals and every job's state.
+    """
+    jobs = await ingestion_service.get_batch(db, current_user.user_id, batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Upload batch not found.")
+    return summarize_batch(batch_id, jobs)
+
 
-    await transaction_service.write_transactions_to_db(db, saved_transactions, user_id)
+@transaction_router.get("/upload/{job_id}", response_model=IngestionJobRead)
+async def get_upload_status(job_id: str, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
+    """Return the status, stage timings and row counts of an upload job.
 
-    return {"message": "Transactions uploaded successfully"}
+    Args:
+        job_id (str): Job identifier returned by /transactions/upload.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
 
+    Returns:
+        IngestionJobRead: Current job state.
+    """
+    job = await ingestion_service.get_job(db, current_user.user_id, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Upload job not found.")
+    return job
 
 
 @transaction_router.get("/user_transactions")
 async def get_user_transactions(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; switches to keyset pagination."),
+    include_total: bool = Query(True, description="Include the total transaction count."),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(user_service.get_current_user),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
 ):
-    """List transactions for the current user with pagination.
+    """List transactions for the current user with offset or cursor pagination.
 
     Args:
         limit (int): Page size (default 20, max 100).
-        offset (int): Records to skip (default 0).
+        offset (int): Records to skip (default 0, ignored when cursor is given).
+        cursor (str | None): Opaque cursor from a previous page's next_cursor.
+        include_total (bool): Whether to return the total count.
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         dict: Items plus pagination metadata.
     """
     user_id = current_user.user_id
-    items, total = await transaction_service.list_transactions(db, user_id, limit, offset)
+    try:
+        items, total, next_cursor = await transaction_service.list_transactions(
+            db, user_id, limit, offset, cursor=cursor, include_total=include_total
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
     return {
         "items": items,
         "limit": limit,
-        "offset": offset,
+        "offset": None if cursor else offset,
         "total": total,
-        "has_more": offset + len(items) < total,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
+    }
+
+@transaction_router.get("/query")
+async def query_transactions(
+    start_date: Optional[datetime.date] = Query(None, description="Inclusive start of the window (YYYY-MM-DD)."),
+    end_date: Optional[datetime.date] = Query(None, description="Exclusive end of the window (YYYY-MM-DD)."),
+    transaction_type: List[TransactionTypeEnum] = Query([], description="Repeat to allow several types."),
+    category_id: List[int] = Query([], description="Repeat to allow several categories."),
+    min_amount: Optional[float] = Query(None, description="Inclusive lower bound on amount."),
+    max_amount: Optional[float] = Query(None, description="Inclusive upper bound on amount."),
+    counterparty: Optional[str] = Query(None, min_length=1, max_length=100, description="Case-insensitive substring of to_from."),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)."),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page."),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Filter the current user's transactions with one indexed query, newest first.
+
+    Args:
+        start_date (date | None): Inclusive window start.
+        end_date (date | None): Exclusive window end.
+        transaction_type (list[TransactionTypeEnum]): Types to include (all when empty).
+        category_id (list[int]): Categories to include (all when empty).
+        min_amount (float | None): Smallest amount to include.
+        max_amount (float | None): Largest amount to include.
+        counterparty (str | None): Substring to match in to_from.
+        fields (str | None): Comma-separated subset of the transaction columns.
+        limit (int): Page size (default 100, max 1000).
+        cursor (str | None): Opaque cursor from a previous page's next_cursor.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        dict: Items with the requested fields plus keyset pagination metadata.
+    """
+    filters = TransactionFilter(
+        start_date=start_date,
+        end_date=end_date,
+        transaction_types=tuple(transaction_type),
+        category_ids=tuple(category_id),
+        min_amount=min_amount,
+        max_amount=max_amount,
+        counterparty=counterparty,
+    )
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    try:
+        items, next_cursor = await transaction_service.query_transactions(
+            db, current_user.user_id, filters, selected, limit=limit, cursor=cursor
+        )
+    except UnknownQueryFieldError as exc:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {exc}")
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    return {
+        "items": items,
+        "limit": limit,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
     }
 
+@transaction_router.get("/search")
+async def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in descriptions and counterparties."),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Search the current user's transactions by description and counterparty, best match first.
+
+    Args:
+        q (str): Search text; every word must match as a prefix (e.g. "netfl").
+        limit (int): Page size (default 20, max 100).
+        offset (int): Records to skip.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        dict: Ranked items, pagination metadata and the match mode ("fulltext", or "fuzzy"
+            when nothing matched exactly and the typo-tolerant fallback was used).
+    """
+    try:
+        items, has_more, match = await search_service.search_transactions(db, current_user.user_id, q, limit, offset)
+    except EmptySearchQueryError:
+        raise HTTPException(status_code=400, detail="Search query has no searchable words.")
+    return {"items": items, "limit": limit, "offset": offset, "has_more": has_more, "match": match}
+
+@transaction_router.get("/export")
+async def export_transactions(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet|arrow)$"),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Stream every transaction of the current user as a file download.
+
+    Args:
+        export_format (str): csv, ndjson, parquet or arrow (Arrow IPC stream).
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        StreamingResponse: The export, written batch by batch as rows are fetched.
+    """
+    try:
+        export_service.check_format(export_format)
+    except ExportFormatUnavailableError:
+        raise HTTPException(status_code=501, detail=f"{export_format} export requires pyarrow, which is not installed.")
+    return StreamingResponse(
+        export_service.stream_export(current_user.user_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{export_format}"'},
+    )
+
 @transaction_router.get("/income_summary")
-async def get_income_summary(db: AsyncSession = Depends(get_db),current_user: User = Depends(user_service.get_current_user)):
+async def get_income_summary(request: Request, db: AsyncSession = Depends(get_db),current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
     """Return total income for the current user.
 
     Args:
+        request (Request): Incoming request (carries If-None-Match).
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         dict: Total income.
     """
     user_id = current_user.user_id
-    summary = await transaction_service.get_income_summary(db, user_id)
-    return summary
+    return await conditional_summary(
+        request, db, user_id, lambda: transaction_service.get_income_summary(db, user_id)
+    )
 
 @transaction_router.get("/expense_summary")
-async def get_expense_summary(db: AsyncSession = Depends(get_db), current_user: User = Depends(user_service.get_current_user)):
+async def get_expense_summary(request: Request, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
     """Return total expenses for the current user.
 
     Args:
+        request (Request): Incoming request (carries If-None-Match).
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         dict: Total expenses.
     """
     user_id = current_user.user_id
-    summary = await transaction_service.get_expense_summary(db, user_id)
-    return summary
+    return await conditional_summary(
+        request, db, user_id, lambda: transaction_service.get_expense_summary(db, user_id)
+    )
+
+@transaction_router.get("/summary")
+async def get_summary(
+    request: Request,
+    start_date: Optional[datetime.date] = Query(None, description="Inclusive start of the window (YYYY-MM-DD)."),
+    end_date: Optional[datetime.date] = Query(None, description="Exclusive end of the window (YYYY-MM-DD)."),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Return income, expense and per-category totals for a date window in one call.
+
+    Args:
+        request (Request): Incoming request (carries If-None-Match).
+        start_date (date | None): Inclusive window start, unbounded when omitted.
+        end_date (date | None): Exclusive window end, unbounded when omitted.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        dict: Income/expense totals and category breakdowns.
+    """
+    user_id = current_user.user_id
+    return await conditional_summary(
+        request, db, user_id,
+        lambda: transaction_service.get_summary(db, user_id, start_date=start_date, end_date=end_date),
+    )
 
 @transaction_router.get("/monthly_income_summary")
-async def get_monthly_income_summary(month_input:int,year_input:int,db: AsyncSession = Depends(get_db), current_user: User = Depends(user_service.get_current_user)):
+async def get_monthly_income_summary(month_input:int,year_input:int,db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
     """Return income total for a specific month/year for the current user.
 
     Args:
         month_input (int): Target month (1-12).
         year_input (int): Target year.
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         dict: Monthly income total.
@@ -113,14 +382,14 @@ async def get_monthly_income_summary(month_input:int,year_input:int,db: AsyncSes
     return summary
 
 @transaction_router.get("/monthly_expense_summary")
-async def get_monthly_expense_summary(month_input:int, year_input:int, db: AsyncSession = Depends(get_db), current_user: User = Depends(user_service.get_current_user)):
+async def get_monthly_expense_summary(month_input:int, year_input:int, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
     """Return expense total for a specific month/year for the current user.
 
     Args:
         month_input (int): Target month (1-12).
         year_input (int): Target year.
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         dict: Monthly expense total.
@@ -130,51 +399,167 @@ async def get_monthly_expense_summary(month_input:int, year_input:int, db: Async
     return summary
 
 @transaction_router.post("/input_transactions")
-async def write_transactions(transaction_in: TransactionCreate, db: AsyncSession = Depends(get_db),current_user: User = Depends(user_service.get_current_user)):
+async def write_transactions(transaction_in: TransactionCreate, db: AsyncSession = Depends(get_db),current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
     """Manually insert a single transaction for the current user.
 
     Args:
         transaction_in (TransactionCreate): Transaction payload.
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         str: Status message.
     """
     user_id = current_user.user_id
     saved_transaction = await transaction_service.create_transaction(db, transaction_in, user_id)
-    success_code = await transaction_service.write_transactions_to_db(db, [saved_transaction], user_id)
+    try:
+        success_code = await transaction_service.write_transactions_to_db(db, [saved_transaction], user_id)
+    except DuplicateTransactionError:
+        raise HTTPException(status_code=409, detail="Identical transactions are being saved concurrently; try again.")
     if success_code is True:    
         return "Transaction saved successfully"
     else:
         return "Failed to save transaction"
     
+@transaction_router.patch("/{transaction_id}/category")
+async def recategorize_transaction(transaction_id: str, body: TransactionRecategorize, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
+    """Move one of the current user's transactions to another category.
+
+    The choice is also recorded for the counterparty, so future uploads file
+    it under the same category without asking the model.
+
+    Args:
+        transaction_id (str): Transaction to recategorize.
+        body (TransactionRecategorize): New category name.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        dict: Transaction id and its new category id and name.
+    """
+    try:
+        return await transaction_service.recategorize_transaction(db, current_user.user_id, transaction_id, body.category)
+    except TransactionNotFoundError:
+        raise HTTPException(status_code=404, detail="Transaction not found.")
+
 @transaction_router.get("/spending_category_summary")
-async def get_spending_category_summary(db: AsyncSession = Depends(get_db), current_user: User = Depends(user_service.get_current_user)):
+async def get_spending_category_summary(request: Request, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
     """Return expense totals grouped by category for the current user.
 
     Args:
+        request (Request): Incoming request (carries If-None-Match).
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         dict: Spend totals per category.
     """
     user_id = current_user.user_id
-    summary = await transaction_service.get_spending_category_summary(db, user_id)
-    return summary
+    return await conditional_summary(
+        request, db, user_id, lambda: transaction_service.get_spending_category_summary(db, user_id)
+    )
 
 @transaction_router.get("/monthly_summary")
-async def get_monthly_summary(db: AsyncSession = Depends(get_db), current_user: User = Depends(user_service.get_current_user)):
+async def get_monthly_summary(request: Request, db: AsyncSession = Depends(get_db), current_user: AuthenticatedUser = Depends(user_service.get_current_user)):
     """Return income/expense totals grouped by month for the current user.
 
     Args:
+        request (Request): Incoming request (carries If-None-Match).
         db (AsyncSession): Database session.
-        current_user (User): Authenticated user.
+        current_user (AuthenticatedUser): Authenticated user.
 
     Returns:
         list[dict]: Monthly income/expense totals.
     """
     user_id = current_user.user_id
-    summary = await transaction_service.get_monthly_summary(db, user_id)
-    return summary
+    return await conditional_summary(
+        request, db, user_id, lambda: transaction_service.get_monthly_summary(db, user_id)
+    )
+
+@transaction_router.get("/analytics/cash_flow")
+async def get_cash_flow(
+    freq: str = Query("month", pattern="^(day|week|month)$"),
+    start_date: Optional[datetime.date] = Query(None, description="Inclusive start of the window (YYYY-MM-DD)."),
+    end_date: Optional[datetime.date] = Query(None, description="Exclusive end of the window (YYYY-MM-DD)."),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Return income, expense, net and running balance per day, week or month.
+
+    Args:
+        freq (str): Period length: day, week or month.
+        start_date (date | None): Inclusive window start, unbounded when omitted.
+        end_date (date | None): Exclusive window end, unbounded when omitted.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        list[dict]: Cash flow per period, oldest first.
+    """
+    snapshot = await analytics_service.get_frame(db, current_user.user_id)
+    return analytics.cash_flow(snapshot.frame, freq, start_date, end_date)
+
+@transaction_router.get("/analytics/rolling_spend")
+async def get_rolling_spend(
+    window_days: int = Query(30, ge=1, le=365),
+    start_date: Optional[datetime.date] = Query(None, description="Inclusive start of the window (YYYY-MM-DD)."),
+    end_date: Optional[datetime.date] = Query(None, description="Exclusive end of the window (YYYY-MM-DD)."),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Return daily spending with its trailing average.
+
+    Args:
+        window_days (int): Days in the trailing average (default 30).
+        start_date (date | None): Inclusive window start, unbounded when omitted.
+        end_date (date | None): Exclusive window end, unbounded when omitted.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        list[dict]: Spend and rolling average per day.
+    """
+    snapshot = await analytics_service.get_frame(db, current_user.user_id)
+    return analytics.rolling_spend(snapshot.frame, window_days, start_date, end_date)
+
+@transaction_router.get("/analytics/category_trends")
+async def get_category_trends(
+    months: int = Query(6, ge=1, le=60),
+    end_date: Optional[datetime.date] = Query(None, description="Exclusive end of the window (YYYY-MM-DD)."),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Return monthly spending per category over the most recent months.
+
+    Args:
+        months (int): Number of trailing months (default 6).
+        end_date (date | None): Exclusive window end; defaults to after the latest expense.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        dict: Months and per-category totals with their change over the window.
+    """
+    snapshot = await analytics_service.get_frame(db, current_user.user_id)
+    return analytics.category_trends(snapshot.frame, snapshot.labels, months, end_date)
+
+@transaction_router.get("/analytics/savings_rate")
+async def get_savings_rate(
+    start_date: Optional[datetime.date] = Query(None, description="Inclusive start of the window (YYYY-MM-DD)."),
+    end_date: Optional[datetime.date] = Query(None, description="Exclusive end of the window (YYYY-MM-DD)."),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(user_service.get_current_user),
+):
+    """Return the share of income saved, overall and per month.
+
+    Args:
+        start_date (date | None): Inclusive window start, unbounded when omitted.
+        end_date (date | None): Exclusive window end, unbounded when omitted.
+        db (AsyncSession): Database session.
+        current_user (AuthenticatedUser): Authenticated user.
+
+    Returns:
+        dict: Income, expense and savings rate overall and per month.
+    """
+    snapshot = await analytics_service.get_frame(db, current_user.user_id)
+    return analytics.savings_rate(snapshot.frame, start_date, end_date)
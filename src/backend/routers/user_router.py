@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from typing import Annotated
 
-from backend.services.user_service import user_service
+from backend.services.user_service import user_service, PasswordHashingBusyError
 from backend.schemas.user_schema import (
     UserCreateSchema,
     UserLoginSchema,
@@ -14,6 +14,15 @@ from backend.database.database_connection.database_client import get_db
 user_router = APIRouter()
 
 
+def _hashing_busy() -> HTTPException:
+    # shed login/register bursts instead of queueing them behind every other request
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
 @user_router.post("/register", response_model=UserResponseSchema)
 async def register_user(
     user_in: UserCreateSchema,
@@ -35,7 +44,10 @@ async def register_user(
             detail="User with this email already exists",
         )
 
-    user = await user_service.create_user(db, user_in)
+    try:
+        user = await user_service.create_user(db, user_in)
+    except PasswordHashingBusyError:
+        raise _hashing_busy()
     return user
 
 
@@ -55,9 +67,14 @@ async def login(
     """
     user = await user_service.get_user_by_email(db, form_data.username)
 
-    if not user or not user_service.verify_password(
-        form_data.password, user.password
-    ):
+    try:
+        valid = user is not None and await user_service.verify_password_async(
+            form_data.password, user.password
+        )
+    except PasswordHashingBusyError:
+        raise _hashing_busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
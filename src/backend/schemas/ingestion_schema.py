@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import Optional, Dict, List
+import datetime
+
+#status of a background statement upload
+class IngestionJobRead(BaseModel):
+    job_id: str = Field(description="Identifier of the ingestion job.")
+    batch_id: Optional[str] = Field(default=None, description="Batch the statement was uploaded in, if any.")
+    filename: str = Field(description="Name of the uploaded statement file.")
+    status: str = Field(description="queued, running, succeeded or failed.")
+    stage: Optional[str] = Field(default=None, description="Stage currently running: read, extract or write.")
+    stage_timings: Dict[str, float] = Field(default_factory=dict, description="Seconds spent in each completed stage.")
+    extraction_path: Optional[str] = Field(default=None, description="How transactions were obtained: cache, parser:<bank> or llm.")
+    rows_extracted: Optional[int] = Field(default=None, description="Transactions extracted from the statement.")
+    rows_inserted: Optional[int] = Field(default=None, description="Transactions written to the database.")
+    rows_skipped: Optional[int] = Field(default=None, description="Transactions skipped because they were already stored.")
+    attempts: int = Field(description="Processing attempts so far.")
+    error: Optional[str] = Field(default=None, description="Failure reason for failed jobs.")
+    created_at: datetime.datetime
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def status_value(cls, value):
+        return getattr(value, "value", value)
+
+    @field_validator("stage_timings", mode="before")
+    @classmethod
+    def default_timings(cls, value):
+        return value or {}
+
+
+#a file of a batch upload that was refused before a job was created for it
+class RejectedUpload(BaseModel):
+    filename: str = Field(description="Name of the refused file (or zip member).")
+    error: str = Field(description="Why it was refused.")
+
+
+#per-file outcomes of a batch upload
+class IngestionBatchRead(BaseModel):
+    batch_id: str = Field(description="Identifier of the batch.")
+    status: str = Field(description="running while any job is queued or running, otherwise finished.")
+    rows_inserted: int = Field(description="Transactions written across the batch's finished jobs.")
+    rows_skipped: int = Field(description="Transactions skipped as already stored across the batch's finished jobs.")
+    jobs: List[IngestionJobRead] = Field(description="One job per accepted statement, in upload order.")
+    rejected: List[RejectedUpload] = Field(default_factory=list, description="Files refused at upload (only in the upload response).")
@@ -75,6 +75,18 @@ class Transaction(TransactionCreate):
 class TransactionList(RootModel[list[TransactionCreate]]):
     pass
 
+#category the model picked for one counterparty the merchant index did not know
+class CounterpartyCategory(BaseModel):
+    index: int = Field(description="Position of the counterparty in the numbered list.")
+    category: str = Field(description="Category for the counterparty.")
+
+class CounterpartyCategoryList(RootModel[list[CounterpartyCategory]]):
+    pass
+
+#recategorization request; the name is matched case-insensitively and created when missing
+class TransactionRecategorize(BaseModel):
+    category: str = Field(min_length=1, max_length=100, description="New category name.")
+
 class ExtractedTransactionList(BaseModel):
     transactions: List[TransactionCreate] = Field(
         description="List of transactions extracted from a bank statement before persistence."
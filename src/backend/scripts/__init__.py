@@ -0,0 +1 @@
+# Package initializer for maintenance commands.
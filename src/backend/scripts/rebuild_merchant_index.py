@@ -0,0 +1,37 @@
+"""Rebuild the learned merchant-to-category index from transaction history.
+
+Usage:
+    python -m backend.scripts.rebuild_merchant_index [--user-id USER_ID]
+"""
+import argparse
+import asyncio
+
+from backend.database.database_connection.database_client import AsyncSessionLocal
+import backend.database.models  # noqa: F401 - register all mappers
+from backend.services.merchant_index_service import merchant_index_service
+
+
+async def run(user_id: str | None) -> int:
+    """Replace learned index entries with ones derived from existing transactions.
+
+    Args:
+        user_id (str | None): Restrict to one user.
+
+    Returns:
+        int: Process exit code.
+    """
+    async with AsyncSessionLocal() as db:
+        written = await merchant_index_service.rebuild(db, user_id)
+        print(f"Indexed {written} merchants")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the merchant-to-category index.")
+    parser.add_argument("--user-id", help="Only rebuild this user's index.")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.user_id)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Reconcile monthly_rollups against the raw transactions table.
+
+Usage:
+    python -m backend.scripts.rebuild_rollups [--user-id USER_ID] [--check]
+"""
+import argparse
+import asyncio
+
+from backend.database.database_connection.database_client import AsyncSessionLocal
+import backend.database.models  # noqa: F401 - register all mappers
+from backend.services.rollup_service import rollup_service
+
+
+async def run(user_id: str | None, check_only: bool) -> int:
+    """Report drift and, unless check_only, rebuild the affected rollups.
+
+    Args:
+        user_id (str | None): Restrict to one user.
+        check_only (bool): Only report drift without rewriting rollups.
+
+    Returns:
+        int: Process exit code (1 when drift remains).
+    """
+    async with AsyncSessionLocal() as db:
+        drift = await rollup_service.find_drift(db, user_id)
+        print(f"Rollup keys out of sync: {len(drift)}")
+        for entry in drift[:20]:
+            print(f"  {entry}")
+        if check_only:
+            return 1 if drift else 0
+        written = await rollup_service.rebuild(db, user_id)
+        print(f"Rebuilt {written} rollup rows")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild monthly transaction rollups.")
+    parser.add_argument("--user-id", help="Only rebuild rollups for this user.")
+    parser.add_argument("--check", action="store_true", help="Report drift without rebuilding.")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.user_id, args.check)))
+
+
+if __name__ == "__main__":
+    main()
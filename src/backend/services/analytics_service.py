@@ -0,0 +1,316 @@
+import os
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models.categories_model import Category
+from backend.database.models.transaction_model import TransactionTypeEnum, Transactions
+from backend.services.rollup_service import transaction_type_name
+from backend.services.session_hooks import on_commit
+from backend.services.ttl_cache import TTLCache
+
+# per-process cache of users' transaction frames; the TTL bounds staleness from writes made by other workers
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "600"))
+
+FREQUENCIES = {"day": "D", "week": "W", "month": "M"}
+_EPOCH = date(1970, 1, 1)
+
+
+@dataclass
+class UserFrame:
+    """One user's transactions as compact columns, sorted by date.
+
+    Columns: date (datetime64), amount (float64), is_income (bool), category_id (int32).
+    Category names live beside the frame, keyed by id.
+    """
+    version: int
+    frame: pd.DataFrame
+    labels: Dict[int, str] = field(default_factory=dict)
+
+
+def build_frame(days: np.ndarray, amounts: Sequence[float], is_income: Sequence[bool], category_ids: Sequence[int]) -> pd.DataFrame:
+    """Build the columnar frame from parallel columns, sorted by date.
+
+    Args:
+        days (np.ndarray): Transaction dates as datetime64[D].
+        amounts (Sequence[float]): Amounts.
+        is_income (Sequence[bool]): True for income, False for expenses.
+        category_ids (Sequence[int]): Category ids.
+
+    Returns:
+        pd.DataFrame: The frame.
+    """
+    frame = pd.DataFrame({
+        "date": days.astype("datetime64[ns]"),
+        "amount": np.asarray(amounts, dtype=np.float64),
+        "is_income": np.asarray(is_income, dtype=bool),
+        "category_id": np.asarray(category_ids, dtype=np.int32),
+    })
+    if not frame["date"].is_monotonic_increasing:
+        frame = frame.sort_values("date", kind="stable", ignore_index=True)
+    return frame
+
+
+def frame_from_rows(rows: Iterable) -> pd.DataFrame:
+    """Build the frame from written rows with date, amount, transaction_type and category_id keys."""
+    rows = list(rows)
+    return build_frame(
+        np.array([row["date"] for row in rows], dtype="datetime64[D]"),
+        [row["amount"] for row in rows],
+        [transaction_type_name(row["transaction_type"]) == "INCOME" for row in rows],
+        [row["category_id"] for row in rows],
+    )
+
+
+def _window(frame: pd.DataFrame, start: Optional[date], end: Optional[date]) -> pd.DataFrame:
+    if start is not None:
+        frame = frame[frame["date"] >= pd.Timestamp(start)]
+    if end is not None:
+        frame = frame[frame["date"] < pd.Timestamp(end)]
+    return frame
+
+
+def _signed(frame: pd.DataFrame) -> pd.DataFrame:
+    """Split amounts into income and expense columns without a Python-level loop."""
+    return pd.DataFrame({
+        "date": frame["date"],
+        "income": np.where(frame["is_income"], frame["amount"], 0.0),
+        "expense": np.where(frame["is_income"], 0.0, frame["amount"]),
+    })
+
+
+def _period_starts(index: pd.Index) -> List[str]:
+    return [period.start_time.date().isoformat() for period in index]
+
+
+def cash_flow(frame: pd.DataFrame, freq: str = "month", start: Optional[date] = None, end: Optional[date] = None) -> List[dict]:
+    """Income, expense, net and running balance per period.
+
+    Args:
+        frame (pd.DataFrame): A user's transaction frame.
+        freq (str): day, week or month.
+        start (date | None): Inclusive lower bound.
+        end (date | None): Exclusive upper bound.
+
+    Returns:
+        list[dict]: One entry per period with activity, oldest first.
+    """
+    signed = _signed(_window(frame, start, end))
+    totals = signed.groupby(signed["date"].dt.to_period(FREQUENCIES[freq]))[["income", "expense"]].sum()
+    net = totals["income"] - totals["expense"]
+    return [
+        {"period": period, "income": round(income, 2), "expense": round(expense, 2), "net": round(n, 2), "balance": round(b, 2)}
+        for period, income, expense, n, b in zip(
+            _period_starts(totals.index),
+            totals["income"].tolist(),
+            totals["expense"].tolist(),
+            net.tolist(),
+            net.cumsum().tolist(),
+        )
+    ]
+
+
+def rolling_spend(frame: pd.DataFrame, window_days: int = 30, start: Optional[date] = None, end: Optional[date] = None) -> List[dict]:
+    """Daily spending with its trailing average over a window of calendar days.
+
+    Days without spending count as zero, so the average is per calendar day.
+
+    Args:
+        frame (pd.DataFrame): A user's transaction frame.
+        window_days (int): Length of the trailing window in days.
+        start (date | None): Inclusive lower bound.
+        end (date | None): Exclusive upper bound.
+
+    Returns:
+        list[dict]: One entry per day from the first to the last expense.
+    """
+    expenses = _window(frame, start, end)
+    expenses = expenses[~expenses["is_income"]]
+    if expenses.empty:
+        return []
+    daily = expenses.groupby("date")["amount"].sum().asfreq("D", fill_value=0.0)
+    average = daily.rolling(window_days, min_periods=1).mean()
+    return [
+        {"date": day.date().isoformat(), "spend": round(spend, 2), "rolling_average": round(avg, 2)}
+        for day, spend, avg in zip(daily.index, daily.tolist(), average.tolist())
+    ]
+
+
+def category_trends(
+    frame: pd.DataFrame, labels: Dict[int, str], months: int = 6, end: Optional[date] = None
+) -> dict:
+    """Monthly spending per category over the most recent months.
+
+    Args:
+        frame (pd.DataFrame): A user's transaction frame.
+        labels (dict[int, str]): Category name by id.
+        months (int): Number of trailing months (ending at the latest month with data, or before end).
+        end (date | None): Exclusive upper bound.
+
+    Returns:
+        dict: The month list and, per category, its totals aligned with it plus the change
+            between the first and last month.
+    """
+    expenses = _window(frame, None, end)
+    expenses = expenses[~expenses["is_income"]]
+    if expenses.empty:
+        return {"months": [], "categories": []}
+    month = expenses["date"].dt.to_period("M")
+    recent = month >= month.max() - (months - 1)
+    pivot = (
+        expenses[recent]
+        .pivot_table(index=month[recent], columns="category_id", values="amount", aggfunc="sum", fill_value=0.0)
+        .reindex(pd.period_range(month.max() - (months - 1), month.max(), freq="M"), fill_value=0.0)
+    )
+    categories = []
+    for category_id in pivot.columns:
+        totals = pivot[category_id]
+        categories.append({
+            "category": labels.get(int(category_id), str(category_id)),
+            "totals": [round(value, 2) for value in totals.tolist()],
+            "change": round(float(totals.iloc[-1] - totals.iloc[0]), 2),
+        })
+    categories.sort(key=lambda item: sum(item["totals"]), reverse=True)
+    return {"months": _period_starts(pivot.index), "categories": categories}
+
+
+def savings_rate(frame: pd.DataFrame, start: Optional[date] = None, end: Optional[date] = None) -> dict:
+    """Share of income kept each month and over the whole window.
+
+    Args:
+        frame (pd.DataFrame): A user's transaction frame.
+        start (date | None): Inclusive lower bound.
+        end (date | None): Exclusive upper bound.
+
+    Returns:
+        dict: Overall income, expense and savings rate plus the same per month. The rate is
+            None for months without income.
+    """
+    signed = _signed(_window(frame, start, end))
+    totals = signed.groupby(signed["date"].dt.to_period("M"))[["income", "expense"]].sum()
+    rates = ((totals["income"] - totals["expense"]) / totals["income"].where(totals["income"] > 0)).round(4)
+    income, expense = float(totals["income"].sum()), float(totals["expense"].sum())
+    return {
+        "income": round(income, 2),
+        "expense": round(expense, 2),
+        "savings_rate": round((income - expense) / income, 4) if income > 0 else None,
+        "months": [
+            {"month": period, "income": round(i, 2), "expense": round(e, 2), "savings_rate": None if np.isnan(r) else r}
+            for period, i, e, r in zip(
+                _period_starts(totals.index), totals["income"].tolist(), totals["expense"].tolist(), rates.tolist()
+            )
+        ],
+    }
+
+
+class AnalyticsService:
+    """Serves analytics from per-user columnar snapshots kept current by committed writes."""
+
+    def __init__(self):
+        self.frame_cache = TTLCache(ANALYTICS_CACHE_SIZE, ANALYTICS_CACHE_TTL_SECONDS)
+        # bumped when a write starts or is abandoned; a snapshot loaded across either is not cached
+        self._versions: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self.rows_appended = 0
+
+    async def get_frame(self, db: AsyncSession, user_id: str) -> UserFrame:
+        """Return the user's snapshot, loading it with one index-only query on a miss.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): User identifier.
+
+        Returns:
+            UserFrame: The user's frame and category labels.
+        """
+        version = self._versions.get(user_id, 0)
+        cached = self.frame_cache.get(user_id)
+        if cached is not None:
+            await self._fill_labels(db, cached)
+            return cached
+
+        # plain ints, floats and booleans: no per-row enum or date conversion on the way in,
+        # and the covering (user_id, date) index returns them already ordered
+        result = await db.execute(
+            select(
+                (Transactions.date - _EPOCH).label("epoch_day"),
+                Transactions.amount,
+                (Transactions.transaction_type == TransactionTypeEnum.INCOME).label("is_income"),
+                Transactions.category_id,
+            )
+            .where(Transactions.user_id == user_id)
+            .order_by(Transactions.date)
+        )
+        epoch_days, amounts, is_income, category_ids = list(zip(*result.all())) or [(), (), (), ()]
+        frame = build_frame(np.asarray(epoch_days, dtype=np.int64).astype("datetime64[D]"), amounts, is_income, category_ids)
+        snapshot = UserFrame(version=version, frame=frame)
+        await self._fill_labels(db, snapshot)
+        if self._versions.get(user_id, 0) == version and not self._pending.get(user_id):
+            self.frame_cache.set(user_id, snapshot)
+        return snapshot
+
+    async def _fill_labels(self, db: AsyncSession, snapshot: UserFrame) -> None:
+        missing = set(snapshot.frame["category_id"].unique().tolist()) - snapshot.labels.keys()
+        if missing:
+            result = await db.execute(
+                select(Category.category_id, Category.category_name).where(Category.category_id.in_(missing))
+            )
+            snapshot.labels.update({row.category_id: row.category_name for row in result})
+
+    def record_write(self, db: AsyncSession, user_id: str, rows: List[dict]) -> None:
+        """Register rows about to be committed for a user.
+
+        The user's snapshot (if cached) is extended with the rows once the session
+        commits, or dropped if it rolls back, so ingestion refreshes the frame
+        incrementally instead of reloading it.
+
+        Args:
+            db (AsyncSession): Session the rows are being written in.
+            user_id (str): Owner of the rows.
+            rows (list[dict]): Rows with date, amount, transaction_type and category_id.
+        """
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self._pending[user_id] = self._pending.get(user_id, 0) + 1
+        on_commit(
+            db,
+            lambda: self._finish_write(user_id, rows, committed=True),
+            on_rollback=lambda: self._finish_write(user_id, rows, committed=False),
+        )
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's snapshot after a change that cannot be applied incrementally."""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self.frame_cache.invalidate(user_id)
+
+    def clear_cache(self) -> None:
+        self.frame_cache.clear()
+
+    def cache_stats(self) -> dict:
+        return {**self.frame_cache.stats(), "rows_appended": self.rows_appended}
+
+    def _finish_write(self, user_id: str, rows: List[dict], committed: bool) -> None:
+        self._pending[user_id] -= 1
+        if not self._pending[user_id]:
+            del self._pending[user_id]
+        if not committed:
+            self.invalidate(user_id)
+            return
+        cached = self.frame_cache.peek(user_id)
+        if cached is None or not rows:
+            return
+        # loaded before this write started (see get_frame), so the rows are not in it yet
+        frame = pd.concat([cached.frame, frame_from_rows(rows)], ignore_index=True)
+        if not frame["date"].is_monotonic_increasing:
+            # statements often cover months already in the frame
+            frame = frame.sort_values("date", kind="stable", ignore_index=True)
+        cached.frame = frame
+        self.rows_appended += len(rows)
+
+
+analytics_service = AnalyticsService()
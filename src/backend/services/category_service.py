@@ -1,19 +1,111 @@
-from typing import Optional, List, Dict
+import os
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Tuple
 from backend.database.models.categories_model import Category
 from backend.schemas.categories_schema import CategoryCreate
+from backend.services.ttl_cache import TTLCache
+from backend.services.data_version_service import data_version_service
+from backend.services.merchant_index_service import merchant_index_service
+from backend.services.session_hooks import on_commit
 import datetime
 from datetime import datetime, timezone
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
+from collections.abc import Iterable
+
+# each user's name -> id map is cached per process; the TTL bounds staleness from
+# category changes made through other workers
+CATEGORY_CACHE_TTL_SECONDS = float(os.getenv("CATEGORY_CACHE_TTL_SECONDS", "300"))
+CATEGORY_CACHE_SIZE = int(os.getenv("CATEGORY_CACHE_SIZE", "10000"))
 
 
 class CategoryAlreadyExistsError(Exception):
     pass
 
+
+# system catch-all that blank category names (from a manual entry or the model) are filed under
+FALLBACK_CATEGORY = "Miscellaneous"
+
+
+def normalize_category_name(name: Optional[str]) -> str:
+    return (name or "").strip().lower() or FALLBACK_CATEGORY.lower()
+
+
+@dataclass(frozen=True)
+class CategoryMap:
+    """Active categories visible to one user, as loaded at a given cache version."""
+    version: int
+    ids: Dict[str, int]
+    names: Tuple[str, ...]
+
+
 class CategoryService:
+    def __init__(self):
+        self.category_cache = TTLCache(CATEGORY_CACHE_SIZE, CATEGORY_CACHE_TTL_SECONDS)
+        # bumped on every invalidation so a load that raced a change is never cached
+        self._versions: Dict[str, int] = {}
+
+    async def get_category_map(self, db, user_id: str) -> CategoryMap:
+        """Return the user's system and own active categories, loading them in one query on a miss.
+
+        Args:
+            db: Database session.
+            user_id (str): User whose categories to load.
+
+        Returns:
+            CategoryMap: Category id keyed by normalized name, plus display names.
+        """
+        version = self._versions.get(user_id, 0)
+        cached = self.category_cache.get(user_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+        result = await db.execute(
+            select(Category.category_id, Category.category_name, Category.user_id).where(
+                Category.is_deleted == False,
+                (Category.user_id == user_id) | (Category.user_id == None),
+            )
+        )
+        ids: Dict[str, int] = {}
+        names: List[str] = []
+        for row in result:
+            key = normalize_category_name(row.category_name)
+            # a user's own category wins over a system one with the same name
+            if key not in ids or row.user_id is not None:
+                ids[key] = row.category_id
+            names.append(row.category_name)
+        category_map = CategoryMap(version=version, ids=ids, names=tuple(names))
+        if self._versions.get(user_id, 0) == version:
+            self.category_cache.set(user_id, category_map)
+        return category_map
+
+    def invalidate_user_categories(self, user_id: str) -> None:
+        """Drop a user's cached category map after their categories change."""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self.category_cache.invalidate(user_id)
+
+    def invalidate_on_commit(self, db, user_id: str) -> None:
+        """Invalidate a user's map when db commits; until then other sessions cannot see the change.
+
+        Invalidating earlier would let a concurrent load miss the uncommitted rows
+        and still be cached under the new version.
+        """
+        on_commit(db, lambda: self.invalidate_user_categories(user_id))
+
+    def clear_cache(self) -> None:
+        self.category_cache.clear()
+        self._versions.clear()
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for the category cache; every hit is a lookup query avoided."""
+        return {**self.category_cache.stats(), "db_queries_avoided": self.category_cache.hits}
+
     async def get_category_by_name(self, db, category_name_in: str, user_id: Optional[str] = None) -> Optional[int]:
         """Fetch a category id by name scoped to system and optionally user.
 
+        With a user the name is matched case-insensitively against the cached category map.
+
         Args:
             db: Database session.
             category_name_in (str): Category name to find.
@@ -22,19 +114,66 @@ class CategoryService:
         Returns:
             int | None: Category id if found.
         """
-        # normalized = category_name_in.strip().lower()
+        if user_id:
+            category_map = await self.get_category_map(db, user_id)
+            return category_map.ids.get(normalize_category_name(category_name_in))
         query = select(Category.category_id).where(
             Category.category_name == category_name_in,
             Category.is_deleted == False,
         )
-        if user_id:
-            query = query.where((Category.user_id == user_id) | (Category.user_id == None))
         result = await db.execute(query)
-        category_id = result.scalar_one_or_none()
-        return category_id
+        return result.scalar_one_or_none()
     
+    async def resolve_category_ids(self, db, user_id: str, category_names: Iterable[str]) -> Dict[str, int]:
+        """Map category names to ids in bulk, creating missing user categories.
+
+        Existing system and user categories are matched case-insensitively against
+        the cached category map, so known names cost no query; names still missing
+        are created in a single INSERT ... ON CONFLICT (which also revives
+        soft-deleted user categories of the same name). Blank names resolve to
+        FALLBACK_CATEGORY. Nothing is committed, so callers can write transactions
+        in the same database transaction.
+
+        Args:
+            db: Database session.
+            user_id (str): Owner of any categories that need creating.
+            category_names (Iterable[str]): Raw category names.
+
+        Returns:
+            dict[str, int]: Category id keyed by normalized (stripped, lower-cased) name.
+        """
+        wanted = {normalize_category_name(name) for name in category_names}
+        if not wanted:
+            return {}
+
+        category_map = await self.get_category_map(db, user_id)
+        resolved = {name: category_map.ids[name] for name in wanted if name in category_map.ids}
+
+        missing = wanted - resolved.keys()
+        if missing:
+            now = datetime.now(timezone.utc)
+            stmt = insert(Category).values([
+                {
+                    "category_name": name,
+                    "user_id": user_id,
+                    "create_date": now,
+                    "is_system": False,
+                    "is_deleted": False,
+                }
+                for name in sorted(missing)
+            ])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_category_name_per_user",
+                set_={"is_deleted": False},
+            ).returning(Category.category_id, Category.category_name)
+            for row in await db.execute(stmt):
+                resolved[row.category_name.lower()] = row.category_id
+            # the new rows are not committed yet; reload once they are visible
+            self.invalidate_on_commit(db, user_id)
+        return resolved
+
     async def get_user_categories(self, db, user_id: str) -> List[Dict]:
-        """List category names available to a user (system + user-owned).
+        """List active category names available to a user (system + user-owned).
 
         Args:
             db: Database session.
@@ -43,8 +182,8 @@ class CategoryService:
         Returns:
             list[str]: Available category names.
         """
-        categories = await db.execute(select(Category.category_name).where((Category.user_id == user_id) | (Category.user_id == None)))
-        return categories.scalars().all()
+        category_map = await self.get_category_map(db, user_id)
+        return list(category_map.names)
 
     async def create_user_category(self, db, user_id: str, category_in: str) -> str:
         """Create a new category for a user, enforcing uniqueness.
@@ -80,10 +219,12 @@ class CategoryService:
 
         try:
             db.add(new_category)
+            await data_version_service.bump(db, user_id)
             await db.commit()
         except IntegrityError:
             await db.rollback()
             raise CategoryAlreadyExistsError()
+        self.invalidate_user_categories(user_id)
 
         # return f"Category created successfully: {normalized_name}"
         return normalized_name
@@ -120,10 +261,14 @@ class CategoryService:
 
         try:
             category_obj.is_deleted = True
+            await data_version_service.bump(db, user_id)
             await db.commit()
         except Exception:
             await db.rollback()
             raise
+        self.invalidate_user_categories(user_id)
+        # merchants mapped to the deleted category are dropped from the index on reload
+        merchant_index_service.invalidate(user_id)
     
 
     async def get_all_categories(self, db) -> List:
@@ -137,3 +282,6 @@ class CategoryService:
         """
         result = await db.execute(select(Category.category_name).where(Category.is_deleted.is_(False)))
         return result.scalars().all()
+
+
+category_service = CategoryService()
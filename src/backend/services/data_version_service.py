@@ -0,0 +1,101 @@
+import hashlib
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models.user_model import User
+from backend.services.ttl_cache import TTLCache
+
+# responses are keyed by data version, so entries never go stale; the TTL only ages out old versions
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "10000"))
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "300"))
+
+
+def summary_etag(user_id: str, version: int, resource: str) -> str:
+    """Build the strong ETag for one user's view of a resource (path plus query) at a data version."""
+    digest = hashlib.sha256(f"{user_id}|{resource}".encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, as RFC 9110 asks for GET)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class DataVersionService:
+    """Per-user data version behind summary ETags and the summary response cache.
+
+    The version lives on the users row and is bumped inside the same database
+    transaction as every write that can change a summary, so reading it is a
+    primary-key lookup that never has to touch the transactions table. It is
+    always read from the database: User objects served by the auth cache may
+    be up to USER_CACHE_TTL_SECONDS old, which is why the column is deferred.
+    """
+
+    def __init__(self):
+        self.response_cache = TTLCache(SUMMARY_CACHE_SIZE, SUMMARY_CACHE_TTL_SECONDS)
+        self.not_modified = 0
+
+    async def bump(self, db: AsyncSession, user_id: str) -> None:
+        """Advance the user's data version. Does not commit; call it in the writing transaction.
+
+        Args:
+            db (AsyncSession): Session of the write.
+            user_id (str): Owner of the changed data.
+        """
+        await db.execute(
+            update(User).where(User.user_id == user_id).values(data_version=User.data_version + 1)
+        )
+
+    async def bump_all(self, db: AsyncSession) -> None:
+        """Advance every user's data version, after a change not tied to one user. Does not commit."""
+        await db.execute(update(User).values(data_version=User.data_version + 1))
+
+    async def get_version(self, db: AsyncSession, user_id: str) -> int:
+        """Read the user's current data version.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): User identifier.
+
+        Returns:
+            int: The version (0 for a user who has never written).
+        """
+        version = await db.scalar(select(User.data_version).where(User.user_id == user_id))
+        return int(version or 0)
+
+    async def cached_response(
+        self,
+        user_id: str,
+        version: int,
+        resource: str,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return a computed response for (user, version, resource), computing it only on a miss.
+
+        Args:
+            user_id (str): User identifier.
+            version (int): Data version read before computing.
+            resource (str): Path plus query string of the request.
+            compute (Callable[[], Awaitable[Any]]): Produces the response body.
+
+        Returns:
+            Any: The (possibly cached) response body.
+        """
+        key = (user_id, version, resource)
+        body = self.response_cache.get(key)
+        if body is None:
+            body = await compute()
+            self.response_cache.set(key, body)
+        return body
+
+    def cache_stats(self) -> dict:
+        return {**self.response_cache.stats(), "not_modified": self.not_modified}
+
+
+data_version_service = DataVersionService()
@@ -0,0 +1,216 @@
+import csv
+import io
+import json
+import os
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import select
+
+from backend.database.database_connection.database_client import AsyncSessionLocal
+from backend.database.models.categories_model import Category
+from backend.database.models.transaction_model import Transactions
+
+# rows fetched per round trip of the server-side cursor, and per encoded output chunk
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "5000"))
+
+EXPORT_COLUMNS = ("transaction_id", "date", "amount", "transaction_type", "category", "to_from", "description")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+# formats written with pyarrow, which is imported only when one of them is requested
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+
+class UnsupportedExportFormatError(Exception):
+    pass
+
+
+class ExportFormatUnavailableError(Exception):
+    pass
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file that hands its bytes back on drain().
+
+    pyarrow writers record offsets from tell(), so the position keeps counting
+    even though written bytes are released after every batch.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _row_dict(row) -> Dict:
+    return {
+        "transaction_id": row.transaction_id,
+        "date": row.date.isoformat(),
+        "amount": row.amount,
+        "transaction_type": row.transaction_type.value,
+        "category": row.category_name,
+        "to_from": row.to_from,
+        "description": row.description,
+    }
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in EXPORT_COLUMNS])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("transaction_id", pa.string()),
+        ("date", pa.date32()),
+        ("amount", pa.float64()),
+        ("transaction_type", pa.dictionary(pa.int32(), pa.string())),
+        ("category", pa.dictionary(pa.int32(), pa.string())),
+        ("to_from", pa.string()),
+        ("description", pa.string()),
+    ])
+
+
+def _record_batch(schema, rows):
+    import pyarrow as pa
+
+    # types and category names repeat heavily, so they are stored dictionary-encoded
+    return pa.RecordBatch.from_pydict(
+        {
+            "transaction_id": [row.transaction_id for row in rows],
+            "date": [row.date for row in rows],
+            "amount": [row.amount for row in rows],
+            "transaction_type": [row.transaction_type.value for row in rows],
+            "category": [row.category_name for row in rows],
+            "to_from": [row.to_from for row in rows],
+            "description": [row.description for row in rows],
+        },
+        schema=schema,
+    )
+
+
+class ExportService:
+    def check_format(self, export_format: str) -> None:
+        """Fail fast, before any bytes are streamed, on a format this process cannot write.
+
+        Args:
+            export_format (str): One of EXPORT_MEDIA_TYPES.
+
+        Raises:
+            UnsupportedExportFormatError: When the format is unknown.
+            ExportFormatUnavailableError: When a columnar format is asked for but pyarrow is not installed.
+        """
+        if export_format not in EXPORT_MEDIA_TYPES:
+            raise UnsupportedExportFormatError(export_format)
+        if export_format in COLUMNAR_FORMATS:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ExportFormatUnavailableError(export_format)
+
+    async def _iter_batches(self, user_id: str, batch_rows: int) -> AsyncIterator[list]:
+        """Yield a user's transactions, oldest first, in batches read through a server-side cursor."""
+        query = (
+            select(
+                Transactions.transaction_id,
+                Transactions.date,
+                Transactions.amount,
+                Transactions.transaction_type,
+                Category.category_name,
+                Transactions.to_from,
+                Transactions.description,
+            )
+            .join(Category, Transactions.category_id == Category.category_id)
+            .where(Transactions.user_id == user_id)
+            .order_by(Transactions.date, Transactions.transaction_id)
+            .execution_options(yield_per=batch_rows)
+        )
+        # a session of its own: the request's session is closed before a streamed body is sent
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                yield rows
+
+    async def stream_export(
+        self, user_id: str, export_format: str, batch_rows: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream all of a user's transactions as CSV, NDJSON, Parquet or an Arrow IPC stream.
+
+        Rows are fetched EXPORT_BATCH_ROWS at a time and each batch is encoded and
+        sent before the next is read, so memory use does not grow with the size of
+        the history and the first rows go out as soon as the first batch arrives.
+
+        Args:
+            user_id (str): Owner of the transactions.
+            export_format (str): One of EXPORT_MEDIA_TYPES; call check_format first.
+            batch_rows (int | None): Rows per fetch and output chunk (EXPORT_BATCH_ROWS by default).
+
+        Yields:
+            bytes: Encoded output chunks.
+        """
+        batch_rows = batch_rows or EXPORT_BATCH_ROWS
+        # aclosing: a client that disconnects mid-stream closes this generator, and the
+        # cursor and its session must be released then rather than whenever it is collected
+        async with aclosing(self._iter_batches(user_id, batch_rows)) as batches:
+            if export_format == "csv":
+                yield (",".join(EXPORT_COLUMNS) + "\r\n").encode("utf-8")
+                async for rows in batches:
+                    yield _csv_chunk(_row_dict(row) for row in rows)
+            elif export_format == "ndjson":
+                async for rows in batches:
+                    yield "".join(json.dumps(_row_dict(row)) + "\n" for row in rows).encode("utf-8")
+            elif export_format in COLUMNAR_FORMATS:
+                async with aclosing(self._stream_columnar(batches, export_format)) as chunks:
+                    async for chunk in chunks:
+                        yield chunk
+            else:
+                raise UnsupportedExportFormatError(export_format)
+
+    async def _stream_columnar(self, batches: AsyncIterator[list], export_format: str) -> AsyncIterator[bytes]:
+        """Write each fetched batch as one Parquet row group or Arrow record batch."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema()
+        sink = _DrainableSink()
+        if export_format == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+        try:
+            async for rows in batches:
+                writer.write_batch(_record_batch(schema, rows))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+
+export_service = ExportService()
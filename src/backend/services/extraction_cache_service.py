@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models.extraction_cache_model import ExtractionCacheEntry
+from backend.schemas.transaction_schema import TransactionCreate, TransactionList
+
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+HASH_CHUNK_BYTES = 1024 * 1024
+
+RAW_KEY = "raw"
+TEXT_KEY = "text"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file's raw bytes without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_statement_text(text: str) -> str:
+    """Collapse whitespace and drop blank lines so re-exports of a statement hash the same."""
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class StatementTextHasher:
+    """Incrementally hash normalized statement text as pages stream past.
+
+    Feeding a statement's pages in order gives the same digest as text_sha256 on
+    the whole text, without holding the text in memory.
+    """
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+        self._started = False
+
+    def update(self, page_text: str) -> None:
+        for line in page_text.splitlines():
+            line = _WHITESPACE.sub(" ", line).strip()
+            if not line:
+                continue
+            if self._started:
+                self._digest.update(b"\n")
+            self._digest.update(line.encode("utf-8"))
+            self._started = True
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def text_sha256(text: str) -> str:
+    """Hash the normalized extracted text of a statement."""
+    hasher = StatementTextHasher()
+    hasher.update(text)
+    return hasher.hexdigest()
+
+
+class ExtractionCacheService:
+    """DB-backed cache of validated extraction output with a TTL and size-based LRU eviction."""
+
+    def __init__(self):
+        self.hits = {RAW_KEY: 0, TEXT_KEY: 0}
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, user_id: str, kind: str, digest: str) -> Optional[list[TransactionCreate]]:
+        """Look up cached transactions and mark the entry as recently used.
+
+        Does not commit; the access time is persisted with the caller's next commit.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the upload.
+            kind (str): RAW_KEY or TEXT_KEY.
+            digest (str): sha256 hex digest of the raw bytes or normalized text.
+
+        Returns:
+            list[TransactionCreate] | None: Cached transactions, or None on a miss.
+        """
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(ExtractionCacheEntry)
+            .where(
+                ExtractionCacheEntry.user_id == user_id,
+                ExtractionCacheEntry.cache_key == f"{kind}:{digest}",
+                ExtractionCacheEntry.created_at > now - timedelta(seconds=EXTRACTION_CACHE_TTL_SECONDS),
+            )
+            .values(last_accessed_at=now, hit_count=ExtractionCacheEntry.hit_count + 1)
+            .returning(ExtractionCacheEntry.payload)
+        )
+        payload = result.scalar_one_or_none()
+        if payload is None:
+            if kind == TEXT_KEY:
+                # a raw miss followed by a text lookup counts as one miss
+                self.misses += 1
+            return None
+        self.hits[kind] += 1
+        return TransactionList.model_validate(payload).root
+
+    async def put(self, db: AsyncSession, user_id: str, digests: dict[str, str], transactions: list[TransactionCreate]) -> None:
+        """Store extraction output under each given key, evict, and commit.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the upload.
+            digests (dict[str, str]): Key kind (RAW_KEY/TEXT_KEY) -> digest.
+            transactions (list[TransactionCreate]): Validated extraction output.
+        """
+        if not transactions or not digests:
+            return
+        payload = TransactionList(transactions).model_dump(mode="json")
+        size_bytes = len(json.dumps(payload))
+        now = datetime.now(timezone.utc)
+        stmt = insert(ExtractionCacheEntry).values([
+            {
+                "user_id": user_id,
+                "cache_key": f"{kind}:{digest}",
+                "payload": payload,
+                "size_bytes": size_bytes,
+                "created_at": now,
+                "last_accessed_at": now,
+                "hit_count": 0,
+            }
+            for kind, digest in digests.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ExtractionCacheEntry.user_id, ExtractionCacheEntry.cache_key],
+            set_={
+                "payload": stmt.excluded.payload,
+                "size_bytes": stmt.excluded.size_bytes,
+                "created_at": stmt.excluded.created_at,
+                "last_accessed_at": stmt.excluded.last_accessed_at,
+            },
+        )
+        try:
+            await db.execute(stmt)
+            await self.evict(db)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    async def evict(self, db: AsyncSession) -> int:
+        """Drop expired entries, then least recently used ones beyond EXTRACTION_CACHE_MAX_BYTES.
+
+        Does not commit.
+
+        Args:
+            db (AsyncSession): Async database session.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        expired = await db.execute(
+            delete(ExtractionCacheEntry).where(
+                ExtractionCacheEntry.created_at
+                <= datetime.now(timezone.utc) - timedelta(seconds=EXTRACTION_CACHE_TTL_SECONDS)
+            )
+        )
+        # running total from the most recently used entry down; everything past the budget goes
+        ranked = select(
+            ExtractionCacheEntry.user_id,
+            ExtractionCacheEntry.cache_key,
+            func.sum(ExtractionCacheEntry.size_bytes)
+            .over(order_by=(ExtractionCacheEntry.last_accessed_at.desc(), ExtractionCacheEntry.cache_key))
+            .label("running_bytes"),
+        ).subquery()
+        over_budget = await db.execute(
+            delete(ExtractionCacheEntry).where(
+                tuple_(ExtractionCacheEntry.user_id, ExtractionCacheEntry.cache_key).in_(
+                    select(ranked.c.user_id, ranked.c.cache_key).where(
+                        ranked.c.running_bytes > EXTRACTION_CACHE_MAX_BYTES
+                    )
+                )
+            )
+        )
+        return expired.rowcount + over_budget.rowcount
+
+    async def stats(self, db: AsyncSession) -> dict:
+        """Hit/miss counters for this process plus the cache's current size.
+
+        Args:
+            db (AsyncSession): Async database session.
+
+        Returns:
+            dict: Counters, hit rate, entry count and bytes against the configured budget.
+        """
+        row = (await db.execute(
+            select(func.count(), func.coalesce(func.sum(ExtractionCacheEntry.size_bytes), 0))
+        )).one()
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "raw_hits": self.hits[RAW_KEY],
+            "text_hits": self.hits[TEXT_KEY],
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": int(row[0]),
+            "size_bytes": int(row[1]),
+            "max_bytes": EXTRACTION_CACHE_MAX_BYTES,
+            "ttl_seconds": EXTRACTION_CACHE_TTL_SECONDS,
+        }
+
+
+extraction_cache_service = ExtractionCacheService()
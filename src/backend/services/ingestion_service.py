@@ -0,0 +1,718 @@
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+
+from fastapi import UploadFile
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.database_connection.database_client import AsyncSessionLocal
+from backend.database.models.ingestion_job_model import IngestionJob, IngestionStatusEnum
+from backend.services.extraction_cache_service import (
+    RAW_KEY,
+    TEXT_KEY,
+    StatementTextHasher,
+    extraction_cache_service,
+    file_sha256,
+)
+from backend.services.merchant_index_service import merchant_index_service
+from backend.services.transaction_service import SUPPORTED_STATEMENT_EXTENSIONS, transaction_service
+
+logger = logging.getLogger(__name__)
+
+# jobs spend most of their time waiting on Gemini, which GEMINI_MAX_CONCURRENCY bounds globally,
+# so enough workers run a batch of monthly statements side by side
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "8"))
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+# a RUNNING job not touched for this long is assumed orphaned by a dead worker and requeued
+INGESTION_STALE_SECONDS = int(os.getenv("INGESTION_STALE_SECONDS", "900"))
+# how often each process looks for jobs orphaned by another one
+INGESTION_SWEEP_SECONDS = float(os.getenv("INGESTION_SWEEP_SECONDS", "60"))
+# a running stage refreshes the job's updated_at this often, keeping a long extraction from looking stale
+INGESTION_HEARTBEAT_SECONDS = float(os.getenv("INGESTION_HEARTBEAT_SECONDS", "60"))
+# first retry waits this long, doubling on each further attempt
+INGESTION_RETRY_BACKOFF_SECONDS = float(os.getenv("INGESTION_RETRY_BACKOFF_SECONDS", "5"))
+# jobs resume on whichever process picks them up (restart, stale sweep), so with more than one
+# host or container this must be storage they all mount; the temp-dir default suits a single host
+INGESTION_SPOOL_DIR = os.getenv("INGESTION_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "finanlytics-uploads"))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(64 * 1024 * 1024)))
+# limits for /upload/batch: the whole request body, and statements per batch (zip members included)
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "50"))
+
+
+class UnsupportedStatementError(Exception):
+    pass
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+class TooManyFilesError(Exception):
+    pass
+
+
+@dataclass
+class BatchUpload:
+    """Jobs queued for one batch upload, plus files rejected before queueing."""
+    batch_id: str
+    jobs: list = field(default_factory=list)
+    rejected: list = field(default_factory=list)  # {"filename", "error"} per refused file
+
+
+def summarize_batch(batch_id: str, jobs: list, rejected: list = ()) -> dict:
+    """Combine a batch's jobs into its overall status and row totals.
+
+    Args:
+        batch_id (str): Batch identifier.
+        jobs (list[IngestionJob]): The batch's jobs.
+        rejected (list[dict]): Files refused at upload.
+
+    Returns:
+        dict: Matches IngestionBatchRead.
+    """
+    finished = (IngestionStatusEnum.SUCCEEDED, IngestionStatusEnum.FAILED)
+    return {
+        "batch_id": batch_id,
+        "status": "finished" if all(job.status in finished for job in jobs) else "running",
+        "rows_inserted": sum(job.rows_inserted or 0 for job in jobs),
+        "rows_skipped": sum(job.rows_skipped or 0 for job in jobs),
+        "jobs": jobs,
+        "rejected": list(rejected),
+    }
+
+
+def _unsupported(filename: str) -> dict:
+    return {"filename": filename, "error": "Unsupported file type. Upload .pdf or .txt statements."}
+
+
+def _too_large(filename: str, max_bytes: int) -> dict:
+    return {"filename": filename, "error": f"File exceeds the {max_bytes // (1024 * 1024)} MB limit."}
+
+
+def unpack_statement_archive(archive_path: str, archive_name: str, spool_dir: str, max_files: int) -> tuple[list, list]:
+    """Extract the statements in a zip archive into the spool, one file per job.
+
+    Members are streamed out in chunks and cut off at MAX_UPLOAD_BYTES whatever their
+    declared size, so a crafted archive cannot fill the disk. Directories and
+    hidden or macOS metadata entries are ignored.
+
+    Args:
+        archive_path (str): Spooled zip file.
+        archive_name (str): Name of the uploaded archive, for error reporting.
+        spool_dir (str): Directory the statements are extracted to.
+        max_files (int): Most statements accepted from the archive.
+
+    Returns:
+        tuple[list, list]: (job_id, filename, source_path) per extracted statement, and
+            rejected files as {"filename", "error"}.
+
+    Raises:
+        TooManyFilesError: When the archive holds more than max_files statements.
+    """
+    accepted, rejected = [], []
+    try:
+        archive = zipfile.ZipFile(archive_path)
+    except zipfile.BadZipFile:
+        return [], [{"filename": archive_name, "error": "Not a valid zip archive."}]
+    with archive:
+        try:
+            _unpack_members(archive, spool_dir, max_files, accepted, rejected)
+        except BaseException:
+            for _, _, source_path in accepted:
+                _remove_file(source_path)
+            raise
+    return accepted, rejected
+
+
+def _unpack_members(archive: zipfile.ZipFile, spool_dir: str, max_files: int, accepted: list, rejected: list) -> None:
+    for info in archive.infolist():
+        filename = os.path.basename(info.filename)
+        if info.is_dir() or not filename or filename.startswith(".") or info.filename.startswith("__MACOSX/"):
+            continue
+        if not filename.lower().endswith(SUPPORTED_STATEMENT_EXTENSIONS):
+            rejected.append(_unsupported(filename))
+            continue
+        if len(accepted) == max_files:
+            raise TooManyFilesError()
+        job_id = str(uuid4())
+        source_path = os.path.join(spool_dir, job_id)
+        written = 0
+        try:
+            with archive.open(info) as member, open(source_path, "wb") as spool:
+                while chunk := member.read(UPLOAD_CHUNK_BYTES):
+                    written += len(chunk)
+                    if written > MAX_UPLOAD_BYTES:
+                        raise UploadTooLargeError()
+                    spool.write(chunk)
+        except UploadTooLargeError:
+            _remove_file(source_path)
+            rejected.append(_too_large(filename, MAX_UPLOAD_BYTES))
+            continue
+        except (RuntimeError, zipfile.BadZipFile, NotImplementedError, zlib.error):
+            # encrypted members, corrupt data or unsupported compression
+            _remove_file(source_path)
+            rejected.append({"filename": filename, "error": "Archive member could not be read."})
+            continue
+        except BaseException:
+            _remove_file(source_path)
+            raise
+        accepted.append((job_id, filename, source_path))
+
+
+class IngestionWorkerPool:
+    """In-process pool of asyncio workers that process queued ingestion jobs by id.
+
+    An optional sweep coroutine runs every INGESTION_SWEEP_SECONDS while the pool
+    is started, to pick up jobs no live worker holds.
+    """
+
+    def __init__(self, handler: Callable[[str], Awaitable[None]], sweep: Optional[Callable[[], Awaitable]] = None):
+        self._handler = handler
+        self._sweep = sweep
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        self._pending: set[str] = set()
+        self._timers: set[asyncio.TimerHandle] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self, concurrency: Optional[int] = None) -> None:
+        """Spawn the worker tasks.
+
+        Args:
+            concurrency (int | None): Number of jobs processed at once (INGESTION_WORKERS by default).
+        """
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"ingestion-worker-{i}")
+            for i in range(concurrency or INGESTION_WORKERS)
+        ]
+        if self._sweep is not None:
+            self._sweeper = asyncio.create_task(self._sweep_periodically(), name="ingestion-sweeper")
+
+    async def stop(self) -> None:
+        """Cancel the workers; the handler hands interrupted jobs back to the queue for the next start."""
+        tasks = self._workers + ([self._sweeper] if self._sweeper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._sweeper = None
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
+        self._queue = None
+
+    def submit(self, job_id: str) -> None:
+        """Queue a job id for processing; a no-op when the pool is stopped or already holds it."""
+        if self._queue is None or job_id in self._pending:
+            return
+        self._pending.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    def submit_later(self, job_id: str, delay: float) -> None:
+        """Submit a job after delay seconds; dropped if the pool stops first (the job is still queued in the table)."""
+        if self._queue is None:
+            return
+
+        def fire():
+            self._timers.discard(handle)
+            self.submit(job_id)
+
+        handle = asyncio.get_running_loop().call_later(delay, fire)
+        self._timers.add(handle)
+
+    async def join(self) -> None:
+        """Wait until every submitted job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            # drop from pending first so a handler can resubmit its own job for a retry
+            self._pending.discard(job_id)
+            try:
+                await self._handler(job_id)
+            except Exception:
+                logger.exception("Ingestion job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(INGESTION_SWEEP_SECONDS)
+            try:
+                await self._sweep()
+            except Exception:
+                logger.exception("Ingestion sweep failed")
+
+
+class IngestionService:
+    """Queues statement uploads as persisted jobs and runs them in the background."""
+
+    def check_spool_dir(self) -> None:
+        """Make sure the spool directory exists and is writable before accepting uploads.
+
+        Raises:
+            RuntimeError: When INGESTION_SPOOL_DIR cannot be created or written.
+        """
+        try:
+            os.makedirs(INGESTION_SPOOL_DIR, exist_ok=True)
+        except OSError as exc:
+            raise RuntimeError(f"INGESTION_SPOOL_DIR {INGESTION_SPOOL_DIR!r} cannot be created: {exc}") from exc
+        if not os.access(INGESTION_SPOOL_DIR, os.W_OK | os.X_OK):
+            raise RuntimeError(f"INGESTION_SPOOL_DIR {INGESTION_SPOOL_DIR!r} is not writable")
+        if "INGESTION_SPOOL_DIR" not in os.environ:
+            logger.warning(
+                "Spooling uploads to the local temp dir %s; set INGESTION_SPOOL_DIR to shared storage "
+                "if jobs can resume on another host", INGESTION_SPOOL_DIR,
+            )
+
+    async def enqueue_upload(self, db: AsyncSession, user_id: str, file: UploadFile) -> IngestionJob:
+        """Spool an upload to disk in chunks, persist a queued job and hand it to the worker pool.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the upload.
+            file (UploadFile): Uploaded statement (txt/pdf).
+
+        Returns:
+            IngestionJob: The queued job.
+
+        Raises:
+            UnsupportedStatementError: When the file type is not supported.
+            UploadTooLargeError: When the file is larger than MAX_UPLOAD_BYTES.
+        """
+        filename = file.filename or ""
+        if not filename.lower().endswith(SUPPORTED_STATEMENT_EXTENSIONS):
+            raise UnsupportedStatementError()
+
+        job_id = str(uuid4())
+        source_path = os.path.join(INGESTION_SPOOL_DIR, job_id)
+        await _spool_upload(file, source_path, MAX_UPLOAD_BYTES)
+        jobs = await self._queue_jobs(db, user_id, [(job_id, filename, source_path)])
+        return jobs[0]
+
+    async def enqueue_batch(self, db: AsyncSession, user_id: str, files: list[UploadFile]) -> BatchUpload:
+        """Queue many statements, given as separate files and/or zip archives, as one batch.
+
+        Every statement becomes its own job, so they are read and extracted in parallel
+        by the worker pool and each is written with its own bulk commit. Files that
+        cannot be processed are reported in the result instead of failing the batch.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the uploads.
+            files (list[UploadFile]): Statements (txt/pdf) and zip archives of statements.
+
+        Returns:
+            BatchUpload: The batch id, its queued jobs and the rejected files.
+
+        Raises:
+            TooManyFilesError: When the batch holds more than MAX_BATCH_FILES statements.
+        """
+        batch = BatchUpload(batch_id=str(uuid4()))
+        accepted: list[tuple[str, str, str]] = []
+        try:
+            for file in files:
+                filename = file.filename or ""
+                is_archive = filename.lower().endswith(".zip")
+                if not is_archive and not filename.lower().endswith(SUPPORTED_STATEMENT_EXTENSIONS):
+                    batch.rejected.append(_unsupported(filename))
+                    continue
+                if not is_archive and len(accepted) == MAX_BATCH_FILES:
+                    raise TooManyFilesError()
+                job_id = str(uuid4())
+                source_path = os.path.join(INGESTION_SPOOL_DIR, job_id)
+                max_bytes = MAX_BATCH_UPLOAD_BYTES if is_archive else MAX_UPLOAD_BYTES
+                try:
+                    await _spool_upload(file, source_path, max_bytes)
+                except UploadTooLargeError:
+                    batch.rejected.append(_too_large(filename, max_bytes))
+                    continue
+                if not is_archive:
+                    accepted.append((job_id, filename, source_path))
+                    continue
+                try:
+                    members, rejected = await asyncio.to_thread(
+                        unpack_statement_archive, source_path, filename, INGESTION_SPOOL_DIR,
+                        MAX_BATCH_FILES - len(accepted),
+                    )
+                finally:
+                    _remove_file(source_path)
+                accepted.extend(members)
+                batch.rejected.extend(rejected)
+        except BaseException:
+            for _, _, source_path in accepted:
+                _remove_file(source_path)
+            raise
+        if accepted:
+            batch.jobs = await self._queue_jobs(db, user_id, accepted, batch_id=batch.batch_id)
+        return batch
+
+    async def _queue_jobs(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        uploads: list[tuple[str, str, str]],
+        batch_id: Optional[str] = None,
+    ) -> list[IngestionJob]:
+        """Persist queued jobs for spooled uploads in one commit, then hand them to the worker pool.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the uploads.
+            uploads (list[tuple[str, str, str]]): (job_id, filename, source_path) per upload.
+            batch_id (str | None): Batch the jobs belong to.
+
+        Returns:
+            list[IngestionJob]: The queued jobs, in upload order.
+        """
+        now = datetime.now(timezone.utc)
+        jobs = [
+            IngestionJob(
+                job_id=job_id,
+                user_id=user_id,
+                batch_id=batch_id,
+                filename=filename,
+                source_path=source_path,
+                status=IngestionStatusEnum.QUEUED,
+                stage_timings={},
+                attempts=0,
+                created_at=now,
+                updated_at=now,
+            )
+            for job_id, filename, source_path in uploads
+        ]
+        try:
+            for job in jobs:
+                db.add(job)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            for _, _, source_path in uploads:
+                _remove_file(source_path)
+            raise
+        for job in jobs:
+            ingestion_worker_pool.submit(job.job_id)
+        return jobs
+
+    async def get_job(self, db: AsyncSession, user_id: str, job_id: str) -> Optional[IngestionJob]:
+        """Fetch a job owned by a user.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the job.
+            job_id (str): Job identifier.
+
+        Returns:
+            IngestionJob | None: Matching job or None.
+        """
+        result = await db.execute(
+            select(IngestionJob).where(IngestionJob.job_id == job_id, IngestionJob.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_batch(self, db: AsyncSession, user_id: str, batch_id: str) -> list[IngestionJob]:
+        """Fetch the jobs of a batch owned by a user.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the batch.
+            batch_id (str): Batch identifier.
+
+        Returns:
+            list[IngestionJob]: The batch's jobs in upload order; empty when there is no such batch.
+        """
+        result = await db.execute(
+            select(IngestionJob)
+            .where(IngestionJob.batch_id == batch_id, IngestionJob.user_id == user_id)
+            .order_by(IngestionJob.created_at, IngestionJob.filename)
+        )
+        return list(result.scalars())
+
+    async def resume_pending_jobs(self, stale_only: bool = False) -> int:
+        """Requeue jobs left behind by a previous or crashed worker process.
+
+        Running jobs whose heartbeat is older than INGESTION_STALE_SECONDS are reset
+        to queued. At startup every queued job is then submitted; the periodic sweep
+        (stale_only) submits only those idle for as long, since newer ones are still
+        held by a live process's queue or retry backoff.
+
+        Args:
+            stale_only (bool): Skip queued jobs updated within INGESTION_STALE_SECONDS.
+
+        Returns:
+            int: Number of jobs submitted to the pool.
+        """
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=INGESTION_STALE_SECONDS)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.status == IngestionStatusEnum.RUNNING,
+                    IngestionJob.updated_at < stale_before,
+                )
+                .values(status=IngestionStatusEnum.QUEUED, stage=None)
+            )
+            await db.commit()
+            query = (
+                select(IngestionJob.job_id)
+                .where(IngestionJob.status == IngestionStatusEnum.QUEUED)
+                .order_by(IngestionJob.created_at)
+            )
+            if stale_only:
+                query = query.where(IngestionJob.updated_at < stale_before)
+            job_ids = (await db.execute(query)).scalars().all()
+        for job_id in job_ids:
+            ingestion_worker_pool.submit(job_id)
+        return len(job_ids)
+
+    async def sweep_stale_jobs(self) -> int:
+        """Periodic pass that requeues jobs orphaned by a worker process that died mid-job."""
+        return await self.resume_pending_jobs(stale_only=True)
+
+    async def process_job(self, job_id: str) -> None:
+        """Run a queued job through the extraction stages and the write.
+
+        The job is claimed with a conditional update so only one worker processes it.
+        The final write and the SUCCEEDED status commit in the same database transaction,
+        so a retried job cannot write twice; rows already stored from another upload are
+        counted as skipped. A job cancelled by shutdown goes back to queued without
+        using up an attempt.
+
+        Args:
+            job_id (str): Job identifier.
+        """
+        async with AsyncSessionLocal() as db:
+            now = datetime.now(timezone.utc)
+            claimed = await db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.job_id == job_id, IngestionJob.status == IngestionStatusEnum.QUEUED)
+                .values(
+                    status=IngestionStatusEnum.RUNNING,
+                    attempts=IngestionJob.attempts + 1,
+                    started_at=now,
+                    updated_at=now,
+                )
+                .returning(IngestionJob.job_id)
+            )
+            if claimed.scalar_one_or_none() is None:
+                await db.rollback()
+                return
+            await db.commit()
+
+            job = await db.get(IngestionJob, job_id)
+            timings = dict(job.stage_timings or {})
+            if not os.path.exists(job.source_path):
+                # retrying cannot bring it back: the upload was spooled on storage this process does not see
+                self._finish(
+                    job, IngestionStatusEnum.FAILED, timings,
+                    error="Uploaded file is missing from the spool; INGESTION_SPOOL_DIR must be shared by every worker.",
+                )
+                await db.commit()
+                logger.warning("Ingestion job %s failed: spooled upload %s is missing", job_id, job.source_path)
+                return
+            try:
+                transactions_in = await self._extract_statement(db, job, timings)
+                job.rows_extracted = len(transactions_in)
+                transactions_in = await self._categorize(db, job, transactions_in, timings)
+
+                started = time.perf_counter()
+                job.stage = "write"
+                inserted = await transaction_service.write_transactions_bulk(
+                    db, transactions_in, job.user_id, commit=False
+                )
+                timings["write"] = round(time.perf_counter() - started, 4)
+                self._finish(
+                    job, IngestionStatusEnum.SUCCEEDED, timings,
+                    rows_inserted=inserted, rows_skipped=len(transactions_in) - inserted,
+                )
+                await db.commit()
+            except asyncio.CancelledError:
+                await self._release_interrupted(db, job_id)
+                raise
+            except Exception as exc:
+                await db.rollback()
+                job = await db.get(IngestionJob, job_id)
+                if job.attempts >= INGESTION_MAX_ATTEMPTS:
+                    self._finish(job, IngestionStatusEnum.FAILED, timings, error=f"{type(exc).__name__}: {exc}")
+                else:
+                    job.status = IngestionStatusEnum.QUEUED
+                    job.stage_timings = timings
+                    job.updated_at = datetime.now(timezone.utc)
+                await db.commit()
+                if job.status == IngestionStatusEnum.QUEUED:
+                    backoff = INGESTION_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+                    ingestion_worker_pool.submit_later(job_id, backoff)
+                    return
+                logger.warning("Ingestion job %s failed: %s", job_id, job.error)
+        _remove_file(job.source_path)
+
+    @staticmethod
+    async def _release_interrupted(db: AsyncSession, job_id: str) -> None:
+        """Hand a job cut off by shutdown back to the queue instead of leaving it RUNNING until it goes stale."""
+        try:
+            await db.rollback()
+            await db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.job_id == job_id, IngestionJob.status == IngestionStatusEnum.RUNNING)
+                .values(
+                    status=IngestionStatusEnum.QUEUED,
+                    stage=None,
+                    attempts=IngestionJob.attempts - 1,
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+        except Exception:
+            logger.exception("Could not requeue interrupted ingestion job %s", job_id)
+
+    async def _extract_statement(self, db: AsyncSession, job: IngestionJob, timings: dict) -> list:
+        """Obtain a statement's transactions by the cheapest path available.
+
+        In order: the extraction cache keyed by the raw bytes (an identical re-upload
+        skips parsing entirely), a registered table-layout parser for known bank PDFs,
+        the cache keyed by the normalized text (e.g. the same statement re-exported),
+        and finally the LLM. The path taken is recorded on the job.
+        """
+        digests = {}
+        async with self._stage(db, job, "cache", timings):
+            digests[RAW_KEY] = await asyncio.to_thread(file_sha256, job.source_path)
+            cached = await extraction_cache_service.get(db, job.user_id, RAW_KEY, digests[RAW_KEY])
+        if cached is not None:
+            job.extraction_path = "cache"
+            return cached
+
+        async with self._stage(db, job, "parse", timings):
+            parsed = await transaction_service.parse_statement_tables(job.source_path, job.filename)
+        if parsed is not None:
+            job.extraction_path = f"parser:{parsed.parser}"
+            return parsed.transactions
+
+        async with self._stage(db, job, "read", timings):
+            hasher = StatementTextHasher()
+            chunks = await transaction_service.read_statement_chunks(job.source_path, job.filename, on_page=hasher.update)
+            digests[TEXT_KEY] = hasher.hexdigest()
+            cached = await extraction_cache_service.get(db, job.user_id, TEXT_KEY, digests[TEXT_KEY])
+        if cached is not None:
+            # remember these bytes too so the next identical upload skips the parse
+            await extraction_cache_service.put(db, job.user_id, {RAW_KEY: digests[RAW_KEY]}, cached)
+            job.extraction_path = "cache"
+            return cached
+
+        async with self._stage(db, job, "extract", timings):
+            transactions_in = await transaction_service.extract_statement_chunks(chunks)
+        await extraction_cache_service.put(db, job.user_id, digests, transactions_in)
+        job.extraction_path = "llm"
+        return transactions_in
+
+    async def _categorize(self, db: AsyncSession, job: IngestionJob, transactions_in: list, timings: dict) -> list:
+        """Categorize counterparties the user has paid before from their merchant index.
+
+        Extraction by the LLM already categorized every row, so there the index only
+        replaces the model's guess with the user's own history. Rows from a
+        deterministic parser carry a placeholder category; those the index cannot
+        place are sent to the model, one line per distinct merchant.
+        """
+        async with self._stage(db, job, "categorize", timings):
+            transactions_in, unresolved = await merchant_index_service.categorize(db, job.user_id, transactions_in)
+            if unresolved and (job.extraction_path or "").startswith("parser:"):
+                # end the index read's transaction so the connection is not held idle during the model call
+                await db.commit()
+                transactions_in = await transaction_service.categorize_unresolved(transactions_in, unresolved)
+        return transactions_in
+
+    @asynccontextmanager
+    async def _stage(self, db: AsyncSession, job: IngestionJob, stage: str, timings: dict):
+        """Record a stage transition and its duration, heartbeating the job while the stage runs."""
+        job.stage = stage
+        job.updated_at = datetime.now(timezone.utc)
+        await db.commit()
+        started = time.perf_counter()
+        heartbeat = asyncio.create_task(self._heartbeat(job.job_id))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+        timings[stage] = round(time.perf_counter() - started, 4)
+        job.stage_timings = dict(timings)
+
+    @staticmethod
+    async def _heartbeat(job_id: str) -> None:
+        """Refresh a running job's updated_at every INGESTION_HEARTBEAT_SECONDS, on a session of its own."""
+        while True:
+            await asyncio.sleep(INGESTION_HEARTBEAT_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(IngestionJob)
+                        .where(IngestionJob.job_id == job_id, IngestionJob.status == IngestionStatusEnum.RUNNING)
+                        .values(updated_at=datetime.now(timezone.utc))
+                    )
+                    await db.commit()
+            except Exception:
+                logger.warning("Heartbeat for ingestion job %s failed", job_id, exc_info=True)
+
+    @staticmethod
+    def _finish(job: IngestionJob, status: IngestionStatusEnum, timings: dict, rows_inserted: Optional[int] = None, rows_skipped: Optional[int] = None, error: Optional[str] = None) -> None:
+        now = datetime.now(timezone.utc)
+        job.status = status
+        job.stage = None
+        job.stage_timings = dict(timings)
+        job.rows_inserted = rows_inserted
+        job.rows_skipped = rows_skipped
+        job.error = error
+        job.updated_at = now
+        job.finished_at = now
+
+
+async def _spool_upload(file: UploadFile, path: str, max_bytes: int) -> None:
+    """Copy an upload to disk in chunks, removing it again if it exceeds max_bytes.
+
+    Raises:
+        UploadTooLargeError: When the upload is larger than max_bytes.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    try:
+        with open(path, "wb") as spool:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLargeError()
+                spool.write(chunk)
+    except BaseException:
+        _remove_file(path)
+        raise
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+ingestion_service = IngestionService()
+ingestion_worker_pool = IngestionWorkerPool(ingestion_service.process_job, sweep=ingestion_service.sweep_stale_jobs)
@@ -0,0 +1,329 @@
+import os
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models.categories_model import Category
+from backend.database.models.merchant_category_model import MerchantCategory
+from backend.database.models.transaction_model import Transactions
+from backend.schemas.transaction_schema import TransactionCreate
+from backend.services.rollup_service import transaction_type_name
+from backend.services.session_hooks import on_commit
+from backend.services.ttl_cache import TTLCache
+
+MERCHANT_INDEX_TTL_SECONDS = float(os.getenv("MERCHANT_INDEX_TTL_SECONDS", "300"))
+MERCHANT_INDEX_CACHE_SIZE = int(os.getenv("MERCHANT_INDEX_CACHE_SIZE", "10000"))
+# keys keep at most this many words, so trailing branch names or locations do not split a merchant
+MERCHANT_KEY_MAX_TOKENS = int(os.getenv("MERCHANT_KEY_MAX_TOKENS", "4"))
+
+# ingestion only fills keys nobody has mapped yet; a user's own choice always overwrites
+LEARNED = "learned"
+USER = "user"
+
+# the catch-all category says nothing about a merchant, so rows in it are never learned
+UNINFORMATIVE_CATEGORY = "miscellaneous"
+
+# conflict target of index upserts: merchant_categories' primary key
+_INDEX_KEY = [MerchantCategory.user_id, MerchantCategory.merchant_key, MerchantCategory.transaction_type]
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# channel and transfer boilerplate banks put around the counterparty name
+_NOISE_TOKENS = frozenset({
+    "pos", "web", "purchase", "payment", "pymt", "trf", "tfr", "transfer", "to", "from", "frm",
+    "nip", "ussd", "mobile", "mob", "ref", "card", "debit", "credit", "via", "inward", "outward",
+})
+
+
+def normalize_merchant(to_from: Optional[str]) -> str:
+    """Reduce a counterparty to the key it is indexed under.
+
+    Lower-cases, splits on punctuation, and drops channel boilerplate, single
+    letters and any token containing a digit (references, account and phone
+    numbers), so "POS/WEB PURCHASE NETFLIX.COM 23849" becomes "netflix com".
+
+    Args:
+        to_from (str | None): Counterparty as written on the statement.
+
+    Returns:
+        str: Space-separated key, empty when nothing identifying remains.
+    """
+    tokens = [
+        token
+        for token in _NON_WORD.split((to_from or "").lower())
+        if len(token) > 1 and token not in _NOISE_TOKENS and not any(ch.isdigit() for ch in token)
+    ]
+    return " ".join(tokens[:MERCHANT_KEY_MAX_TOKENS])
+
+
+@dataclass(frozen=True)
+class MerchantIndex:
+    """One user's (merchant key, transaction type) pairs mapped to (category_id, category_name), as loaded at a cache version."""
+    version: int
+    entries: Dict[Tuple[str, str], Tuple[int, str]]
+
+    def lookup(self, to_from: Optional[str], transaction_type) -> Optional[Tuple[int, str]]:
+        """Return the category of the longest indexed key of this type that is a word prefix of the counterparty.
+
+        "netflix" matches "NETFLIX.COM LAGOS" as well as "NETFLIX", at one dict probe
+        per word of the key. A refund from a merchant does not take the category of
+        payments to it, since the type is part of the key.
+        """
+        type_name = transaction_type_name(transaction_type)
+        tokens = normalize_merchant(to_from).split()
+        for length in range(len(tokens), 0, -1):
+            match = self.entries.get((" ".join(tokens[:length]), type_name))
+            if match is not None:
+                return match
+        return None
+
+
+def apply_merchant_index(
+    index: MerchantIndex,
+    transactions_in: List[TransactionCreate],
+) -> Tuple[List[TransactionCreate], List[int]]:
+    """Recategorize transactions whose counterparty is in the index.
+
+    Args:
+        index (MerchantIndex): The user's merchant index.
+        transactions_in (list[TransactionCreate]): Extracted transactions.
+
+    Returns:
+        tuple[list[TransactionCreate], list[int]]: The transactions (known merchants
+        carrying their indexed category) and the positions of those left unresolved.
+    """
+    categorized = []
+    unresolved = []
+    for position, tx in enumerate(transactions_in):
+        match = index.lookup(tx.to_from, tx.transaction_type)
+        if match is None:
+            unresolved.append(position)
+            categorized.append(tx)
+        elif match[1] != tx.category:
+            categorized.append(tx.model_copy(update={"category": match[1]}))
+        else:
+            categorized.append(tx)
+    return categorized, unresolved
+
+
+class MerchantIndexService:
+    """Per-user merchant-to-category index that lets ingestion skip categorizing repeat counterparties.
+
+    The index lives in merchant_categories and is cached in process per user.
+    Ingested transactions add keys not seen before, and manual entries and
+    recategorizations overwrite them, in the writing transaction.
+    """
+
+    def __init__(self):
+        self.index_cache = TTLCache(MERCHANT_INDEX_CACHE_SIZE, MERCHANT_INDEX_TTL_SECONDS)
+        # bumped on every invalidation so a load that raced a change is never cached
+        self._versions: Dict[str, int] = {}
+        self.rows_resolved = 0
+        self.rows_unresolved = 0
+
+    async def get_index(self, db: AsyncSession, user_id: str) -> MerchantIndex:
+        """Return the user's merchant index, loading it in one query on a miss.
+
+        Entries pointing at deleted categories are left out.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the index.
+
+        Returns:
+            MerchantIndex: Category id and name keyed by merchant key and transaction type.
+        """
+        version = self._versions.get(user_id, 0)
+        cached = self.index_cache.get(user_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+        result = await db.execute(
+            select(
+                MerchantCategory.merchant_key,
+                MerchantCategory.transaction_type,
+                Category.category_id,
+                Category.category_name,
+            )
+            .join(Category, MerchantCategory.category_id == Category.category_id)
+            .where(MerchantCategory.user_id == user_id, Category.is_deleted == False)
+        )
+        index = MerchantIndex(
+            version=version,
+            entries={
+                (row.merchant_key, transaction_type_name(row.transaction_type)): (row.category_id, row.category_name)
+                for row in result
+            },
+        )
+        if self._versions.get(user_id, 0) == version:
+            self.index_cache.set(user_id, index)
+        return index
+
+    async def categorize(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        transactions_in: List[TransactionCreate],
+    ) -> Tuple[List[TransactionCreate], List[int]]:
+        """Give known counterparties the category the user's history assigns them.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the transactions.
+            transactions_in (list[TransactionCreate]): Extracted transactions.
+
+        Returns:
+            tuple[list[TransactionCreate], list[int]]: See apply_merchant_index.
+        """
+        if not transactions_in:
+            return [], []
+        index = await self.get_index(db, user_id)
+        categorized, unresolved = apply_merchant_index(index, transactions_in)
+        self.rows_resolved += len(categorized) - len(unresolved)
+        self.rows_unresolved += len(unresolved)
+        return categorized, unresolved
+
+    async def learn(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        assignments: Iterable[Tuple[str, object, int]],
+        source: str = LEARNED,
+    ) -> None:
+        """Record counterparty categories in the index. Does not commit.
+
+        Learned assignments only add merchants that are not indexed yet, taking the
+        category most often given to each in the batch; user assignments overwrite.
+
+        Args:
+            db (AsyncSession): Session of the write.
+            user_id (str): Owner of the index.
+            assignments (Iterable[tuple[str, TransactionTypeEnum | str, int]]): (to_from, transaction_type, category_id) triples.
+            source (str): LEARNED or USER.
+        """
+        votes: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+        for to_from, transaction_type, category_id in assignments:
+            key = normalize_merchant(to_from)
+            if key:
+                votes[(key, transaction_type_name(transaction_type))][category_id] += 1
+        if not votes:
+            return
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "user_id": user_id,
+                "merchant_key": key,
+                "transaction_type": type_name,
+                "category_id": counts.most_common(1)[0][0],
+                "source": source,
+                "updated_at": now,
+            }
+            for (key, type_name), counts in sorted(votes.items())
+        ]
+        stmt = insert(MerchantCategory)
+        if source == USER:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=_INDEX_KEY,
+                set_={"category_id": stmt.excluded.category_id, "source": USER, "updated_at": now},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=_INDEX_KEY)
+        await db.execute(stmt, rows)
+        # the rows are not committed yet; reload once they are visible
+        self.invalidate_on_commit(db, user_id)
+
+    async def rebuild(self, db: AsyncSession, user_id: Optional[str] = None) -> int:
+        """Rebuild learned entries from transaction history and commit.
+
+        Each merchant key and transaction type gets the category its transactions
+        were most often given, ignoring the catch-all category. Entries the user set
+        are kept.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str | None): Rebuild one user only; all users when None.
+
+        Returns:
+            int: Number of learned entries written.
+        """
+        query = (
+            select(
+                Transactions.user_id,
+                Transactions.to_from,
+                Transactions.transaction_type,
+                Transactions.category_id,
+                func.count().label("uses"),
+            )
+            .join(Category, Transactions.category_id == Category.category_id)
+            .where(func.lower(Category.category_name) != UNINFORMATIVE_CATEGORY, Category.is_deleted == False)
+            .group_by(Transactions.user_id, Transactions.to_from, Transactions.transaction_type, Transactions.category_id)
+        )
+        clear = delete(MerchantCategory).where(MerchantCategory.source == LEARNED)
+        if user_id:
+            query = query.where(Transactions.user_id == user_id)
+            clear = clear.where(MerchantCategory.user_id == user_id)
+
+        votes: Dict[Tuple[str, str, str], Counter] = defaultdict(Counter)
+        for row in await db.execute(query):
+            key = normalize_merchant(row.to_from)
+            if key:
+                votes[(row.user_id, key, transaction_type_name(row.transaction_type))][row.category_id] += row.uses
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "user_id": owner,
+                "merchant_key": key,
+                "transaction_type": type_name,
+                "category_id": counts.most_common(1)[0][0],
+                "source": LEARNED,
+                "updated_at": now,
+            }
+            for (owner, key, type_name), counts in sorted(votes.items())
+        ]
+        try:
+            await db.execute(clear)
+            if rows:
+                await db.execute(
+                    insert(MerchantCategory).on_conflict_do_nothing(index_elements=_INDEX_KEY),
+                    rows,
+                )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        if user_id:
+            self.invalidate(user_id)
+        else:
+            self.clear_cache()
+        return len(rows)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's cached index after their mappings or categories change."""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self.index_cache.invalidate(user_id)
+
+    def invalidate_on_commit(self, db: AsyncSession, user_id: str) -> None:
+        """Invalidate a user's index when db commits, so a load racing the write is not cached as current."""
+        on_commit(db, lambda: self.invalidate(user_id))
+
+    def clear_cache(self) -> None:
+        self.index_cache.clear()
+        self._versions.clear()
+
+    def cache_stats(self) -> dict:
+        """Cache hit rate plus how many ingested rows the index categorized without the LLM."""
+        return {
+            **self.index_cache.stats(),
+            "rows_resolved": self.rows_resolved,
+            "rows_unresolved": self.rows_unresolved,
+        }
+
+
+merchant_index_service = MerchantIndexService()
@@ -0,0 +1,137 @@
+"""PDF page text extraction, in-thread for small files and across a process pool for large ones.
+
+Kept free of application imports so pool workers start without loading the
+database, model client or web stack. pdfplumber itself is imported on first
+use so API processes that never read a PDF do not pay for it at start-up.
+"""
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+# 0 or 1 disables the pool; defaults to one process per core
+PDF_WORKER_PROCESSES = int(os.getenv("PDF_WORKER_PROCESSES", str(os.cpu_count() or 1)))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+# below this many pages, pool start-up and IPC cost more than they save
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+
+# one pool per size, created once: readers on several threads share them, so a pool is
+# never replaced while another reader is still waiting on its futures
+_executors: Dict[int, ProcessPoolExecutor] = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(processes: int) -> ProcessPoolExecutor:
+    with _executor_lock:
+        executor = _executors.get(processes)
+        if executor is None:
+            # spawn, not fork: the API process runs an event loop and threads
+            executor = _executors[processes] = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return executor
+
+
+def shutdown_pdf_executor() -> None:
+    """Stop the worker processes, if any were started."""
+    with _executor_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(cancel_futures=True)
+
+
+def count_pdf_pages(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Return the text of pages [start, stop), releasing each page's parse state as it goes."""
+    import pdfplumber
+
+    texts = []
+    with pdfplumber.open(path, pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+            page.close()
+    return texts
+
+
+def _iter_pages_in_thread(path: str) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            try:
+                yield page.extract_text() or ""
+            finally:
+                page.close()
+
+
+def _iter_pages_in_pool(path: str, page_count: int, processes: int, pages_per_task: int) -> Iterator[str]:
+    executor = _get_executor(processes)
+    ranges = iter(
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    )
+    # keep a bounded window of ranges in flight so finished text does not pile up ahead of the consumer
+    in_flight: deque[Future] = deque()
+
+    def submit_next() -> None:
+        page_range = next(ranges, None)
+        if page_range is not None:
+            in_flight.append(executor.submit(extract_page_range, path, *page_range))
+
+    for _ in range(processes * 2):
+        submit_next()
+    try:
+        while in_flight:
+            texts = in_flight.popleft().result()
+            submit_next()
+            yield from texts
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def iter_pdf_pages(
+    path: str,
+    processes: Optional[int] = None,
+    pages_per_task: Optional[int] = None,
+    min_parallel_pages: Optional[int] = None,
+) -> Iterator[str]:
+    """Yield a PDF's page texts in order.
+
+    Small PDFs are read in the calling thread. Larger ones are split into page
+    ranges extracted concurrently by a process pool and reassembled in order, so
+    a long statement uses every core instead of one. Either way pdfplumber's
+    per-page parse state is released after each page.
+
+    Args:
+        path (str): Location of the PDF on disk.
+        processes (int | None): Pool size (PDF_WORKER_PROCESSES by default).
+        pages_per_task (int | None): Pages per pool task (PDF_PAGES_PER_TASK by default).
+        min_parallel_pages (int | None): Smallest page count sent to the pool
+            (PDF_PARALLEL_MIN_PAGES by default).
+
+    Yields:
+        str: Text of each page.
+    """
+    processes = PDF_WORKER_PROCESSES if processes is None else processes
+    pages_per_task = pages_per_task or PDF_PAGES_PER_TASK
+    min_parallel_pages = PDF_PARALLEL_MIN_PAGES if min_parallel_pages is None else min_parallel_pages
+
+    if processes <= 1:
+        yield from _iter_pages_in_thread(path)
+        return
+    page_count = count_pdf_pages(path)
+    if page_count < max(min_parallel_pages, 2):
+        yield from _iter_pages_in_thread(path)
+        return
+    yield from _iter_pages_in_pool(path, page_count, processes, pages_per_task)
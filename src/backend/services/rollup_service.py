@@ -0,0 +1,223 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from types import SimpleNamespace
+from typing import Optional
+
+from sqlalchemy import Integer, cast, delete, extract, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models.monthly_rollup_model import MonthlyRollup
+from backend.database.models.transaction_model import Transactions
+from backend.services.data_version_service import data_version_service
+
+
+def transaction_type_name(transaction_type) -> str:
+    """Normalize a transaction type (enum member or raw string) to its stored name."""
+    return getattr(transaction_type, "name", transaction_type)
+
+
+def rollup_key(row: dict) -> tuple:
+    """Primary key of a monthly_rollups row, in column order."""
+    return (row["user_id"], row["year"], row["month"], row["category_id"], row["transaction_type"])
+
+
+def aggregate_rollup_deltas(transactions: Iterable) -> list[dict]:
+    """Collapse transactions into one rollup delta per (user, year, month, category, type).
+
+    Args:
+        transactions (Iterable): ORM rows, namespaces or dicts exposing user_id, date,
+            category_id, transaction_type and amount.
+
+    Returns:
+        list[dict]: Rows ready for the monthly_rollups upsert.
+    """
+    deltas: dict[tuple, list] = defaultdict(lambda: [0.0, 0])
+    for tx in transactions:
+        if isinstance(tx, dict):
+            tx = SimpleNamespace(**tx)
+        key = (
+            tx.user_id,
+            tx.date.year,
+            tx.date.month,
+            tx.category_id,
+            transaction_type_name(tx.transaction_type),
+        )
+        deltas[key][0] += tx.amount
+        deltas[key][1] += 1
+    return [
+        {
+            "user_id": user_id,
+            "year": year,
+            "month": month,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+            "total_amount": total,
+            "transaction_count": count,
+        }
+        for (user_id, year, month, category_id, transaction_type), (total, count) in deltas.items()
+    ]
+
+
+class RollupService:
+    """Maintains the monthly_rollups table that backs monthly and category summaries."""
+
+    async def apply_transactions(self, db: AsyncSession, transactions: Iterable) -> None:
+        """Add new transactions to the rollups without committing.
+
+        Runs inside the caller's transaction so rollups and raw rows commit together.
+
+        Args:
+            db (AsyncSession): Async database session.
+            transactions (Iterable): Newly written transactions.
+        """
+        await self._upsert(db, aggregate_rollup_deltas(transactions))
+
+    async def remove_transactions(self, db: AsyncSession, transactions: Iterable) -> None:
+        """Take transactions out of the rollups (e.g. before they move category) without committing.
+
+        Args:
+            db (AsyncSession): Async database session.
+            transactions (Iterable): Transactions as they are currently stored.
+        """
+        rows = aggregate_rollup_deltas(transactions)
+        for row in rows:
+            row["total_amount"] = -row["total_amount"]
+            row["transaction_count"] = -row["transaction_count"]
+        await self._upsert(db, rows)
+
+    async def _upsert(self, db: AsyncSession, rows: list[dict]) -> None:
+        """Add rollup deltas to their rows, creating missing ones.
+
+        Rows are written in primary-key order, so concurrent jobs touching the
+        same months and categories lock them in the same order instead of deadlocking.
+        """
+        if not rows:
+            return
+        stmt = insert(MonthlyRollup).values(sorted(rows, key=rollup_key))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                MonthlyRollup.user_id,
+                MonthlyRollup.year,
+                MonthlyRollup.month,
+                MonthlyRollup.category_id,
+                MonthlyRollup.transaction_type,
+            ],
+            set_={
+                "total_amount": MonthlyRollup.total_amount + stmt.excluded.total_amount,
+                "transaction_count": MonthlyRollup.transaction_count + stmt.excluded.transaction_count,
+            },
+        )
+        await db.execute(stmt)
+
+    def _raw_rollup_query(self, user_id: Optional[str] = None):
+        """Build the GROUP BY over raw transactions that rollups must agree with."""
+        year = cast(extract("year", Transactions.date), Integer)
+        month = cast(extract("month", Transactions.date), Integer)
+        query = (
+            select(
+                Transactions.user_id,
+                year.label("year"),
+                month.label("month"),
+                Transactions.category_id,
+                Transactions.transaction_type,
+                func.sum(Transactions.amount).label("total_amount"),
+                func.count().label("transaction_count"),
+            )
+            .group_by(
+                Transactions.user_id,
+                year,
+                month,
+                Transactions.category_id,
+                Transactions.transaction_type,
+            )
+        )
+        if user_id:
+            query = query.where(Transactions.user_id == user_id)
+        return query
+
+    async def find_drift(self, db: AsyncSession, user_id: Optional[str] = None) -> list[dict]:
+        """Compare rollups with the raw transactions table.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str | None): Restrict the check to one user.
+
+        Returns:
+            list[dict]: One entry per rollup key whose sum or count disagrees.
+        """
+        expected = {}
+        for row in await db.execute(self._raw_rollup_query(user_id)):
+            key = (row.user_id, row.year, row.month, row.category_id, transaction_type_name(row.transaction_type))
+            expected[key] = (float(row.total_amount), int(row.transaction_count))
+
+        stored_query = select(MonthlyRollup)
+        if user_id:
+            stored_query = stored_query.where(MonthlyRollup.user_id == user_id)
+        stored = {}
+        for rollup in (await db.execute(stored_query)).scalars():
+            key = (rollup.user_id, rollup.year, rollup.month, rollup.category_id, transaction_type_name(rollup.transaction_type))
+            stored[key] = (float(rollup.total_amount), int(rollup.transaction_count))
+
+        drift = []
+        for key in expected.keys() | stored.keys():
+            want = expected.get(key, (0.0, 0))
+            have = stored.get(key, (0.0, 0))
+            if want[1] != have[1] or abs(want[0] - have[0]) > 1e-6:
+                user, year, month, category_id, transaction_type = key
+                drift.append({
+                    "user_id": user,
+                    "year": year,
+                    "month": month,
+                    "category_id": category_id,
+                    "transaction_type": transaction_type,
+                    "expected": {"total_amount": want[0], "transaction_count": want[1]},
+                    "stored": {"total_amount": have[0], "transaction_count": have[1]},
+                })
+        return drift
+
+    async def rebuild(self, db: AsyncSession, user_id: Optional[str] = None) -> int:
+        """Recompute rollups from the raw transactions table and commit.
+
+        The rebuilt users' data versions are bumped in the same transaction, so
+        summaries cached or validated against the old rollups are recomputed.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str | None): Rebuild one user only; all users when None.
+
+        Returns:
+            int: Number of rollup rows written.
+        """
+        clear = delete(MonthlyRollup)
+        if user_id:
+            clear = clear.where(MonthlyRollup.user_id == user_id)
+        try:
+            await db.execute(clear)
+            result = await db.execute(
+                insert(MonthlyRollup).from_select(
+                    [
+                        "user_id",
+                        "year",
+                        "month",
+                        "category_id",
+                        "transaction_type",
+                        "total_amount",
+                        "transaction_count",
+                    ],
+                    self._raw_rollup_query(user_id),
+                )
+            )
+            if user_id:
+                await data_version_service.bump(db, user_id)
+            else:
+                await data_version_service.bump_all(db)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        data_version_service.response_cache.clear()
+        return result.rowcount
+
+
+rollup_service = RollupService()
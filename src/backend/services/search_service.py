@@ -0,0 +1,167 @@
+import os
+import re
+from typing import List, Optional
+
+from sqlalchemy import func, literal, or_, select, text
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models.categories_model import Category
+from backend.database.models.transaction_model import SEARCH_OWNER, Transactions
+
+# longer queries are cut to this many words; every word must match
+SEARCH_MAX_TERMS = int(os.getenv("SEARCH_MAX_TERMS", "8"))
+
+_SEARCH_TERM = re.compile(r"\w+")
+
+
+class EmptySearchQueryError(Exception):
+    pass
+
+
+def search_terms(query: str) -> List[str]:
+    """Split free text into lower-cased words, keeping at most SEARCH_MAX_TERMS."""
+    return _SEARCH_TERM.findall(query.lower())[:SEARCH_MAX_TERMS]
+
+
+def to_prefix_tsquery(query: str) -> str:
+    """Turn free text into a tsquery where every word must match as a prefix.
+
+    Only word characters survive, so user input can never produce tsquery syntax
+    errors; "netfl" becomes "netfl:*", which also matches tokens like "netflix.com".
+
+    Args:
+        query (str): Text typed by the user.
+
+    Returns:
+        str: tsquery text for to_tsquery('simple', ...), empty when nothing searchable remains.
+    """
+    return " & ".join(f"{term}:*" for term in search_terms(query))
+
+
+class SearchService:
+    """Ranked search over transaction descriptions and counterparties.
+
+    Matching is full-text first, on the GIN index keyed by owner and the stored
+    search_vector. When that finds nothing and the pg_trgm extension is installed
+    (migration 0008 adds trigram indexes where it is), the query is retried by
+    trigram word similarity, so a typo such as "netflx" still finds "NETFLIX.COM".
+    Trigram matching is only a fallback because its indexes are not per user.
+    """
+
+    def __init__(self):
+        self.trigram_available: Optional[bool] = None
+
+    async def _has_trigram(self, db: AsyncSession) -> bool:
+        if self.trigram_available is None:
+            self.trigram_available = bool(
+                await db.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'"))
+            )
+        return self.trigram_available
+
+    def _match(self, query: str, fuzzy: bool):
+        """Return (predicate, rank) for a full-text or trigram match."""
+        terms = search_terms(query)
+        if not terms:
+            raise EmptySearchQueryError()
+        if fuzzy:
+            term = literal(" ".join(terms))
+            predicate = or_(term.op("<%")(Transactions.to_from), term.op("<%")(Transactions.description))
+            rank = func.greatest(
+                func.word_similarity(term, Transactions.to_from),
+                func.word_similarity(term, Transactions.description),
+            )
+            return predicate, rank
+        tsquery = func.to_tsquery(text("'simple'::regconfig"), to_prefix_tsquery(query))
+        return Transactions.search_vector.op("@@")(tsquery), func.ts_rank(Transactions.search_vector, tsquery)
+
+    def _owned_by(self, user_id: str, fuzzy: bool):
+        # the array form lets full-text search use the owner key of ix_transactions_search
+        return Transactions.user_id == user_id if fuzzy else SEARCH_OWNER.contains(array([user_id]))
+
+    def build_search_query(self, user_id: str, query: str, limit: int, offset: int = 0, fuzzy: bool = False):
+        """Build the ranked search statement.
+
+        Args:
+            user_id (str): Owner of the transactions.
+            query (str): Text typed by the user.
+            limit (int): Page size; one extra row is fetched to detect a next page.
+            offset (int): Rows to skip.
+            fuzzy (bool): Match by trigram word similarity instead of full text (needs pg_trgm).
+
+        Returns:
+            Select: Matching rows with a rank column, best first.
+
+        Raises:
+            EmptySearchQueryError: When the query has no searchable words.
+        """
+        predicate, rank = self._match(query, fuzzy)
+        return (
+            select(
+                Transactions.transaction_id,
+                Transactions.date,
+                Transactions.amount,
+                Transactions.transaction_type,
+                Category.category_name,
+                Transactions.to_from,
+                Transactions.description,
+                rank.label("rank"),
+            )
+            .join(Category, Transactions.category_id == Category.category_id)
+            .where(self._owned_by(user_id, fuzzy), predicate)
+            .order_by(rank.desc(), Transactions.date.desc(), Transactions.transaction_id.desc())
+            .offset(offset)
+            .limit(limit + 1)
+        )
+
+    async def _has_fulltext_match(self, db: AsyncSession, user_id: str, query: str) -> bool:
+        predicate, _ = self._match(query, fuzzy=False)
+        found = await db.scalar(
+            select(Transactions.transaction_id).where(self._owned_by(user_id, False), predicate).limit(1)
+        )
+        return found is not None
+
+    async def search_transactions(
+        self, db: AsyncSession, user_id: str, query: str, limit: int, offset: int = 0
+    ) -> tuple[List[dict], bool, str]:
+        """Return one page of a user's transactions matching free text, best match first.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): User identifier.
+            query (str): Words to find in descriptions and counterparties.
+            limit (int): Maximum records to return.
+            offset (int): Records to skip.
+
+        Returns:
+            tuple[list[dict], bool, str]: Matching transactions with their rank, whether
+            more follow, and the match mode ("fulltext" or "fuzzy").
+
+        Raises:
+            EmptySearchQueryError: When the query has no searchable words.
+        """
+        mode = "fulltext"
+        rows = (await db.execute(self.build_search_query(user_id, query, limit, offset))).all()
+        # an empty later page only means the full-text results ran out, unless there were none at all
+        if not rows and await self._has_trigram(db) and (
+            offset == 0 or not await self._has_fulltext_match(db, user_id, query)
+        ):
+            mode = "fuzzy"
+            rows = (await db.execute(self.build_search_query(user_id, query, limit, offset, fuzzy=True))).all()
+        items = [
+            {
+                "transaction_id": row.transaction_id,
+                "date": row.date,
+                "amount": row.amount,
+                "transaction_type": row.transaction_type,
+                "category": row.category_name,
+                "to_from": row.to_from,
+                "description": row.description,
+                "rank": round(float(row.rank), 4),
+            }
+            for row in rows[:limit]
+        ]
+        return items, len(rows) > limit, mode
+
+
+search_service = SearchService()
@@ -0,0 +1,44 @@
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# session.info key under which callbacks wait for the session's transaction to finish
+_PENDING_HOOKS = "pending_commit_hooks"
+
+
+def on_commit(db, callback: Callable[[], None], on_rollback: Optional[Callable[[], None]] = None) -> None:
+    """Run callback once db's outermost transaction commits, or on_rollback if it ends without committing.
+
+    Caches use this to publish a change only when other sessions can see it, so a
+    load racing the write is never cached as current.
+
+    Args:
+        db (AsyncSession | Session): Session the change is being written in.
+        callback (Callable[[], None]): Called after the commit.
+        on_rollback (Callable[[], None] | None): Called if the transaction rolls back or is abandoned.
+    """
+    db.info.setdefault(_PENDING_HOOKS, []).append((callback, on_rollback))
+
+
+def run_commit_hooks(session) -> None:
+    for callback, _ in session.info.pop(_PENDING_HOOKS, ()):
+        callback()
+
+
+def discard_commit_hooks(session) -> None:
+    for _, on_rollback in session.info.pop(_PENDING_HOOKS, ()):
+        if on_rollback is not None:
+            on_rollback()
+
+
+@event.listens_for(Session, "after_commit")
+def _run_committed_hooks(session: Session) -> None:
+    run_commit_hooks(session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_hooks(session: Session, transaction) -> None:
+    # after a commit the list is already gone; anything left was rolled back or abandoned
+    if transaction.parent is None:
+        discard_commit_hooks(session)
@@ -0,0 +1,188 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import ValidationError
+
+from backend.schemas.transaction_schema import TransactionCreate
+
+# parsers have no way to infer spending categories; users can recategorize later
+DEFAULT_PARSED_CATEGORY = "Miscellaneous"
+DEFAULT_INCOME_CATEGORY = "Income"
+
+_WHITESPACE = re.compile(r"\s+")
+_AMOUNT_NOISE = re.compile(r"[₦,\s]|NGN", re.IGNORECASE)
+
+
+def layout_fingerprint(header: Sequence[Optional[str]]) -> str:
+    """Normalize a table header row into the key parsers are registered under."""
+    return "|".join(_WHITESPACE.sub(" ", cell or "").strip().lower() for cell in header)
+
+
+def _parse_amount(value: Optional[str]) -> Optional[float]:
+    cleaned = _AMOUNT_NOISE.sub("", value or "")
+    if cleaned in ("", "-"):
+        return None
+    try:
+        return abs(float(cleaned))
+    except ValueError:
+        return None
+
+
+def _parse_date(value: Optional[str], formats: Sequence[str]) -> Optional[date]:
+    value = _WHITESPACE.sub(" ", value or "").strip()
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass(frozen=True)
+class TableStatementParser:
+    """Maps the columns of one bank's statement table onto TransactionCreate fields.
+
+    The header must match the statement's table header exactly (after
+    whitespace/case normalization). Rows whose date or amount do not parse,
+    such as opening/closing balance lines, are skipped.
+    """
+    name: str
+    header: Sequence[str]
+    date_column: str
+    description_column: str
+    debit_column: str
+    credit_column: str
+    counterparty_column: Optional[str] = None
+    date_formats: Sequence[str] = ("%d-%b-%Y", "%d/%m/%Y", "%Y-%m-%d")
+
+    @property
+    def fingerprint(self) -> str:
+        return layout_fingerprint(self.header)
+
+    def parse_rows(self, rows: List[List[Optional[str]]]) -> List[TransactionCreate]:
+        """Convert table body rows into validated transactions.
+
+        Args:
+            rows (list[list[str | None]]): Table rows without the header.
+
+        Returns:
+            list[TransactionCreate]: One transaction per recognizable row.
+        """
+        index = {layout_fingerprint([name]): i for i, name in enumerate(self.header)}
+        date_i = index[layout_fingerprint([self.date_column])]
+        description_i = index[layout_fingerprint([self.description_column])]
+        debit_i = index[layout_fingerprint([self.debit_column])]
+        credit_i = index[layout_fingerprint([self.credit_column])]
+        counterparty_i = index[layout_fingerprint([self.counterparty_column])] if self.counterparty_column else None
+
+        transactions = []
+        for row in rows:
+            if len(row) != len(self.header):
+                continue
+            tx_date = _parse_date(row[date_i], self.date_formats)
+            debit = _parse_amount(row[debit_i])
+            credit = _parse_amount(row[credit_i])
+            if tx_date is None or not (debit or credit):
+                continue
+            description = _WHITESPACE.sub(" ", row[description_i] or "").strip()
+            counterparty = _WHITESPACE.sub(" ", row[counterparty_i] or "").strip() if counterparty_i is not None else ""
+            is_income = bool(credit)
+            try:
+                transactions.append(TransactionCreate(
+                    date=tx_date,
+                    amount=credit if is_income else debit,
+                    category=DEFAULT_INCOME_CATEGORY if is_income else DEFAULT_PARSED_CATEGORY,
+                    transaction_type="INCOME" if is_income else "EXPENSE",
+                    to_from=counterparty or description,
+                    description=description,
+                ))
+            except ValidationError:
+                continue
+        return transactions
+
+
+@dataclass
+class ParsedStatement:
+    """Transactions produced by a deterministic parser."""
+    parser: str
+    transactions: List[TransactionCreate] = field(default_factory=list)
+
+
+STATEMENT_PARSERS: Dict[str, TableStatementParser] = {}
+
+
+def register_parser(parser: TableStatementParser) -> TableStatementParser:
+    """Add a statement layout to the registry, keyed by its header fingerprint."""
+    STATEMENT_PARSERS[parser.fingerprint] = parser
+    return parser
+
+
+register_parser(TableStatementParser(
+    name="gtbank",
+    header=("Trans. Date", "Value Date", "Reference", "Debits", "Credits", "Balance", "Originating Branch", "Remarks"),
+    date_column="Trans. Date",
+    description_column="Remarks",
+    debit_column="Debits",
+    credit_column="Credits",
+    date_formats=("%d-%b-%Y", "%d-%b-%y"),
+))
+register_parser(TableStatementParser(
+    name="kuda",
+    header=("Date/Time", "Money In", "Money Out", "Category", "To / From", "Description", "Balance"),
+    date_column="Date/Time",
+    description_column="Description",
+    debit_column="Money Out",
+    credit_column="Money In",
+    counterparty_column="To / From",
+    date_formats=("%d/%m/%y %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%d/%m/%y", "%d/%m/%Y"),
+))
+register_parser(TableStatementParser(
+    name="opay",
+    header=("Trans. Time", "Value Date", "Description", "Debit(₦)", "Credit(₦)", "Balance After(₦)", "Channel", "Transaction Reference"),
+    date_column="Value Date",
+    description_column="Description",
+    debit_column="Debit(₦)",
+    credit_column="Credit(₦)",
+    date_formats=("%d %b %Y", "%d-%b-%Y"),
+))
+
+
+def parse_statement_tables(path: str) -> Optional[ParsedStatement]:
+    """Parse a PDF statement with a registered layout parser, if one matches.
+
+    Only the first page's tables are inspected to pick a parser, so unrecognized
+    statements cost one page of table extraction before falling back to the LLM.
+    Continuation pages may repeat the header row or omit it.
+
+    Args:
+        path (str): Location of the PDF on disk.
+
+    Returns:
+        ParsedStatement | None: Parser name and transactions, or None when no layout matches
+            or the matched layout yields no rows.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        parser = None
+        transactions: List[TransactionCreate] = []
+        for page_number, page in enumerate(pdf.pages):
+            tables = page.extract_tables()
+            page.close()
+            for table in tables:
+                if not table:
+                    continue
+                if parser is None:
+                    parser = STATEMENT_PARSERS.get(layout_fingerprint(table[0]))
+                    if parser is None:
+                        continue
+                rows = table[1:] if layout_fingerprint(table[0]) == parser.fingerprint else table
+                transactions.extend(parser.parse_rows(rows))
+            if parser is None and page_number == 0:
+                return None
+        if parser is None or not transactions:
+            # a recognized header with no usable rows is left to the LLM
+            return None
+        return ParsedStatement(parser=parser.name, transactions=transactions)
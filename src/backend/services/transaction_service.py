@@ -1,29 +1,503 @@
-import io
+import asyncio
+import base64
+import hashlib
+import logging
 import os
 import re
 import json
-import pdfplumber
+import weakref
 import csv
-from typing import List, Optional
-from datetime import datetime, timezone
+from typing import Callable, Iterator, List, Optional
+from datetime import date, datetime, timezone
 from uuid import uuid4
-from sqlalchemy import select
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from backend.schemas.transaction_schema import TransactionList, TransactionCreate
+from backend.schemas.transaction_schema import CounterpartyCategoryList, TransactionList, TransactionCreate
 from backend.database.models.transaction_model import Transactions
-from backend.services.category_service import CategoryService
-from fastapi import UploadFile
-from google import genai
+from backend.database.models.categories_model import Category
+from backend.database.models.monthly_rollup_model import MonthlyRollup
+from backend.services.rollup_service import rollup_service, transaction_type_name
+from backend.services.category_service import category_service, normalize_category_name
+from backend.services.merchant_index_service import (
+    UNINFORMATIVE_CATEGORY,
+    USER,
+    merchant_index_service,
+    normalize_merchant,
+)
+from backend.services.analytics_service import analytics_service
+from backend.services.data_version_service import data_version_service
+from backend.services.statement_parsers import DEFAULT_PARSED_CATEGORY, ParsedStatement, parse_statement_tables
+from backend.services.pdf_text import iter_pdf_pages
 from dotenv import load_dotenv
+from collections import Counter
 from collections.abc import Iterable
+from dataclasses import dataclass
 from backend.database.models.categories_model import DEFAULT_CATEGORIES
 from typing import Union
-from sqlalchemy import func,case,extract
+from sqlalchemy import func,case,tuple_,any_,literal,Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 API_KEY = os.getenv("GOOGLE_API_KEY2")
-client = genai.Client(api_key=API_KEY)
+# created on first extraction; the SDK's import alone is a large share of cold start
+client = None
+
+
+def get_genai_client():
+    """Return the shared Gemini client, importing the SDK and creating it on first use."""
+    global client
+    if client is None:
+        from google import genai
+
+        client = genai.Client(api_key=API_KEY)
+    return client
+
+# batches at least this large are written with COPY instead of a multi-row INSERT
+BULK_COPY_THRESHOLD = int(os.getenv("BULK_COPY_THRESHOLD", "1000"))
+# times a manual entry moves to the next occurrence when a concurrent identical entry took its fingerprint
+MANUAL_FINGERPRINT_ATTEMPTS = int(os.getenv("MANUAL_FINGERPRINT_ATTEMPTS", "3"))
+FINGERPRINT_INDEX = "uq_transactions_user_fingerprint"
+
+
+# statement text keeps page boundaries so extraction can chunk on them
+PAGE_BREAK = "\f"
+STATEMENT_CHUNK_PAGES = int(os.getenv("STATEMENT_CHUNK_PAGES", "3"))
+STATEMENT_CHUNK_OVERLAP_LINES = int(os.getenv("STATEMENT_CHUNK_OVERLAP_LINES", "4"))
+STATEMENT_CHUNK_CONCURRENCY = int(os.getenv("STATEMENT_CHUNK_CONCURRENCY", "4"))
+STATEMENT_CHUNK_RETRIES = int(os.getenv("STATEMENT_CHUNK_RETRIES", "1"))
+# per-call limit for a single Gemini request; timeouts count as a failed attempt
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "120"))
+# Gemini calls in flight across every statement being ingested at once (e.g. a batch upload)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+_gemini_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def gemini_slots() -> asyncio.Semaphore:
+    """Return the process-wide Gemini concurrency limit for the running event loop."""
+    loop = asyncio.get_running_loop()
+    slots = _gemini_slots.get(loop)
+    if slots is None:
+        slots = _gemini_slots[loop] = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    return slots
+# plain-text statements have no page breaks; treat this many lines as a page
+TEXT_LINES_PER_PAGE = 60
+# parsed rows the merchant index cannot place are categorized by the model, one line per merchant
+COUNTERPARTY_LLM_CATEGORIZATION = os.getenv("COUNTERPARTY_LLM_CATEGORIZATION", "1") == "1"
+COUNTERPARTY_BATCH_SIZE = int(os.getenv("COUNTERPARTY_BATCH_SIZE", "200"))
+
+
+@dataclass(frozen=True)
+class StatementChunk:
+    """A run of statement pages sent to the model in one call."""
+    index: int
+    text: str
+    context: str = ""
+
+
+def split_statement_pages(
+    pages: Iterable[str],
+    pages_per_chunk: Optional[int] = None,
+    overlap_lines: Optional[int] = None,
+) -> List[StatementChunk]:
+    """Group statement pages into chunks carrying overlap context.
+
+    Pages are consumed one at a time, so a lazy page generator is never
+    materialized beyond the chunk being built.
+
+    Args:
+        pages (Iterable[str]): Page texts in order.
+        pages_per_chunk (int | None): Pages per chunk (STATEMENT_CHUNK_PAGES by default).
+        overlap_lines (int | None): Trailing lines of the previous chunk passed as
+            read-only context (STATEMENT_CHUNK_OVERLAP_LINES by default).
+
+    Returns:
+        list[StatementChunk]: Chunks in page order.
+    """
+    pages_per_chunk = pages_per_chunk or STATEMENT_CHUNK_PAGES
+    overlap_lines = STATEMENT_CHUNK_OVERLAP_LINES if overlap_lines is None else overlap_lines
+
+    chunks = []
+    previous_text = ""
+    pending: List[str] = []
+
+    def flush() -> None:
+        nonlocal previous_text
+        text = "\n".join(pending)
+        pending.clear()
+        if not text.strip():
+            return
+        context = "\n".join(previous_text.splitlines()[-overlap_lines:]) if overlap_lines else ""
+        chunks.append(StatementChunk(index=len(chunks), text=text, context=context))
+        previous_text = text
+
+    for page in pages:
+        pending.append(page)
+        if len(pending) == pages_per_chunk:
+            flush()
+    flush()
+    return chunks
+
+
+def _text_pages(lines: Iterable[str]) -> Iterator[str]:
+    """Group plain-text statement lines into pages of TEXT_LINES_PER_PAGE lines."""
+    page: List[str] = []
+    for line in lines:
+        page.append(line.rstrip("\r\n"))
+        if len(page) == TEXT_LINES_PER_PAGE:
+            yield "\n".join(page)
+            page = []
+    if page:
+        yield "\n".join(page)
+
+
+def split_statement_text(
+    raw_text: str,
+    pages_per_chunk: Optional[int] = None,
+    overlap_lines: Optional[int] = None,
+) -> List[StatementChunk]:
+    """Split statement text into page-aligned chunks carrying overlap context.
+
+    Args:
+        raw_text (str): Statement text with pages separated by PAGE_BREAK.
+        pages_per_chunk (int | None): Pages per chunk (STATEMENT_CHUNK_PAGES by default).
+        overlap_lines (int | None): Trailing lines of the previous chunk passed as
+            read-only context (STATEMENT_CHUNK_OVERLAP_LINES by default).
+
+    Returns:
+        list[StatementChunk]: Chunks in page order.
+    """
+    if PAGE_BREAK in raw_text:
+        pages = raw_text.split(PAGE_BREAK)
+    else:
+        pages = list(_text_pages(raw_text.splitlines())) or [raw_text]
+    return split_statement_pages(pages, pages_per_chunk, overlap_lines)
+
+
+def build_extraction_prompt(chunk: StatementChunk) -> str:
+    """Build the extraction prompt for one chunk of statement text."""
+    context_block = ""
+    if chunk.context:
+        context_block = f"""
+                Context from the end of the previous page (for reference only, e.g. column
+                headers or a running date; do NOT extract transactions from it):
+                -------------------------
+                {chunk.context}
+                -------------------------
+                """
+    return f"""
+                Extract ALL financial transactions from the following bank statement text.
+
+                STRICT RULES:
+                - Return ONLY valid JSON (no markdown, no commentary).
+                - Dates MUST be in ISO 8601 format: YYYY-MM-DD (4-digit year required).
+                - Do NOT use 2-digit years.
+                - If the statement shows a 2-digit year, infer the correct 4-digit year.
+                - Normalize amounts: remove ₦ and commas.
+                - amount MUST be a NUMBER (no currency symbols, no commas).
+                - transaction_type MUST be either "INCOME" or "EXPENSE".
+                - Use "INCOME" AS input for transaction_type when money is entering the account.
+                - Use "EXPENSE" AS input for transaction_type when money is leaving the account.
+                - category must be one of the following: {', '.join(DEFAULT_CATEGORIES)}
+                - Do NOT include summary lines or balances outside transactions.
+                {context_block}
+                Text to parse:
+                -------------------------
+                {chunk.text}
+                -------------------------
+                """
+
+
+def build_categorization_prompt(counterparties: List[str]) -> str:
+    """Build the prompt asking the model to categorize a numbered list of counterparties."""
+    listing = "\n".join(f"{i}. {line}" for i, line in enumerate(counterparties))
+    return f"""
+                Categorize each numbered bank statement counterparty below.
+
+                STRICT RULES:
+                - Return ONLY valid JSON (no markdown, no commentary).
+                - Return one object per line with its "index" and "category".
+                - category must be one of the following: {', '.join(DEFAULT_CATEGORIES)}
+
+                Counterparties:
+                -------------------------
+                {listing}
+                -------------------------
+                """
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize_text(value: str) -> str:
+    return _WHITESPACE.sub(" ", value).strip().lower()
+
+
+def transaction_fingerprint(
+    user_id: str,
+    tx_date: date,
+    amount: float,
+    transaction_type,
+    to_from: str,
+    description: str,
+    occurrence: int = 0,
+) -> str:
+    """Hash a transaction's content into the key that makes ingestion idempotent.
+
+    Amounts are compared in whole cents and text with whitespace collapsed and
+    case folded. occurrence numbers identical transactions (e.g. two equal coffees
+    on one day), so legitimate repeats get distinct fingerprints while the same
+    statement uploaded twice produces the same ones. Migration 0010 computes the
+    same hash in SQL; keep the two in step.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    material = "|".join((
+        user_id,
+        tx_date.isoformat(),
+        str(round(amount * 100)),
+        transaction_type_name(transaction_type),
+        _normalize_text(to_from),
+        _normalize_text(description),
+        str(occurrence),
+    ))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def assign_fingerprints(user_id: str, transactions: Iterable) -> List[str]:
+    """Fingerprint a statement's transactions, numbering identical ones in order of appearance.
+
+    Args:
+        user_id (str): Owner of the transactions.
+        transactions (Iterable): Objects with date, amount, transaction_type, to_from and description.
+
+    Returns:
+        list[str]: One fingerprint per transaction, in order.
+    """
+    seen = Counter()
+    fingerprints = []
+    for tx in transactions:
+        base = transaction_fingerprint(user_id, tx.date, tx.amount, tx.transaction_type, tx.to_from, tx.description)
+        fingerprints.append(
+            transaction_fingerprint(
+                user_id, tx.date, tx.amount, tx.transaction_type, tx.to_from, tx.description, seen[base]
+            )
+        )
+        seen[base] += 1
+    return fingerprints
+
+
+def _transaction_key(tx: TransactionCreate) -> tuple:
+    return (tx.date, round(tx.amount, 2), tx.transaction_type, tx.to_from.strip().lower(), tx.description.strip().lower())
+
+
+def merge_chunk_results(
+    chunks: List[StatementChunk],
+    chunk_results: List[List[TransactionCreate]],
+) -> List[TransactionCreate]:
+    """Concatenate per-chunk transactions in page order, dropping boundary duplicates.
+
+    A transaction is treated as a boundary duplicate when the previous chunk already
+    produced an identical one and its description or counterparty appears in the
+    overlap context, i.e. the model re-extracted a line it was only shown as context.
+    Identical transactions elsewhere (legitimate same-day repeats) are kept.
+
+    Args:
+        chunks (list[StatementChunk]): Chunks in page order.
+        chunk_results (list[list[TransactionCreate]]): Extraction output per chunk.
+
+    Returns:
+        list[TransactionCreate]: Merged transactions.
+    """
+    merged: List[TransactionCreate] = []
+    previous = Counter()
+    for chunk, transactions in zip(chunks, chunk_results):
+        context = chunk.context.lower()
+        current = Counter()
+        for tx in transactions:
+            key = _transaction_key(tx)
+            in_context = context and (tx.description.strip().lower() in context or tx.to_from.strip().lower() in context)
+            if previous[key] > 0 and in_context:
+                previous[key] -= 1
+                continue
+            current[key] += 1
+            merged.append(tx)
+        previous = current
+    return merged
+
+
+SUPPORTED_STATEMENT_EXTENSIONS = (".txt", ".pdf")
+
+
+def _observe(pages: Iterable[str], callback: Callable[[str], None]) -> Iterator[str]:
+    for page in pages:
+        callback(page)
+        yield page
+
+
+def iter_statement_pages(path: str, filename: str) -> Iterator[str]:
+    """Yield the page texts of a spooled txt or pdf statement without loading it whole.
+
+    Plain-text statements are read line by line and grouped into pages of
+    TEXT_LINES_PER_PAGE lines. Unsupported formats yield nothing.
+    """
+    filename = filename.lower()
+    if filename.endswith(".txt"):
+        with open(path, "r", encoding="utf-8") as statement_file:
+            yield from _text_pages(statement_file)
+    elif filename.endswith(".pdf"):
+        yield from iter_pdf_pages(path)
+
+
+def _month_bounds(month: int, year: int) -> tuple[date, date]:
+    """Return the first day of a month and the first day of the following month."""
+    if month == 12:
+        return date(year, 12, 1), date(year + 1, 1, 1)
+    return date(year, month, 1), date(year, month + 1, 1)
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+class TransactionNotFoundError(Exception):
+    pass
+
+
+class DuplicateTransactionError(Exception):
+    pass
+
+
+def encode_cursor(tx_date: date, transaction_id: str) -> str:
+    """Encode a (date, transaction_id) position as an opaque URL-safe cursor."""
+    raw = json.dumps([tx_date.isoformat(), transaction_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, str]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        InvalidCursorError: When the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        tx_date, transaction_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return date.fromisoformat(tx_date), str(transaction_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursorError()
+
+
+class UnknownQueryFieldError(Exception):
+    pass
+
+
+# columns /transactions/query can project; only "category" needs the categories join
+QUERY_FIELDS = {
+    "transaction_id": Transactions.transaction_id,
+    "date": Transactions.date,
+    "amount": Transactions.amount,
+    "transaction_type": Transactions.transaction_type,
+    "category_id": Transactions.category_id,
+    "category": Category.category_name,
+    "to_from": Transactions.to_from,
+    "description": Transactions.description,
+}
+DEFAULT_QUERY_FIELDS = ("transaction_id", "date", "amount", "transaction_type", "category", "to_from", "description")
+
+
+@dataclass(frozen=True)
+class TransactionFilter:
+    """Filters accepted by query_transactions; unset fields do not constrain the result."""
+    start_date: Optional[date] = None  # inclusive
+    end_date: Optional[date] = None  # exclusive
+    transaction_types: tuple = ()
+    category_ids: tuple = ()
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    counterparty: Optional[str] = None  # case-insensitive substring of to_from
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_transaction_query(
+    user_id: str,
+    filters: TransactionFilter,
+    fields: Iterable[str],
+    limit: int,
+    cursor: Optional[str] = None,
+):
+    """Compile filters into one parameterized SELECT, newest first.
+
+    Every filter value is a bound parameter, and category ids are passed as a
+    single array so the statement text does not change with the number of ids.
+    The predicates are all on the user's (user_id, date, transaction_id) index
+    range or its INCLUDE columns, so a projection of only date, amount, type and
+    category_id can be answered by an index-only scan. The counterparty filter is
+    the exception: its leading-wildcard ILIKE cannot use a btree, and is served by
+    ix_transactions_to_from_trgm where migration 0008 could install pg_trgm (for
+    text of three or more characters). Without pg_trgm it is checked row by row
+    within the user's date range.
+
+    Args:
+        user_id (str): Owner of the transactions.
+        filters (TransactionFilter): Filters to apply.
+        fields (Iterable[str]): Columns to return, from QUERY_FIELDS.
+        limit (int): Page size; one extra row is fetched to detect a next page.
+        cursor (str | None): next_cursor of the previous page.
+
+    Returns:
+        Select: The statement; date and transaction_id are always selected for the cursor.
+
+    Raises:
+        UnknownQueryFieldError: When a field is not in QUERY_FIELDS.
+        InvalidCursorError: When the cursor cannot be decoded.
+    """
+    fields = list(dict.fromkeys(fields))
+    unknown = [field for field in fields if field not in QUERY_FIELDS]
+    if unknown:
+        raise UnknownQueryFieldError(", ".join(unknown))
+
+    columns = {"date": Transactions.date, "transaction_id": Transactions.transaction_id}
+    columns.update((field, QUERY_FIELDS[field]) for field in fields)
+    query = select(*(column.label(name) for name, column in columns.items())).where(Transactions.user_id == user_id)
+    if "category" in fields:
+        query = query.join(Category, Transactions.category_id == Category.category_id)
+
+    if filters.start_date is not None:
+        query = query.where(Transactions.date >= filters.start_date)
+    if filters.end_date is not None:
+        query = query.where(Transactions.date < filters.end_date)
+    types = {transaction_type_name(value) for value in filters.transaction_types}
+    if len(types) == 1:
+        # both types together is no filter at all
+        query = query.where(Transactions.transaction_type == types.pop())
+    if filters.category_ids:
+        query = query.where(
+            Transactions.category_id == any_(literal(sorted(set(filters.category_ids)), ARRAY(Integer)))
+        )
+    if filters.min_amount is not None:
+        query = query.where(Transactions.amount >= float(filters.min_amount))
+    if filters.max_amount is not None:
+        query = query.where(Transactions.amount <= float(filters.max_amount))
+    if filters.counterparty:
+        query = query.where(Transactions.to_from.ilike(f"%{_escape_like(filters.counterparty)}%", escape="\\"))
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Transactions.date, Transactions.transaction_id) < (cursor_date, cursor_id))
+
+    return query.order_by(Transactions.date.desc(), Transactions.transaction_id.desc()).limit(limit + 1)
+
+
+def _is_month_aligned(bound: Optional[date]) -> bool:
+    """Return True when a window bound is open or falls on the first of a month."""
+    return bound is None or bound.day == 1
 
 class TransactionService:
     """Service layer for transaction ingestion, enrichment, and summaries."""
@@ -43,13 +517,11 @@ class TransactionService:
         Returns:
             Transactions: ORM instance ready for persistence.
         """
-        category_in = transaction_in.category.strip().title()
-        cat_id = await CategoryService().get_category_by_name(db, category_in, user_id)
-        if not cat_id:
-            category = await CategoryService().create_user_category(db, user_id, category_in)
-            cat_id = await CategoryService().get_category_by_name(db, category, user_id)
+        category_ids = await category_service.resolve_category_ids(db, user_id, [transaction_in.category])
+        cat_id = category_ids[normalize_category_name(transaction_in.category)]
         return Transactions(
             transaction_id=str(uuid4()),
+            fingerprint=await self._unused_fingerprint(db, user_id, transaction_in),
             user_id=user_id,
             date=transaction_in.date,
             amount = transaction_in.amount,
@@ -59,79 +531,237 @@ class TransactionService:
             description=transaction_in.description,
         )
 
-    async def upload_transactions(self, db: AsyncSession, file: UploadFile):
-        """Read uploaded statement content from txt or pdf.
+    async def _unused_fingerprint(self, db: AsyncSession, user_id: str, tx) -> str:
+        """Fingerprint a manual entry with the first occurrence number not yet stored.
+
+        A manual entry is always a new transaction, even when identical to one already stored.
 
         Args:
-            db (AsyncSession): Async database session (unused but kept for signature consistency).
-            file (UploadFile): Uploaded file object.
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the transaction.
+            tx: TransactionCreate or Transactions with the fingerprinted fields.
 
         Returns:
-            str | None: Extracted text content or None if unsupported format.
+            str: The fingerprint.
         """
-        filename = file.filename.lower()
-        file_bytes = await file.read()
-
-        # Case 1: .txt file
-        if filename.endswith(".txt"):
-            return file_bytes.decode("utf-8")
-
-        # Case 2: .pdf file
-        if filename.endswith(".pdf"):
-            file_stream = io.BytesIO(file_bytes)
-            with pdfplumber.open(file_stream) as pdf:
-                pages_text = [
-                    page.extract_text() or "" 
-                    for page in pdf.pages
-                ]
-                return "\n".join(pages_text)
-    
-    async def extraction_transactions_from_text(self,raw_text: str) -> List[dict]:
+        stored = set((await db.execute(
+            select(Transactions.fingerprint).where(Transactions.user_id == user_id, Transactions.date == tx.date)
+        )).scalars())
+        occurrence = 0
+        while True:
+            fingerprint = transaction_fingerprint(
+                user_id, tx.date, tx.amount, tx.transaction_type, tx.to_from, tx.description, occurrence,
+            )
+            if fingerprint not in stored:
+                return fingerprint
+            occurrence += 1
+
+    async def _add_manual(self, db: AsyncSession, user_id: str, tx: Transactions) -> None:
+        """Insert a manual entry in a savepoint, taking the next occurrence if a concurrent identical entry won.
+
+        Raises:
+            DuplicateTransactionError: When every attempt collided.
+        """
+        for _ in range(MANUAL_FINGERPRINT_ATTEMPTS):
+            try:
+                async with db.begin_nested():
+                    db.add(tx)
+                return
+            except IntegrityError as exc:
+                if FINGERPRINT_INDEX not in str(exc.orig):
+                    raise
+                # the other entry has committed (the insert waited on it), so it is visible now
+                tx.fingerprint = await self._unused_fingerprint(db, user_id, tx)
+        raise DuplicateTransactionError()
+
+    async def read_statement_chunks(
+        self,
+        path: str,
+        filename: str,
+        on_page: Optional[Callable[[str], None]] = None,
+    ) -> List[StatementChunk]:
+        """Read a spooled statement page by page into extraction chunks.
+
+        Pages are produced lazily and grouped into chunks as they arrive, off the
+        event loop since PDF text extraction is CPU-bound.
+
+        Args:
+            path (str): Location of the uploaded bytes on disk.
+            filename (str): Original filename, used to detect the format.
+            on_page (Callable[[str], None] | None): Called with each page's text in
+                order (e.g. to hash the statement while it streams past).
+
+        Returns:
+            list[StatementChunk]: Chunks ready for extract_statement_chunks; empty for
+                unsupported formats.
+        """
+        def chunk_pages() -> List[StatementChunk]:
+            pages = iter_statement_pages(path, filename)
+            if on_page is not None:
+                pages = _observe(pages, on_page)
+            return split_statement_pages(pages)
+
+        return await asyncio.to_thread(chunk_pages)
+
+    async def parse_statement_tables(self, path: str, filename: str) -> Optional[ParsedStatement]:
+        """Parse a statement deterministically when its table layout is registered.
+
+        Args:
+            path (str): Location of the uploaded bytes on disk.
+            filename (str): Original filename, used to detect the format.
+
+        Returns:
+            ParsedStatement | None: Parsed transactions, or None when the statement is not
+                a PDF or no registered parser recognizes it (fall back to the LLM).
+        """
+        if not filename.lower().endswith(".pdf"):
+            return None
+        return await asyncio.to_thread(parse_statement_tables, path)
+
+    async def extraction_transactions_from_text(self,raw_text: str) -> List[TransactionCreate]:
         """Call Gemini to extract structured transactions from raw statement text.
 
+        The text is split into page-aligned chunks that are extracted concurrently
+        (at most STATEMENT_CHUNK_CONCURRENCY at a time), then merged in page order
+        with duplicates at chunk boundaries removed.
+
         Args:
-            raw_text (str): Full statement text.
+            raw_text (str): Full statement text, pages separated by PAGE_BREAK.
 
         Returns:
             list[TransactionCreate]: Parsed transactions validated against schema.
         """
-        prompt = f"""
-                Extract ALL financial transactions from the following bank statement text.
+        return await self.extract_statement_chunks(split_statement_text(raw_text))
 
-                STRICT RULES:
-                - Return ONLY valid JSON (no markdown, no commentary).
-                - Dates MUST be in ISO 8601 format: YYYY-MM-DD (4-digit year required).
-                - Do NOT use 2-digit years.
-                - If the statement shows a 2-digit year, infer the correct 4-digit year.
-                - Normalize amounts: remove ₦ and commas.
-                - amount MUST be a NUMBER (no currency symbols, no commas).
-                - transaction_type MUST be either "INCOME" or "EXPENSE".
-                - Use "INCOME" AS input for transaction_type when money is entering the account.
-                - Use "EXPENSE" AS input for transaction_type when money is leaving the account.
-                - category must be one of the following: {', '.join(DEFAULT_CATEGORIES)}
-                - Do NOT include summary lines or balances outside transactions.
-                Text to parse:
-                -------------------------
-                {raw_text}
-                -------------------------
-                """
-        response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-        config={
-        "response_mime_type": "application/json",
-        "response_json_schema": TransactionList.model_json_schema()},
-        )  
+    async def extract_statement_chunks(self, chunks: List[StatementChunk]) -> List[TransactionCreate]:
+        """Extract transactions from statement chunks concurrently and merge them in page order.
+
+        Args:
+            chunks (list[StatementChunk]): Chunks from split_statement_text or read_statement_chunks.
+
+        Returns:
+            list[TransactionCreate]: Parsed transactions validated against schema.
+        """
+        semaphore = asyncio.Semaphore(STATEMENT_CHUNK_CONCURRENCY)
+
+        async def extract(chunk: StatementChunk) -> List[TransactionCreate]:
+            async with semaphore:
+                return await self._extract_chunk(chunk)
+
+        tasks = [asyncio.create_task(extract(chunk)) for chunk in chunks]
+        try:
+            chunk_results = await asyncio.gather(*tasks)
+        except BaseException:
+            # one failed chunk fails the statement: stop the rest so they give back their Gemini slots
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return merge_chunk_results(chunks, chunk_results)
+
+    async def _extract_chunk(self, chunk: StatementChunk) -> List[TransactionCreate]:
+        """Extract one chunk, retrying it alone on failure so one bad call does not sink the statement.
+
+        Args:
+            chunk (StatementChunk): Pages to extract plus overlap context.
+
+        Returns:
+            list[TransactionCreate]: Transactions found in the chunk's pages.
+        """
+        prompt = build_extraction_prompt(chunk)
+        for attempt in range(STATEMENT_CHUNK_RETRIES + 1):
+            try:
+                return await self._generate_json(prompt, TransactionList)
+            except Exception:
+                if attempt == STATEMENT_CHUNK_RETRIES:
+                    raise
+
+    async def _generate_json(self, prompt: str, schema):
+        """Send one prompt to Gemini and validate its JSON answer against a RootModel.
+
+        Args:
+            prompt (str): Prompt text.
+            schema: RootModel class the response must match.
+
+        Returns:
+            The validated root value.
+        """
+        # async SDK call: the event loop keeps serving other requests while Gemini works,
+        # and cancelling this coroutine (a worker shutting down) aborts the HTTP call. The timeout
+        # starts once a slot is free, so queueing behind other statements does not count.
+        async with gemini_slots():
+            response = await asyncio.wait_for(
+                get_genai_client().aio.models.generate_content(
+                    model="gemini-2.5-flash",
+                    contents=prompt,
+                    config={
+                    "response_mime_type": "application/json",
+                    "response_json_schema": schema.model_json_schema()},
+                ),
+                timeout=GEMINI_TIMEOUT_SECONDS,
+            )
         raw_json = response.text
         raw_json = re.sub(r"^```(?:json)?|```$", "", raw_json, flags=re.MULTILINE)
         payload = json.loads(raw_json)
+        return schema.model_validate(payload).root
+
+    async def categorize_unresolved(
+        self,
+        transactions_in: List[TransactionCreate],
+        unresolved: List[int],
+    ) -> List[TransactionCreate]:
+        """Ask the model to categorize parsed expenses the merchant index could not place.
 
-        transactions = TransactionList.model_validate(payload).root
+        Only rows still in the parsers' catch-all category are considered, and each
+        distinct merchant is sent once, so the prompt grows with the number of new
+        merchants rather than with the statement. A failed call leaves the rows as they were.
+
+        Args:
+            transactions_in (list[TransactionCreate]): Transactions after the merchant index.
+            unresolved (list[int]): Positions the index did not resolve.
 
-        return transactions
+        Returns:
+            list[TransactionCreate]: The transactions with model categories filled in.
+        """
+        if not COUNTERPARTY_LLM_CATEGORIZATION:
+            return transactions_in
+        by_merchant: dict[str, List[int]] = {}
+        for position in unresolved:
+            tx = transactions_in[position]
+            key = normalize_merchant(tx.to_from)
+            if key and tx.transaction_type == "EXPENSE" and tx.category == DEFAULT_PARSED_CATEGORY:
+                by_merchant.setdefault(key, []).append(position)
+        if not by_merchant:
+            return transactions_in
+
+        allowed = {normalize_category_name(name): name for name in DEFAULT_CATEGORIES}
+        merchants = list(by_merchant.items())
+        categorized = list(transactions_in)
+        for start in range(0, len(merchants), COUNTERPARTY_BATCH_SIZE):
+            batch = merchants[start:start + COUNTERPARTY_BATCH_SIZE]
+            lines = []
+            for _, positions in batch:
+                tx = transactions_in[positions[0]]
+                lines.append(tx.to_from if tx.to_from == tx.description else f"{tx.to_from} | {tx.description}")
+            try:
+                answers = await self._generate_json(build_categorization_prompt(lines), CounterpartyCategoryList)
+            except Exception:
+                logger.warning("Counterparty categorization failed; leaving %d merchants uncategorized", len(batch), exc_info=True)
+                continue
+            for answer in answers:
+                category = allowed.get(normalize_category_name(answer.category))
+                if category is None or not 0 <= answer.index < len(batch):
+                    continue
+                for position in batch[answer.index][1]:
+                    categorized[position] = categorized[position].model_copy(update={"category": category})
+        return categorized
     
     async def write_transactions_to_db(self,db:AsyncSession, transactions_list: List[Transactions], user_id: str) -> bool:
-        """Persist a collection of transactions for a user.
+        """Persist a collection of transactions for a user and update their monthly rollups.
+
+        Rollups are upserted, and the user's data version bumped, in the same database
+        transaction as the inserts. An entry whose fingerprint a concurrent identical
+        entry took is retried with the next occurrence number.
 
         Args:
             db (AsyncSession): Async database session.
@@ -140,12 +770,191 @@ class TransactionService:
 
         Returns:
             bool: True when commit succeeds.
+
+        Raises:
+            DuplicateTransactionError: When an entry kept colliding with concurrent identical ones.
         """
-        for transaction_in in transactions_list:
-            db.add(transaction_in)
-        await db.commit()
+        try:
+            for transaction_in in transactions_list:
+                await self._add_manual(db, user_id, transaction_in)
+            await rollup_service.apply_transactions(db, transactions_list)
+            # a manually entered category is the user's own choice for that counterparty
+            await merchant_index_service.learn(
+                db,
+                user_id,
+                [(tx.to_from, tx.transaction_type, tx.category_id) for tx in transactions_list],
+                source=USER,
+            )
+            analytics_service.record_write(db, user_id, [
+                {
+                    "date": tx.date,
+                    "amount": tx.amount,
+                    "transaction_type": tx.transaction_type,
+                    "category_id": tx.category_id,
+                }
+                for tx in transactions_list
+            ])
+            await data_version_service.bump(db, user_id)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
         return True
 
+    async def write_transactions_bulk(
+        self,
+        db: AsyncSession,
+        transactions_in: List[TransactionCreate],
+        user_id: str,
+        commit: bool = True,
+    ) -> int:
+        """Persist extracted transactions in one database transaction with batched statements.
+
+        Categories are resolved (and missing ones created) with one lookup and one upsert,
+        rows are written with a single multi-row INSERT (or COPY above BULK_COPY_THRESHOLD
+        rows), and the monthly rollups, the merchant index and the user's data version are
+        updated before the single commit. Rows whose fingerprint the user already has
+        (e.g. from an overlapping statement) are skipped with ON CONFLICT DO NOTHING and
+        leave the rollups untouched.
+
+        Args:
+            db (AsyncSession): Async database session.
+            transactions_in (list[TransactionCreate]): Validated transactions to save.
+            user_id (str): Owner of the transactions.
+            commit (bool): Commit when done; pass False to add more work (e.g. job
+                bookkeeping) to the same database transaction.
+
+        Returns:
+            int: Number of transactions written; the rest were already stored.
+        """
+        if not transactions_in:
+            return 0
+        try:
+            category_ids = await category_service.resolve_category_ids(
+                db, user_id, (tx.category for tx in transactions_in)
+            )
+            fingerprints = assign_fingerprints(user_id, transactions_in)
+            rows = [
+                {
+                    "transaction_id": str(uuid4()),
+                    "fingerprint": fingerprint,
+                    "user_id": user_id,
+                    "date": tx.date,
+                    "amount": tx.amount,
+                    "transaction_type": transaction_type_name(tx.transaction_type),
+                    "category_id": category_ids[normalize_category_name(tx.category)],
+                    "to_from": tx.to_from,
+                    "description": tx.description,
+                }
+                for tx, fingerprint in zip(transactions_in, fingerprints)
+            ]
+            if len(rows) >= BULK_COPY_THRESHOLD and db.bind.dialect.driver == "asyncpg":
+                inserted_ids = await self._copy_transactions(db, rows)
+            else:
+                result = await db.execute(
+                    insert(Transactions)
+                    .on_conflict_do_nothing(index_elements=[Transactions.user_id, Transactions.fingerprint])
+                    .returning(Transactions.transaction_id),
+                    rows,
+                )
+                inserted_ids = {row.transaction_id for row in result}
+            written = [(tx, row) for tx, row in zip(transactions_in, rows) if row["transaction_id"] in inserted_ids]
+            if written:
+                rows = [row for _, row in written]
+                await rollup_service.apply_transactions(db, rows)
+                await merchant_index_service.learn(db, user_id, [
+                    (tx.to_from, row["transaction_type"], row["category_id"])
+                    for tx, row in written
+                    if normalize_category_name(tx.category) != UNINFORMATIVE_CATEGORY
+                ])
+                # cached analytics frames pick the rows up when the caller's commit lands
+                analytics_service.record_write(db, user_id, rows)
+                await data_version_service.bump(db, user_id)
+            if commit:
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return len(written)
+
+    async def _copy_transactions(self, db: AsyncSession, rows: List[dict]) -> set:
+        """Bulk-load rows with asyncpg COPY on the session's connection, skipping stored fingerprints.
+
+        COPY cannot skip conflicts, so the rows are copied into a session-local staging
+        table and moved over with one INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+
+        Returns:
+            set[str]: Ids of the rows actually inserted.
+        """
+        columns = list(rows[0].keys())
+        column_list = ", ".join(columns)
+        await db.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS transactions_stage "
+            "(LIKE transactions INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        ))
+        await db.execute(text("TRUNCATE transactions_stage"))
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "transactions_stage",
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+        result = await db.execute(text(
+            f"INSERT INTO transactions ({column_list}) SELECT {column_list} FROM transactions_stage "
+            "ON CONFLICT (user_id, fingerprint) DO NOTHING RETURNING transaction_id"
+        ))
+        return {row.transaction_id for row in result}
+
+    async def recategorize_transaction(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        transaction_id: str,
+        category_name: str,
+    ) -> dict:
+        """Move a transaction to another category and teach the merchant index the choice.
+
+        The rollups, the merchant index and the user's data version change in the
+        same database transaction as the row.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): Owner of the transaction.
+            transaction_id (str): Transaction to recategorize.
+            category_name (str): New category; created for the user when missing.
+
+        Returns:
+            dict: Transaction id, category id and category name.
+
+        Raises:
+            TransactionNotFoundError: When the user has no such transaction.
+        """
+        tx = (await db.execute(
+            select(Transactions).where(Transactions.transaction_id == transaction_id, Transactions.user_id == user_id)
+        )).scalar_one_or_none()
+        if tx is None:
+            raise TransactionNotFoundError()
+        try:
+            category_ids = await category_service.resolve_category_ids(db, user_id, [category_name])
+            category_id = category_ids[normalize_category_name(category_name)]
+            changed = category_id != tx.category_id
+            if changed:
+                await rollup_service.remove_transactions(db, [tx])
+                tx.category_id = category_id
+                await rollup_service.apply_transactions(db, [tx])
+                await data_version_service.bump(db, user_id)
+            await merchant_index_service.learn(
+                db, user_id, [(tx.to_from, tx.transaction_type, category_id)], source=USER
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        if changed:
+            # a category move cannot be applied to a cached frame incrementally
+            analytics_service.invalidate(user_id)
+        return {"transaction_id": transaction_id, "category_id": category_id, "category": category_name.strip()}
 
     async def get_transactions_by_user(self, db: AsyncSession, user_id: str):
         """Return all transactions for a user with category names.
@@ -177,41 +986,155 @@ class TransactionService:
         db: AsyncSession,
         user_id: str,
         limit: int,
-        offset: int,
-    ) -> tuple[list[dict], int]:
-        """Return paginated transactions with a total count for a user.
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """Return a page of transactions, newest first, using offset or keyset pagination.
+
+        With a cursor the page starts strictly after the (date, transaction_id) it encodes,
+        so every page costs the same index range scan regardless of depth. The total is
+        read from the monthly rollups instead of counting raw rows.
 
         Args:
             db (AsyncSession): Async database session.
             user_id (str): User identifier.
             limit (int): Maximum records to return.
-            offset (int): Records to skip.
+            offset (int): Records to skip (ignored when a cursor is given).
+            cursor (str | None): Opaque cursor returned as next_cursor by a previous page.
+            include_total (bool): Whether to compute the total transaction count.
 
         Returns:
-            tuple[list[dict], int]: List of transactions and total count.
+            tuple[list[dict], int | None, str | None]: Transactions, total count (None when
+            not requested) and the cursor for the next page (None on the last page).
+
+        Raises:
+            InvalidCursorError: When the cursor cannot be decoded.
         """
-        base_query = (
-            select(Transactions)
-            .options(selectinload(Transactions.category))
+        query = (
+            select(
+                Transactions.transaction_id,
+                Transactions.description,
+                Transactions.date,
+                Transactions.amount,
+                Transactions.transaction_type,
+                Category.category_name,
+            )
+            .join(Category, Transactions.category_id == Category.category_id)
             .where(Transactions.user_id == user_id)
             .order_by(Transactions.date.desc(), Transactions.transaction_id.desc())
         )
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            query = query.where(tuple_(Transactions.date, Transactions.transaction_id) < (cursor_date, cursor_id))
+        elif offset:
+            query = query.offset(offset)
 
-        total = await db.scalar(select(func.count()).select_from(base_query.subquery()))
+        # one extra row tells us whether another page exists without counting
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].transaction_id)
 
-        result = await db.execute(base_query.limit(limit).offset(offset))
         items = [
             {
-                "description": tx.description,
-                "date": tx.date,
-                "amount": tx.amount,
-                "transaction_type": tx.transaction_type,
-                "category": tx.category.category_name,
+                "transaction_id": row.transaction_id,
+                "description": row.description,
+                "date": row.date,
+                "amount": row.amount,
+                "transaction_type": row.transaction_type,
+                "category": row.category_name,
             }
-            for tx in result.scalars()
+            for row in rows
         ]
-        return items, int(total or 0)
+        total = await self.count_transactions(db, user_id) if include_total else None
+        return items, total, next_cursor
+
+    async def query_transactions(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        filters: TransactionFilter,
+        fields: Optional[Iterable[str]] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Return one keyset page of a user's transactions matching arbitrary filters.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): User identifier.
+            filters (TransactionFilter): Date, type, category, amount and counterparty filters.
+            fields (Iterable[str] | None): Columns to return (DEFAULT_QUERY_FIELDS when omitted).
+            limit (int): Maximum records to return.
+            cursor (str | None): next_cursor of the previous page.
+
+        Returns:
+            tuple[list[dict], str | None]: Transactions with only the requested fields, and
+            the cursor for the next page (None on the last page).
+
+        Raises:
+            UnknownQueryFieldError: When a field is not in QUERY_FIELDS.
+            InvalidCursorError: When the cursor cannot be decoded.
+        """
+        fields = list(dict.fromkeys(fields or DEFAULT_QUERY_FIELDS))
+        query = build_transaction_query(user_id, filters, fields, limit, cursor)
+        rows = (await db.execute(query)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].transaction_id)
+        items = [{field: getattr(row, field) for field in fields} for row in rows]
+        return items, next_cursor
+
+    async def count_transactions(self, db: AsyncSession, user_id: str) -> int:
+        """Count a user's transactions from the monthly rollups (O(months), not O(rows)).
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): User identifier.
+
+        Returns:
+            int: Number of transactions recorded for the user.
+        """
+        total = await db.scalar(
+            select(func.coalesce(func.sum(MonthlyRollup.transaction_count), 0))
+            .where(MonthlyRollup.user_id == user_id)
+        )
+        return int(total or 0)
     
+    async def _sum_rollups(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        transaction_type: str,
+        month: Optional[int] = None,
+        year: Optional[int] = None,
+    ) -> float:
+        """Sum one transaction type for a user from the monthly rollups.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): User identifier.
+            transaction_type (str): "INCOME" or "EXPENSE".
+            month (int | None): Restrict to a month (requires year).
+            year (int | None): Restrict to a year.
+
+        Returns:
+            float: Total amount (0.0 when there are no rows).
+        """
+        query = select(func.coalesce(func.sum(MonthlyRollup.total_amount), 0.0)).where(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.transaction_type == transaction_type,
+        )
+        if year is not None:
+            query = query.where(MonthlyRollup.year == year)
+        if month is not None:
+            query = query.where(MonthlyRollup.month == month)
+        total = await db.scalar(query)
+        return float(total or 0.0)
+
     async def get_income_summary(self, db: AsyncSession, user_id: str):
         """Sum total income for a user.
 
@@ -222,14 +1145,7 @@ class TransactionService:
         Returns:
             dict: Mapping of total income.
         """
-        result = await db.execute(
-            select(Transactions)
-            .where(
-                Transactions.user_id == user_id,
-                Transactions.transaction_type == "INCOME"
-            )
-        )
-        total_income = sum(tx.amount for tx in result.scalars())
+        total_income = await self._sum_rollups(db, user_id, "INCOME")
         return {"total_income": total_income}
 
     async def get_expense_summary(self, db: AsyncSession, user_id: str):
@@ -242,14 +1158,7 @@ class TransactionService:
         Returns:
             dict: Mapping of total expenses.
         """
-        result = await db.execute(
-            select(Transactions)
-            .where(
-                Transactions.user_id == user_id,
-                Transactions.transaction_type == "EXPENSE"
-            )
-        )
-        total_expense = sum(tx.amount for tx in result.scalars())
+        total_expense = await self._sum_rollups(db, user_id, "EXPENSE")
         return {"total_expense": total_expense}
     
     async def get_spending_category_summary(self, db: AsyncSession, user_id: str):
@@ -263,20 +1172,90 @@ class TransactionService:
             dict[str, float]: Spend per category.
         """
         result = await db.execute(
-            select(Transactions)
-            .options(selectinload(Transactions.category))
+            select(Category.category_name, func.sum(MonthlyRollup.total_amount).label("total"))
+            .join(Category, MonthlyRollup.category_id == Category.category_id)
             .where(
-                Transactions.user_id == user_id,
-                Transactions.transaction_type == "EXPENSE"
+                MonthlyRollup.user_id == user_id,
+                MonthlyRollup.transaction_type == "EXPENSE"
             )
+            .group_by(Category.category_name)
         )
-        category_summary = {}
-        for tx in result.scalars():
-            category_name = tx.category.category_name
-            if category_name not in category_summary:
-                category_summary[category_name] = 0.0
-            category_summary[category_name] += tx.amount
-        return category_summary
+        return {row.category_name: float(row.total or 0.0) for row in result}
+
+    async def get_summary(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> dict:
+        """Return income, expense and per-category totals for a date window in one query.
+
+        Windows on month boundaries read the monthly rollups; other windows aggregate raw rows.
+
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (str): User identifier.
+            start_date (date | None): Inclusive lower bound, unbounded when None.
+            end_date (date | None): Exclusive upper bound, unbounded when None.
+
+        Returns:
+            dict: Income/expense totals plus income and spend per category.
+        """
+        if _is_month_aligned(start_date) and _is_month_aligned(end_date):
+            # whole-month windows can be answered from the rollups
+            query = (
+                select(
+                    MonthlyRollup.transaction_type,
+                    Category.category_name,
+                    func.sum(MonthlyRollup.total_amount).label("total"),
+                )
+                .join(Category, MonthlyRollup.category_id == Category.category_id)
+                .where(MonthlyRollup.user_id == user_id)
+                .group_by(MonthlyRollup.transaction_type, Category.category_name)
+            )
+            if start_date is not None:
+                query = query.where(
+                    tuple_(MonthlyRollup.year, MonthlyRollup.month) >= (start_date.year, start_date.month)
+                )
+            if end_date is not None:
+                query = query.where(
+                    tuple_(MonthlyRollup.year, MonthlyRollup.month) < (end_date.year, end_date.month)
+                )
+        else:
+            query = (
+                select(
+                    Transactions.transaction_type,
+                    Category.category_name,
+                    func.sum(Transactions.amount).label("total"),
+                )
+                .join(Category, Transactions.category_id == Category.category_id)
+                .where(Transactions.user_id == user_id)
+                .group_by(Transactions.transaction_type, Category.category_name)
+            )
+            if start_date is not None:
+                query = query.where(Transactions.date >= start_date)
+            if end_date is not None:
+                query = query.where(Transactions.date < end_date)
+        result = await db.execute(query)
+
+        summary = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "total_income": 0.0,
+            "total_expense": 0.0,
+            "income_by_category": {},
+            "expense_by_category": {},
+        }
+        for row in result:
+            total = float(row.total or 0.0)
+            if transaction_type_name(row.transaction_type) == "INCOME":
+                summary["total_income"] += total
+                summary["income_by_category"][row.category_name] = total
+            else:
+                summary["total_expense"] += total
+                summary["expense_by_category"][row.category_name] = total
+        return summary
     
     async def get_transactions_by_month(self, db: AsyncSession, user_id: str, month: int, year: int):
         """List transactions for a user within a specific month.
@@ -290,18 +1269,14 @@ class TransactionService:
         Returns:
             list[dict]: Transactions within the month.
         """
-        next_month = month + 1
-        next_year = year
-        if next_month > 12:
-            next_month = 1
-            next_year += 1
+        month_start, month_end = _month_bounds(month, year)
         result = await db.execute(
             select(Transactions)
             .options(selectinload(Transactions.category))
             .where(
                 Transactions.user_id == user_id,
-                Transactions.date >= datetime(year, month, 1),
-                Transactions.date < datetime(next_year, next_month, 1)
+                Transactions.date >= month_start,
+                Transactions.date < month_end
             )
         )
         transactions = result.scalars().all()
@@ -327,21 +1302,7 @@ class TransactionService:
         Returns:
             dict: Mapping of total income for the month.
         """
-        next_month = month + 1
-        next_year = year
-        if next_month > 12:
-            next_month = 1
-            next_year += 1
-        result = await db.execute(
-            select(Transactions)
-            .where(
-                Transactions.user_id == user_id,
-                Transactions.transaction_type == "INCOME",
-                Transactions.date >= datetime(year, month, 1),
-                Transactions.date < datetime(next_year, next_month, 1)
-            )
-        )
-        total_income = sum(tx.amount for tx in result.scalars())
+        total_income = await self._sum_rollups(db, user_id, "INCOME", month=month, year=year)
         return {"total_income": total_income}
     
     async def get_expense_by_month(self, db: AsyncSession, user_id: str, month: int, year: int):
@@ -356,25 +1317,11 @@ class TransactionService:
         Returns:
             dict: Mapping of total expenses for the month.
         """
-        next_month = month + 1
-        next_year = year
-        if next_month > 12:
-            next_month = 1
-            next_year += 1
-        result = await db.execute(
-            select(Transactions)
-            .where(
-                Transactions.user_id == user_id,
-                Transactions.transaction_type == "EXPENSE",
-                Transactions.date >= datetime(year, month, 1),
-                Transactions.date < datetime(next_year, next_month, 1)
-            )
-        )
-        total_expense = sum(tx.amount for tx in result.scalars())
+        total_expense = await self._sum_rollups(db, user_id, "EXPENSE", month=month, year=year)
         return {"total_expense": total_expense}
     
     async def get_monthly_summary(self, db: AsyncSession, user_id: str):
-        """Summarize income and expenses grouped by month for a user.
+        """Summarize income and expenses grouped by month for a user from the monthly rollups.
 
         Args:
             db (AsyncSession): Async database session.
@@ -383,15 +1330,15 @@ class TransactionService:
         Returns:
             list[dict]: Monthly totals keyed by month/year.
         """
-        results = await db.execute(select(extract('month', Transactions.date).label('month'),
-                                           extract('year', Transactions.date).label('year'),
+        results = await db.execute(select(MonthlyRollup.month,
+                                           MonthlyRollup.year,
                                            #using func to chain case to sum
                                            func.sum(case(
-                                               (Transactions.transaction_type == "INCOME", Transactions.amount), else_=0)).label('total_income'),
-                                           func.sum(case((Transactions.transaction_type == "EXPENSE", Transactions.amount), else_=0)).label('total_expense'))
-                                  .where(Transactions.user_id == user_id)
-                                  .group_by(extract('year', Transactions.date), extract('month', Transactions.date))
-                                  .order_by(extract('year', Transactions.date), extract('month', Transactions.date)))
+                                               (MonthlyRollup.transaction_type == "INCOME", MonthlyRollup.total_amount), else_=0)).label('total_income'),
+                                           func.sum(case((MonthlyRollup.transaction_type == "EXPENSE", MonthlyRollup.total_amount), else_=0)).label('total_expense'))
+                                  .where(MonthlyRollup.user_id == user_id)
+                                  .group_by(MonthlyRollup.year, MonthlyRollup.month)
+                                  .order_by(MonthlyRollup.year, MonthlyRollup.month))
         summaries = [
             {
                 "month": int(row.month),
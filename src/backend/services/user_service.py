@@ -1,6 +1,9 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
-from typing import Optional
+from typing import Callable, Optional
 
 import jwt
 from jwt import PyJWTError
@@ -15,6 +18,7 @@ load_dotenv()
 
 from backend.database.models import User
 from backend.database.database_connection.database_client import get_db
+from backend.services.ttl_cache import TTLCache
 
 #for some of my highlevel security services implement stored procedures 
 #ORMs under the hood use parameterized sql queries that preject SQL injection attacks
@@ -28,10 +32,81 @@ SECRET_KEY = os.environ["SECRET_KEY"]
 ALGORITHM = os.environ["ALGORITHM"]
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# resolved users and verified tokens are cached per process. Nothing updates a user row's profile
+# or password today; code that starts doing so must call invalidate_user after its commit
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# argon2 releases the GIL, so a few threads hash in parallel without touching the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# hashes running or waiting beyond this are refused (503) instead of queueing without bound
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+
+class PasswordHashingBusyError(Exception):
+    pass
+
+
+class PasswordHashExecutor:
+    """Runs password hashing on a dedicated thread pool with a cap on queued work."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable, *args):
+        """Run a hashing call off the event loop.
+
+        Raises:
+            PasswordHashingBusyError: When max_pending calls are already running or queued.
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashingBusyError()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+password_hash_executor = PasswordHashExecutor(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Profile of the user behind a request, detached from any session so it can be cached and shared."""
+    user_id: str
+    email: str
+    first_name: str
+    last_name: str
+    create_date: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            user_id=user.user_id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            create_date=user.create_date,
+        )
+
 
 class UserService:
     """Service for user authentication and management."""
 
+    def __init__(self):
+        self.user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS)
+        self.token_cache = TTLCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
+
     async def create_user(self, db: AsyncSession, user_in):
         """Create and persist a new user with hashed password.
 
@@ -41,8 +116,11 @@ class UserService:
 
         Returns:
             User: Persisted user instance.
+
+        Raises:
+            PasswordHashingBusyError: When the hashing queue is full.
         """
-        hashed_password = self.hash_password(user_in.password)
+        hashed_password = await self.hash_password_async(user_in.password)
 
         user = User(
             user_id=str(uuid4()),
@@ -83,6 +161,31 @@ class UserService:
         result = await db.execute(select(User).where(User.user_id == user_id))
         return result.scalar_one_or_none()
 
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop a user from the authentication cache after it changes.
+
+        Args:
+            user_id (str): User identifier.
+        """
+        self.user_cache.invalidate(user_id)
+
+    def clear_caches(self) -> None:
+        """Empty the user and token caches."""
+        self.user_cache.clear()
+        self.token_cache.clear()
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for the authentication caches.
+
+        Returns:
+            dict: Per-cache stats plus the user lookups served without a database query.
+        """
+        return {
+            "users": self.user_cache.stats(),
+            "tokens": self.token_cache.stats(),
+            "db_queries_avoided": self.user_cache.hits,
+        }
+
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a plaintext password.
@@ -108,6 +211,35 @@ class UserService:
         """
         return password_hash.verify(plain_password, hashed_password)
 
+    async def hash_password_async(self, password: str) -> str:
+        """Hash a plaintext password on the bounded hashing executor.
+
+        Args:
+            password (str): Plaintext password.
+
+        Returns:
+            str: Hashed password.
+
+        Raises:
+            PasswordHashingBusyError: When the hashing queue is full.
+        """
+        return await password_hash_executor.run(self.hash_password, password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash on the bounded hashing executor.
+
+        Args:
+            plain_password (str): Input password.
+            hashed_password (str): Stored hash.
+
+        Returns:
+            bool: True if matches, else False.
+
+        Raises:
+            PasswordHashingBusyError: When the hashing queue is full.
+        """
+        return await password_hash_executor.run(self.verify_password, plain_password, hashed_password)
+
     @staticmethod
     def create_access_token(
         subject: str,
@@ -144,15 +276,19 @@ class UserService:
         self,
         token: str = Depends(oauth2_scheme),
         db: AsyncSession = Depends(get_db),
-    ) -> User:
+    ) -> AuthenticatedUser:
         """Resolve current user from a bearer token or raise 401.
 
+        Verified tokens and resolved users are served from in-process TTL caches,
+        so repeated requests with the same token skip JWT verification and the
+        user lookup.
+
         Args:
             token (str): Bearer token.
             db (AsyncSession): Async database session.
 
         Returns:
-            User: Authenticated user.
+            AuthenticatedUser: Authenticated user, a plain copy safe to share across sessions.
 
         Raises:
             HTTPException: When token is invalid or user not found.
@@ -163,17 +299,26 @@ class UserService:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-        try:
-            payload = self.decode_token(token)
-            user_id: str | None = payload.get("sub")
-            if user_id is None:
+        user_id = self.token_cache.get(token)
+        if user_id is None:
+            try:
+                payload = self.decode_token(token)
+                user_id = payload.get("sub")
+                if user_id is None:
+                    raise credentials_exception
+            except PyJWTError:
                 raise credentials_exception
-        except PyJWTError:
-            raise credentials_exception
+            # never trust a cached verification past the token's own expiry
+            expires_in = payload["exp"] - datetime.now(timezone.utc).timestamp() if "exp" in payload else None
+            self.token_cache.set(token, user_id, ttl=expires_in)
 
-        user = await self.get_user_by_id(db, user_id)
+        user = self.user_cache.get(user_id)
         if user is None:
-            raise credentials_exception
+            found = await self.get_user_by_id(db, user_id)
+            if found is None:
+                raise credentials_exception
+            user = AuthenticatedUser.from_model(found)
+            self.user_cache.set(user_id, user)
 
         return user
 
@@ -13,3 +13,8 @@ os.environ.setdefault("SECRET_KEY", "test-secret-key")
 os.environ.setdefault("ALGORITHM", "HS256")
 os.environ.setdefault("GEMINI_API_KEY", "test-gemini-key")
 os.environ.setdefault("GOOGLE_API_KEY2", "test-google-api-key")
+os.environ.setdefault("db_user", "test")
+os.environ.setdefault("db_password", "test")
+os.environ.setdefault("db_host", "localhost")
+os.environ.setdefault("db_port", "5432")
+os.environ.setdefault("dbname", "finanlytics_test")
@@ -0,0 +1,91 @@
+"""Build small ruled-table PDFs for statement parser tests and benchmarks.
+
+Only what pdfplumber needs to find a table is emitted: Helvetica text and the
+cell borders as stroked lines. No third-party PDF writer is required.
+"""
+from typing import Sequence
+
+PAGE_WIDTH = 842  # A4 landscape
+PAGE_HEIGHT = 595
+MARGIN = 30
+ROW_HEIGHT = 16
+FONT_SIZE = 7
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_stream(title: str, rows: Sequence[Sequence[str]], column_widths: Sequence[float]) -> bytes:
+    ops = [f"BT /F1 10 Tf {MARGIN} {PAGE_HEIGHT - MARGIN} Td ({_escape(title)}) Tj ET"]
+    top = PAGE_HEIGHT - MARGIN - 20
+    left = MARGIN
+    right = left + sum(column_widths)
+    bottom = top - ROW_HEIGHT * len(rows)
+    for i in range(len(rows) + 1):
+        y = top - ROW_HEIGHT * i
+        ops.append(f"{left} {y} m {right} {y} l S")
+    x = left
+    for width in list(column_widths) + [0]:
+        ops.append(f"{x} {top} m {x} {bottom} l S")
+        x += width
+    for r, row in enumerate(rows):
+        y = top - ROW_HEIGHT * (r + 1) + 5
+        x = left
+        for cell, width in zip(row, column_widths):
+            ops.append(f"BT /F1 {FONT_SIZE} Tf {x + 2} {y} Td ({_escape(str(cell))}) Tj ET")
+            x += width
+    return ("0.5 w\n" + "\n".join(ops)).encode("latin-1")
+
+
+def make_table_pdf(
+    header: Sequence[str],
+    rows: Sequence[Sequence[str]],
+    rows_per_page: int = 30,
+    title: str = "Account Statement",
+    repeat_header: bool = True,
+) -> bytes:
+    """Render rows as a ruled table spread over as many pages as needed.
+
+    Args:
+        header (Sequence[str]): Column headers, drawn as the first table row.
+        rows (Sequence[Sequence[str]]): Table body.
+        rows_per_page (int): Body rows per page.
+        title (str): Text drawn above the table on every page.
+        repeat_header (bool): Draw the header on continuation pages too.
+
+    Returns:
+        bytes: PDF file contents.
+    """
+    column_widths = [max(40.0, (PAGE_WIDTH - 2 * MARGIN) / len(header))] * len(header)
+    pages = []
+    for start in range(0, max(len(rows), 1), rows_per_page):
+        body = list(rows[start:start + rows_per_page])
+        table = [list(header)] + body if (start == 0 or repeat_header) else body
+        pages.append(_page_stream(title, table, column_widths))
+
+    # object 1: catalog, 2: pages, 3: font, then a (page, content) pair per page
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for stream in pages:
+        page_number = len(objects) + 1
+        kids.append(f"{page_number} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode("latin-1")
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
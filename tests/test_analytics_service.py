@@ -0,0 +1,152 @@
+import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.services.analytics_service import (
+    AnalyticsService,
+    analytics_service,
+    cash_flow,
+    category_trends,
+    frame_from_rows,
+    rolling_spend,
+    savings_rate,
+)
+from backend.services.session_hooks import discard_commit_hooks, run_commit_hooks
+
+
+def _tx(day, amount, transaction_type="EXPENSE", category_id=1):
+    return {"date": day, "amount": amount, "transaction_type": transaction_type, "category_id": category_id}
+
+
+ROWS = [
+    _tx(datetime.date(2024, 1, 5), 1000.0, "INCOME", 9),
+    _tx(datetime.date(2024, 1, 6), 200.0, category_id=1),
+    _tx(datetime.date(2024, 1, 20), 100.0, category_id=2),
+    _tx(datetime.date(2024, 2, 1), 300.0, category_id=1),
+    _tx(datetime.date(2024, 3, 3), 500.0, "INCOME", 9),
+    _tx(datetime.date(2024, 3, 3), 600.0, category_id=2),
+]
+
+
+def test_cash_flow_groups_by_period_with_running_balance():
+    flow = cash_flow(frame_from_rows(ROWS), "month")
+
+    assert [entry["period"] for entry in flow] == ["2024-01-01", "2024-02-01", "2024-03-01"]
+    assert [entry["net"] for entry in flow] == [700.0, -300.0, -100.0]
+    assert [entry["balance"] for entry in flow] == [700.0, 400.0, 300.0]
+    assert cash_flow(frame_from_rows(ROWS), "month", start=datetime.date(2024, 2, 1))[0]["balance"] == -300.0
+
+
+def test_savings_rate_is_none_for_months_without_income():
+    rates = savings_rate(frame_from_rows(ROWS))
+
+    assert rates["income"] == 1500.0 and rates["expense"] == 1200.0
+    assert rates["savings_rate"] == 0.2
+    assert [month["savings_rate"] for month in rates["months"]] == [0.7, None, -0.2]
+
+
+def test_rolling_spend_counts_days_without_spending_as_zero():
+    spend = rolling_spend(frame_from_rows(ROWS), window_days=2, end=datetime.date(2024, 1, 8))
+
+    assert [(day["date"], day["spend"], day["rolling_average"]) for day in spend] == [
+        ("2024-01-06", 200.0, 200.0),
+    ]
+    spend = rolling_spend(frame_from_rows(ROWS), window_days=2)
+    assert spend[1] == {"date": "2024-01-07", "spend": 0.0, "rolling_average": 100.0}
+    assert len(spend) == (datetime.date(2024, 3, 3) - datetime.date(2024, 1, 6)).days + 1
+
+
+def test_category_trends_align_categories_on_trailing_months():
+    trends = category_trends(frame_from_rows(ROWS), {1: "Transport", 2: "Dining Out"}, months=2)
+
+    assert trends["months"] == ["2024-02-01", "2024-03-01"]
+    assert trends["categories"] == [
+        {"category": "Dining Out", "totals": [0.0, 600.0], "change": 600.0},
+        {"category": "Transport", "totals": [300.0, 0.0], "change": -300.0},
+    ]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class FakeSession:
+    """Answers the frame query with epoch-day rows, and the label query with names."""
+
+    def __init__(self, rows, labels=None, on_execute=None):
+        self.rows = rows
+        self.labels = labels or {}
+        self.on_execute = on_execute
+        self.queries = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        self.queries += 1
+        if self.on_execute:
+            self.on_execute()
+        if "categories" in str(statement):
+            return FakeResult([type("Row", (), {"category_id": k, "category_name": v}) for k, v in self.labels.items()])
+        epoch = datetime.date(1970, 1, 1)
+        return FakeResult([
+            ((row["date"] - epoch).days, row["amount"], row["transaction_type"] == "INCOME", row["category_id"])
+            for row in self.rows
+        ])
+
+
+@pytest.mark.asyncio
+async def test_frame_is_cached_and_extended_by_committed_writes():
+    service = AnalyticsService()
+    db = FakeSession(ROWS, {1: "Transport", 2: "Dining Out", 9: "Income"})
+    assert len((await service.get_frame(db, "user-1")).frame) == 6
+
+    session = Session()
+    service.record_write(session, "user-1", [_tx(datetime.date(2023, 12, 31), 50.0, category_id=1)])
+    assert len((await service.get_frame(db, "user-1")).frame) == 6  # not committed yet
+    run_commit_hooks(session)
+
+    snapshot = await service.get_frame(db, "user-1")
+    assert len(snapshot.frame) == 7 and snapshot.frame["date"].is_monotonic_increasing
+    assert db.queries == 2  # one frame load, one label lookup
+    assert service.cache_stats()["rows_appended"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_drops_the_frame():
+    service = AnalyticsService()
+    db = FakeSession(ROWS)
+    await service.get_frame(db, "user-1")
+
+    session = Session()
+    service.record_write(session, "user-1", [_tx(datetime.date(2024, 4, 1), 50.0)])
+    discard_commit_hooks(session)
+
+    assert service.frame_cache.peek("user-1") is None
+
+
+@pytest.mark.asyncio
+async def test_frame_loaded_during_a_write_is_not_cached():
+    service = AnalyticsService()
+    session = Session()
+    db = FakeSession(ROWS, on_execute=lambda: service.record_write(session, "user-1", []) if db.queries == 1 else None)
+
+    await service.get_frame(db, "user-1")
+    run_commit_hooks(session)
+
+    assert service.frame_cache.peek("user-1") is None
+
+
+def test_session_commit_and_rollback_settle_recorded_writes():
+    for settle in (Session.commit, Session.rollback, Session.close):
+        session = Session()
+        session.begin()  # writers record after their first statement has opened the transaction
+        analytics_service.record_write(session, "hooks-user", [])
+        assert analytics_service._pending["hooks-user"] == 1
+        settle(session)
+        assert "hooks-user" not in analytics_service._pending
@@ -0,0 +1,186 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.database.models.categories_model import DEFAULT_CATEGORIES, seed_categories
+from backend.services.category_service import CategoryService
+from backend.services.session_hooks import run_commit_hooks
+
+
+class FakeSession:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.added = []
+        self.commits = 0
+        self.info = {}
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult(self.results.pop(0))
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        self.commits += 1
+        run_commit_hooks(self)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+SYSTEM_AND_USER_ROWS = [
+    SimpleNamespace(category_id=1, category_name="Transport", user_id=None),
+    SimpleNamespace(category_id=2, category_name="Income", user_id=None),
+    SimpleNamespace(category_id=40, category_name="travel", user_id="user-123"),
+]
+
+
+@pytest.mark.asyncio
+async def test_resolve_category_ids_matches_case_insensitively_without_inserting():
+    db = FakeSession([
+        SimpleNamespace(category_id=1, category_name="Transport", user_id=None),
+        SimpleNamespace(category_id=40, category_name="travel", user_id="user-123"),
+    ])
+
+    resolved = await CategoryService().resolve_category_ids(db, "user-123", ["transport ", "Travel", "TRAVEL"])
+
+    assert resolved == {"transport": 1, "travel": 40}
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_category_ids_files_blank_names_under_the_catch_all():
+    db = FakeSession([
+        SimpleNamespace(category_id=1, category_name="Transport", user_id=None),
+        SimpleNamespace(category_id=11, category_name="Miscellaneous", user_id=None),
+    ])
+
+    resolved = await CategoryService().resolve_category_ids(db, "user-123", ["", "   ", "Transport"])
+
+    assert resolved == {"miscellaneous": 11, "transport": 1}
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_category_ids_creates_missing_names_in_one_upsert():
+    db = FakeSession(
+        [SimpleNamespace(category_id=1, category_name="Transport", user_id=None)],
+        [SimpleNamespace(category_id=41, category_name="pets"), SimpleNamespace(category_id=42, category_name="gym")],
+    )
+
+    resolved = await CategoryService().resolve_category_ids(db, "user-123", ["Transport", "Pets", "Gym", "pets"])
+
+    assert resolved == {"transport": 1, "pets": 41, "gym": 42}
+    assert len(db.statements) == 2
+    assert "ON CONFLICT" in str(db.statements[1].compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_category_map_is_loaded_once_and_served_from_cache():
+    service = CategoryService()
+    db = FakeSession(SYSTEM_AND_USER_ROWS)
+
+    first = await service.resolve_category_ids(db, "user-123", ["Transport"])
+    second = await service.resolve_category_ids(db, "user-123", ["travel ", "INCOME"])
+    by_name = await service.get_category_by_name(db, "Travel", "user-123")
+    names = await service.get_user_categories(db, "user-123")
+
+    assert first == {"transport": 1} and second == {"travel": 40, "income": 2} and by_name == 40
+    assert names == ["Transport", "Income", "travel"]
+    assert len(db.statements) == 1
+    assert service.cache_stats()["db_queries_avoided"] == 3
+
+
+@pytest.mark.asyncio
+async def test_creating_a_category_invalidates_the_users_map():
+    service = CategoryService()
+    db = FakeSession(
+        SYSTEM_AND_USER_ROWS,
+        [],  # create_user_category's duplicate check
+        [],  # data version bump
+        SYSTEM_AND_USER_ROWS + [SimpleNamespace(category_id=41, category_name="pets", user_id="user-123")],
+    )
+    await service.get_user_categories(db, "user-123")
+
+    await service.create_user_category(db, "user-123", "Pets")
+    resolved = await service.resolve_category_ids(db, "user-123", ["pets"])
+
+    assert resolved == {"pets": 41}
+    assert len(db.statements) == 4 and db.commits == 1
+    assert "data_version" in str(db.statements[2])
+
+
+@pytest.mark.asyncio
+async def test_new_names_invalidate_the_map_only_once_committed():
+    service = CategoryService()
+    db = FakeSession(
+        SYSTEM_AND_USER_ROWS,
+        [SimpleNamespace(category_id=41, category_name="pets")],
+        SYSTEM_AND_USER_ROWS + [SimpleNamespace(category_id=41, category_name="pets", user_id="user-123")],
+    )
+
+    assert await service.resolve_category_ids(db, "user-123", ["Pets"]) == {"pets": 41}
+    # until the commit nobody else can see the new row, so the cached map is still current
+    assert await service.get_category_by_name(db, "pets", "user-123") is None
+    assert len(db.statements) == 2
+
+    await db.commit()
+
+    assert await service.get_category_by_name(db, "pets", "user-123") == 41
+    assert len(db.statements) == 3
+
+
+def test_rolled_back_writes_leave_the_map_cached():
+    from sqlalchemy.orm import Session
+
+    service = CategoryService()
+    for settle, invalidated in ((Session.commit, True), (Session.rollback, False), (Session.close, False)):
+        session = Session()
+        session.begin()
+        before = service._versions.get("hooks-user", 0)
+        service.invalidate_on_commit(session, "hooks-user")
+        settle(session)
+        assert (service._versions.get("hooks-user", 0) > before) is invalidated
+        assert not session.info
+
+
+@pytest.mark.asyncio
+async def test_map_loaded_while_categories_change_is_not_cached():
+    service = CategoryService()
+
+    class RacingSession(FakeSession):
+        async def execute(self, statement, *args, **kwargs):
+            result = await super().execute(statement, *args, **kwargs)
+            if len(self.statements) == 1:
+                # another request deletes a category while this load is in flight
+                service.invalidate_user_categories("user-123")
+            return result
+
+    db = RacingSession(SYSTEM_AND_USER_ROWS, SYSTEM_AND_USER_ROWS[:2])
+
+    assert await service.get_category_by_name(db, "travel", "user-123") == 40
+    assert await service.get_category_by_name(db, "travel", "user-123") is None
+    assert len(db.statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_seed_categories_is_one_idempotent_insert():
+    db = FakeSession([])
+
+    await seed_categories(db)
+
+    assert len(db.statements) == 1 and db.commits == 1
+    compiled = db.statements[0].compile(dialect=postgresql.dialect())
+    assert "ON CONFLICT (category_name) WHERE user_id IS NULL DO NOTHING" in str(compiled)
+    assert [v for k, v in compiled.params.items() if k.startswith("category_name")] == DEFAULT_CATEGORIES
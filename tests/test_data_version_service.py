@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.services.data_version_service import DataVersionService, etag_matches, summary_etag
+
+
+class FakeSession:
+    def __init__(self, version=None):
+        self.version = version
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+
+    async def scalar(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return self.version
+
+
+def test_etag_changes_with_version_resource_and_user():
+    etag = summary_etag("user-123", 7, "/transactions/income_summary?")
+
+    assert etag == summary_etag("user-123", 7, "/transactions/income_summary?")
+    assert etag.startswith('"7-') and etag.endswith('"')
+    assert etag != summary_etag("user-123", 8, "/transactions/income_summary?")
+    assert etag != summary_etag("user-123", 7, "/transactions/expense_summary?")
+    assert etag != summary_etag("user-456", 7, "/transactions/income_summary?")
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ("", False),
+        ('"7-abc"', True),
+        ('W/"7-abc"', True),
+        ('"6-abc", "7-abc"', True),
+        ("*", True),
+        ('"6-abc"', False),
+    ],
+)
+def test_etag_matches_follows_if_none_match_rules(header, matches):
+    assert etag_matches(header, '"7-abc"') is matches
+
+
+@pytest.mark.asyncio
+async def test_bump_increments_in_sql_and_version_reads_only_users():
+    service = DataVersionService()
+    db = FakeSession(version=None)
+
+    await service.bump(db, "user-123")
+    version = await service.get_version(db, "user-123")
+
+    bump_sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "UPDATE users SET data_version=(users.data_version + " in bump_sql
+    assert version == 0
+    assert "transactions" not in str(db.statements[1])
+
+
+@pytest.mark.asyncio
+async def test_responses_are_cached_per_version():
+    service = DataVersionService()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    first = await service.cached_response("user-123", 3, "/summary?", compute)
+    again = await service.cached_response("user-123", 3, "/summary?", compute)
+    after_write = await service.cached_response("user-123", 4, "/summary?", compute)
+
+    assert (first, again, after_write) == (1, 1, 2)
+    assert service.cache_stats()["hits"] == 1
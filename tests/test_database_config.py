@@ -0,0 +1,51 @@
+from sqlalchemy.pool import NullPool
+
+from backend.database.database_connection import database_config
+from backend.database.database_connection.database_config import engine_options, pool_stats
+from backend.database.database_connection.pool_metrics import InstrumentedAsyncAdaptedQueuePool, PoolMetrics
+
+
+def test_engine_options_default_to_instrumented_queue_pool():
+    options = engine_options()
+
+    assert options["poolclass"] is InstrumentedAsyncAdaptedQueuePool
+    assert options["pool_size"] == database_config.DB_POOL_SIZE
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"]["statement_cache_size"] == database_config.DB_STATEMENT_CACHE_SIZE
+    assert "prepared_statement_name_func" not in options["connect_args"]
+
+
+def test_pgbouncer_transaction_mode_disables_statement_caches(monkeypatch):
+    monkeypatch.setattr(database_config, "DB_PGBOUNCER_MODE", "transaction")
+    monkeypatch.setattr(database_config, "DB_POOL_CLASS", "null")
+
+    options = engine_options()
+
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+    connect_args = options["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    first, second = connect_args["prepared_statement_name_func"](), connect_args["prepared_statement_name_func"]()
+    assert first != second and first.startswith("__asyncpg_")
+
+
+def test_pool_metrics_snapshot_reports_wait_percentiles():
+    metrics = PoolMetrics()
+    for wait in (0.001, 0.002, 0.003, 0.1):
+        metrics.record(wait)
+    metrics.record(30.0, timed_out=True)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["checkouts"] == 4 and snapshot["checkout_timeouts"] == 1
+    assert snapshot["max_wait_ms"] == 100.0
+    assert snapshot["p50_wait_ms"] == 3.0
+
+
+def test_pool_stats_reports_saturation():
+    stats = pool_stats()
+
+    assert stats["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert stats["saturation"] == 0.0
+    assert stats["size"] == database_config.DB_POOL_SIZE
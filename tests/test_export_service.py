@@ -0,0 +1,130 @@
+import csv
+import datetime
+import io
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import backend.services.export_service as export_service_module
+from backend.database.models.transaction_model import TransactionTypeEnum
+from backend.services.export_service import (
+    EXPORT_COLUMNS,
+    ExportFormatUnavailableError,
+    UnsupportedExportFormatError,
+    export_service,
+)
+
+
+def _row(i):
+    return SimpleNamespace(
+        transaction_id=f"tx-{i}",
+        date=datetime.date(2024, 3, 1) + datetime.timedelta(days=i),
+        amount=1000.0 + i,
+        transaction_type=TransactionTypeEnum.EXPENSE if i % 2 else TransactionTypeEnum.INCOME,
+        category_name="Transport" if i % 2 else "Income",
+        to_from=f"Merchant {i}",
+        description='POS "UBER", Lekki' if i == 1 else f"Payment {i}",
+    )
+
+
+class FakeStreamResult:
+    def __init__(self, rows, batch_rows):
+        self.rows = rows
+        self.batch_rows = batch_rows
+
+    async def partitions(self):
+        for start in range(0, len(self.rows), self.batch_rows):
+            yield self.rows[start:start + self.batch_rows]
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def stream(self, statement):
+        self.statements.append(statement)
+        return FakeStreamResult(self.rows, statement.get_execution_options()["yield_per"])
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSession([_row(i) for i in range(5)])
+    monkeypatch.setattr(export_service_module, "AsyncSessionLocal", lambda: db)
+    return db
+
+
+async def _collect(export_format, batch_rows=2):
+    return [chunk async for chunk in export_service.stream_export("user-1", export_format, batch_rows=batch_rows)]
+
+
+@pytest.mark.asyncio
+async def test_csv_export_streams_header_then_one_chunk_per_batch(fake_db):
+    chunks = await _collect("csv")
+
+    assert len(chunks) == 1 + 3
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert rows[1] == ["tx-0", "2024-03-01", "1000.0", "income", "Income", "Merchant 0", "Payment 0"]
+    assert rows[2][-1] == 'POS "UBER", Lekki'
+    assert len(rows) == 6 and fake_db.closed
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_writes_one_object_per_line(fake_db):
+    lines = b"".join(await _collect("ndjson")).decode("utf-8").splitlines()
+
+    assert [json.loads(line)["transaction_id"] for line in lines] == [f"tx-{i}" for i in range(5)]
+    assert json.loads(lines[1])["transaction_type"] == "expense"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+async def test_columnar_exports_round_trip(fake_db, export_format):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    data = b"".join(await _collect(export_format))
+
+    if export_format == "parquet":
+        parquet_file = pq.ParquetFile(pa.BufferReader(data))
+        assert parquet_file.num_row_groups == 3
+        table = parquet_file.read()
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+    assert table.column_names == list(EXPORT_COLUMNS)
+    assert table["transaction_id"].to_pylist() == [f"tx-{i}" for i in range(5)]
+    assert table["date"].to_pylist()[0] == datetime.date(2024, 3, 1)
+    assert table["category"].to_pylist()[:2] == ["Income", "Transport"]
+
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+async def test_abandoned_export_releases_its_session(fake_db, export_format):
+    stream = export_service.stream_export("user-1", export_format, batch_rows=2)
+
+    while not fake_db.statements:
+        await stream.__anext__()
+    assert not fake_db.closed
+    await stream.aclose()
+
+    assert fake_db.closed
+
+def test_check_format_rejects_unknown_and_unavailable_formats(monkeypatch):
+    with pytest.raises(UnsupportedExportFormatError):
+        export_service.check_format("xlsx")
+    export_service.check_format("csv")
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # as if pyarrow were not installed
+    with pytest.raises(ExportFormatUnavailableError):
+        export_service.check_format("parquet")
@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+
+from backend.schemas.transaction_schema import TransactionCreate
+from backend.services.extraction_cache_service import (
+    RAW_KEY,
+    TEXT_KEY,
+    ExtractionCacheService,
+    file_sha256,
+    normalize_statement_text,
+    text_sha256,
+)
+
+PAYLOAD = [{
+    "date": "2024-03-01",
+    "amount": 2500.0,
+    "category": "Transport",
+    "transaction_type": "EXPENSE",
+    "to_from": "Uber",
+    "description": "Trip",
+}]
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeSession:
+    def __init__(self, payload=None):
+        self.payload = payload
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult(self.payload)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_text_hash_ignores_whitespace_differences():
+    original = "01/03/2024  UBER TRIP   2,500.00 DR\n\n02/03/2024 SALARY 90,000.00 CR\n"
+    reexported = "  01/03/2024 UBER TRIP 2,500.00 DR\r\n02/03/2024\tSALARY 90,000.00 CR"
+
+    assert normalize_statement_text(original) == "01/03/2024 UBER TRIP 2,500.00 DR\n02/03/2024 SALARY 90,000.00 CR"
+    assert text_sha256(original) == text_sha256(reexported)
+    assert text_sha256(original) != text_sha256(original.replace("2,500.00", "2,600.00"))
+
+
+def test_file_sha256_matches_bytes_hash(tmp_path):
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(b"%PDF-1.4 statement")
+
+    import hashlib
+    assert file_sha256(str(path)) == hashlib.sha256(b"%PDF-1.4 statement").hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_get_returns_validated_transactions_and_counts_hits():
+    cache = ExtractionCacheService()
+
+    cached = await cache.get(FakeSession(payload=PAYLOAD), "user-1", RAW_KEY, "abc")
+
+    assert cached == [TransactionCreate(**PAYLOAD[0])]
+    assert cached[0].date == datetime.date(2024, 3, 1)
+    assert cache.hits == {RAW_KEY: 1, TEXT_KEY: 0}
+    assert cache.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_raw_then_text_miss_counts_one_miss():
+    cache = ExtractionCacheService()
+    db = FakeSession()
+
+    assert await cache.get(db, "user-1", RAW_KEY, "abc") is None
+    assert await cache.get(db, "user-1", TEXT_KEY, "def") is None
+
+    assert cache.misses == 1
+    assert sum(cache.hits.values()) == 0
+
+
+@pytest.mark.asyncio
+async def test_put_skips_empty_extractions():
+    db = FakeSession()
+
+    await ExtractionCacheService().put(db, "user-1", {RAW_KEY: "abc"}, [])
+
+    assert db.statements == [] and db.commits == 0
@@ -0,0 +1,385 @@
+import asyncio
+import datetime
+import io
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from fastapi import UploadFile
+
+import backend.services.ingestion_service as ingestion_service_module
+from backend.database.models.ingestion_job_model import IngestionStatusEnum
+from backend.schemas.ingestion_schema import IngestionBatchRead
+from backend.services.ingestion_service import (
+    IngestionWorkerPool,
+    TooManyFilesError,
+    UnsupportedStatementError,
+    UploadTooLargeError,
+    ingestion_service,
+    summarize_batch,
+)
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_bounds_concurrency():
+    in_flight = 0
+    max_in_flight = 0
+    processed = []
+
+    async def handler(job_id):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        processed.append(job_id)
+        in_flight -= 1
+
+    pool = IngestionWorkerPool(handler)
+    await pool.start(concurrency=2)
+    for i in range(6):
+        pool.submit(f"job-{i}")
+    pool.submit("job-0")  # already pending: ignored
+    await pool.join()
+    await pool.stop()
+
+    assert sorted(processed) == [f"job-{i}" for i in range(6)]
+    assert max_in_flight == 2
+    assert not pool.running
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_lets_handler_resubmit_for_retry():
+    calls = []
+
+    async def handler(job_id):
+        calls.append(job_id)
+        if len(calls) == 1:
+            pool.submit(job_id)
+        else:
+            raise RuntimeError("boom")  # logged, does not kill the worker
+
+    pool = IngestionWorkerPool(handler)
+    await pool.start(concurrency=1)
+    pool.submit("job-1")
+    await pool.join()
+    pool.submit("job-2")
+    await pool.join()
+    await pool.stop()
+
+    assert calls == ["job-1", "job-1", "job-2"]
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_its_sweep_periodically_until_stopped(monkeypatch):
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SWEEP_SECONDS", 0.01)
+    sweeps = []
+
+    async def sweep():
+        sweeps.append(len(sweeps))
+        if len(sweeps) == 1:
+            raise RuntimeError("database down")  # logged, the next sweep still runs
+
+    pool = IngestionWorkerPool(lambda job_id: None, sweep=sweep)
+    await pool.start(concurrency=1)
+    await asyncio.sleep(0.05)
+    await pool.stop()
+    swept = len(sweeps)
+    await asyncio.sleep(0.03)
+
+    assert swept >= 2
+    assert len(sweeps) == swept
+
+
+class JobSession(FakeSession):
+    """Claims any job and records the statements a job run executes."""
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar_one_or_none=lambda: self.job.job_id)
+
+    async def get(self, model, key):
+        return self.job
+
+
+@pytest.mark.asyncio
+async def test_job_interrupted_by_shutdown_is_requeued_without_using_an_attempt(monkeypatch, tmp_path):
+    spooled = tmp_path / "job-1"
+    spooled.write_bytes(b"statement")
+    job = SimpleNamespace(job_id="job-1", stage_timings={}, source_path=str(spooled))
+    db = JobSession(job)
+    extracting = asyncio.Event()
+
+    async def hang(db, job, timings):
+        extracting.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(ingestion_service_module, "AsyncSessionLocal", lambda: db)
+    monkeypatch.setattr(ingestion_service, "_extract_statement", hang)
+    task = asyncio.create_task(ingestion_service.process_job("job-1"))
+    await extracting.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    release = db.statements[-1].compile()
+    assert str(release).startswith("UPDATE ingestion_jobs SET status=")
+    assert release.params["status"] == IngestionStatusEnum.QUEUED
+    assert release.params["status_1"] == IngestionStatusEnum.RUNNING
+    assert "attempts=(ingestion_jobs.attempts - " in str(release)
+    assert db.commits == 2
+
+
+@pytest.mark.asyncio
+async def test_job_whose_spooled_file_is_missing_fails_without_retrying(monkeypatch, tmp_path):
+    job = SimpleNamespace(job_id="job-1", stage_timings={}, source_path=str(tmp_path / "on-another-host"))
+    db = JobSession(job)
+    submitted = []
+
+    async def extract(db, job, timings):
+        raise AssertionError("nothing to extract")
+
+    monkeypatch.setattr(ingestion_service_module, "AsyncSessionLocal", lambda: db)
+    monkeypatch.setattr(ingestion_service, "_extract_statement", extract)
+    monkeypatch.setattr(ingestion_service_module.ingestion_worker_pool, "submit_later", lambda *args: submitted.append(args))
+
+    await ingestion_service.process_job("job-1")
+
+    assert job.status == IngestionStatusEnum.FAILED
+    assert "INGESTION_SPOOL_DIR" in job.error
+    assert submitted == []
+
+
+def test_check_spool_dir_creates_it_and_refuses_unwritable_paths(monkeypatch, tmp_path):
+    spool = tmp_path / "spool"
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(spool))
+    ingestion_service.check_spool_dir()
+    assert spool.is_dir()
+
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(blocker / "spool"))
+    with pytest.raises(RuntimeError):
+        ingestion_service.check_spool_dir()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_submits_delayed_retries_and_drops_them_on_stop():
+    calls = []
+
+    async def handler(job_id):
+        calls.append(job_id)
+
+    pool = IngestionWorkerPool(handler)
+    await pool.start(concurrency=1)
+    pool.submit_later("job-1", 0.01)
+    pool.submit_later("job-2", 10)
+    await asyncio.sleep(0.05)
+    await pool.join()
+    await pool.stop()
+
+    assert calls == ["job-1"]
+    assert not pool._timers
+
+
+@pytest.mark.asyncio
+async def test_long_stage_keeps_heartbeating_the_job(monkeypatch):
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_HEARTBEAT_SECONDS", 0.01)
+    job = SimpleNamespace(job_id="job-1", stage=None, updated_at=None)
+    stage_db = FakeSession()
+    heartbeat_db = JobSession(job)
+    monkeypatch.setattr(ingestion_service_module, "AsyncSessionLocal", lambda: heartbeat_db)
+
+    timings = {}
+    async with ingestion_service._stage(stage_db, job, "extract", timings):
+        await asyncio.sleep(0.05)
+    beats = len(heartbeat_db.statements)
+    await asyncio.sleep(0.03)
+
+    assert beats >= 2 and heartbeat_db.commits == beats
+    assert "SET updated_at=" in str(heartbeat_db.statements[0])
+    # the heartbeat stops with the stage
+    assert len(heartbeat_db.statements) == beats
+    assert job.stage == "extract" and "extract" in timings
+
+
+@pytest.mark.asyncio
+async def test_categorize_releases_the_connection_before_asking_the_model(monkeypatch):
+    events = []
+
+    class OrderedSession(FakeSession):
+        async def commit(self):
+            events.append("commit")
+
+    async def categorize(db, user_id, transactions_in):
+        events.append("index")
+        return transactions_in, [0]
+
+    async def categorize_unresolved(transactions_in, unresolved):
+        events.append("model")
+        return transactions_in
+
+    monkeypatch.setattr(ingestion_service_module.merchant_index_service, "categorize", categorize)
+    monkeypatch.setattr(ingestion_service_module.transaction_service, "categorize_unresolved", categorize_unresolved)
+    job = SimpleNamespace(job_id="job-1", user_id="user-1", extraction_path="parser:gtbank", stage=None, updated_at=None)
+
+    await ingestion_service._categorize(OrderedSession(), job, ["row"], {})
+
+    # stage start, index read, then a commit before the model is awaited
+    assert events == ["commit", "index", "commit", "model"]
+
+
+@pytest.mark.asyncio
+async def test_enqueue_upload_spools_file_and_submits_job(monkeypatch, tmp_path):
+    submitted = []
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(ingestion_service_module.ingestion_worker_pool, "submit", submitted.append)
+    db = FakeSession()
+    upload = UploadFile(file=io.BytesIO(b"01/03/2024 UBER 2,500.00 DR\n"), filename="march.txt")
+
+    job = await ingestion_service.enqueue_upload(db, "user-1", upload)
+
+    assert db.added == [job] and db.commits == 1
+    assert job.status == IngestionStatusEnum.QUEUED
+    assert job.user_id == "user-1" and job.filename == "march.txt"
+    assert open(job.source_path, "rb").read() == b"01/03/2024 UBER 2,500.00 DR\n"
+    assert submitted == [job.job_id]
+
+
+@pytest.mark.asyncio
+async def test_enqueue_upload_rejects_unsupported_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(tmp_path))
+    upload = UploadFile(file=io.BytesIO(b"PK"), filename="statement.xlsx")
+
+    with pytest.raises(UnsupportedStatementError):
+        await ingestion_service.enqueue_upload(FakeSession(), "user-1", upload)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_enqueue_upload_rejects_oversized_files_without_keeping_them(monkeypatch, tmp_path):
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(ingestion_service_module, "UPLOAD_CHUNK_BYTES", 4)
+    monkeypatch.setattr(ingestion_service_module, "MAX_UPLOAD_BYTES", 10)
+    db = FakeSession()
+    upload = UploadFile(file=io.BytesIO(b"x" * 11), filename="statement.txt")
+
+    with pytest.raises(UploadTooLargeError):
+        await ingestion_service.enqueue_upload(db, "user-1", upload)
+    assert db.added == [] and list(tmp_path.iterdir()) == []
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_batch_queues_one_job_per_statement_including_zip_members(monkeypatch, tmp_path):
+    submitted = []
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(ingestion_service_module.ingestion_worker_pool, "submit", submitted.append)
+    db = FakeSession()
+    archive = _zip({
+        "2024/january.txt": b"january",
+        "2024/february.pdf": b"%PDF february",
+        "2024/notes.xlsx": b"PK",
+        "__MACOSX/2024/._january.txt": b"metadata",
+    })
+    files = [
+        UploadFile(file=io.BytesIO(archive), filename="statements.zip"),
+        UploadFile(file=io.BytesIO(b"march"), filename="march.txt"),
+        UploadFile(file=io.BytesIO(b"x"), filename="photo.png"),
+    ]
+
+    batch = await ingestion_service.enqueue_batch(db, "user-1", files)
+
+    assert sorted(job.filename for job in batch.jobs) == ["february.pdf", "january.txt", "march.txt"]
+    assert {job.batch_id for job in batch.jobs} == {batch.batch_id}
+    # all jobs are created in one commit and handed to the pool together
+    assert db.added == batch.jobs and db.commits == 1
+    assert submitted == [job.job_id for job in batch.jobs]
+    assert [rejected["filename"] for rejected in batch.rejected] == ["notes.xlsx", "photo.png"]
+    contents = {job.filename: open(job.source_path, "rb").read() for job in batch.jobs}
+    assert contents["january.txt"] == b"january" and contents["march.txt"] == b"march"
+    # the archive itself is not kept once unpacked
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+@pytest.mark.asyncio
+async def test_enqueue_batch_rejects_oversized_zip_members_and_broken_archives(monkeypatch, tmp_path):
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(ingestion_service_module.ingestion_worker_pool, "submit", lambda job_id: None)
+    monkeypatch.setattr(ingestion_service_module, "MAX_UPLOAD_BYTES", 10)
+    files = [
+        UploadFile(file=io.BytesIO(_zip({"big.txt": b"x" * 1000, "ok.txt": b"fine"})), filename="a.zip"),
+        UploadFile(file=io.BytesIO(b"not a zip"), filename="b.zip"),
+    ]
+
+    batch = await ingestion_service.enqueue_batch(FakeSession(), "user-1", files)
+
+    assert [job.filename for job in batch.jobs] == ["ok.txt"]
+    assert [rejected["filename"] for rejected in batch.rejected] == ["big.txt", "b.zip"]
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_enqueue_batch_refuses_too_many_statements_without_keeping_any(monkeypatch, tmp_path):
+    monkeypatch.setattr(ingestion_service_module, "INGESTION_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(ingestion_service_module, "MAX_BATCH_FILES", 2)
+    db = FakeSession()
+    files = [
+        UploadFile(file=io.BytesIO(b"one"), filename="one.txt"),
+        UploadFile(file=io.BytesIO(_zip({"two.txt": b"two", "three.txt": b"three"})), filename="more.zip"),
+    ]
+
+    with pytest.raises(TooManyFilesError):
+        await ingestion_service.enqueue_batch(db, "user-1", files)
+    assert db.added == [] and list(tmp_path.iterdir()) == []
+
+
+def test_summarize_batch_reports_status_and_totals():
+    def job(status, inserted=None, skipped=None):
+        return SimpleNamespace(
+            job_id=f"job-{status.name}", batch_id="batch-1", filename="s.pdf", status=status, stage=None,
+            stage_timings={}, extraction_path=None, rows_extracted=None, rows_inserted=inserted,
+            rows_skipped=skipped, attempts=1, error=None, created_at=datetime.datetime(2024, 1, 1),
+            started_at=None, finished_at=None,
+        )
+
+    done = [job(IngestionStatusEnum.SUCCEEDED, 40, 2), job(IngestionStatusEnum.FAILED)]
+    summary = IngestionBatchRead.model_validate(summarize_batch("batch-1", done), from_attributes=True)
+    assert (summary.status, summary.rows_inserted, summary.rows_skipped) == ("finished", 40, 2)
+    assert summary.jobs[1].status == "failed"
+
+    pending = summarize_batch("batch-1", done + [job(IngestionStatusEnum.RUNNING)])
+    assert pending["status"] == "running"
+
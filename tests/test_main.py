@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+IMPORT_SCRIPT = """
+import asyncio, sys
+
+def refuse(*args, **kwargs):
+    raise AssertionError("event loop started during import")
+
+asyncio.run = refuse
+import backend.main
+print("heavy:" + ",".join(m for m in ("google.genai", "pdfplumber") if m in sys.modules))
+"""
+
+
+def test_importing_the_app_does_no_io_and_defers_heavy_libraries():
+    # a fresh interpreter, so modules imported by other tests do not count; the
+    # database host is unreachable, which used to fail or stall the import
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), db_host="192.0.2.1", db_port="5432")
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True, text=True, env=env, timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "heavy:"
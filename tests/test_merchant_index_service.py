@@ -0,0 +1,152 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.database.models.transaction_model import TransactionTypeEnum
+from backend.schemas.transaction_schema import TransactionCreate
+from backend.services.merchant_index_service import (
+    USER,
+    MerchantIndex,
+    MerchantIndexService,
+    apply_merchant_index,
+    normalize_merchant,
+)
+from backend.services.session_hooks import run_commit_hooks
+
+
+class FakeSession:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.params = []
+        self.info = {}
+
+    async def execute(self, statement, params=None, *args, **kwargs):
+        self.statements.append(statement)
+        self.params.append(params)
+        return iter(self.results.pop(0) if self.results else [])
+
+    async def commit(self):
+        run_commit_hooks(self)
+
+
+def _tx(to_from, category="Miscellaneous", transaction_type="EXPENSE"):
+    return TransactionCreate(
+        date=datetime.date(2024, 3, 1),
+        amount=10.0,
+        category=category,
+        transaction_type=transaction_type,
+        to_from=to_from,
+        description=to_from,
+    )
+
+
+def test_normalize_merchant_drops_references_and_channel_words():
+    assert normalize_merchant("POS/WEB PURCHASE NETFLIX.COM 23849") == "netflix com"
+    assert normalize_merchant("TRF TO John Doe/0123456789") == "john doe"
+    assert normalize_merchant("Airtime MTN 08031234567") == "airtime mtn"
+    assert normalize_merchant("REF 998877") == ""
+    assert normalize_merchant(None) == ""
+
+
+def test_lookup_matches_longest_indexed_word_prefix():
+    index = MerchantIndex(version=0, entries={
+        ("netflix", "EXPENSE"): (9, "Subscriptions"),
+        ("shoprite", "EXPENSE"): (1, "Food & Groceries"),
+        ("shoprite lekki", "EXPENSE"): (4, "Shopping"),
+    })
+
+    assert index.lookup("NETFLIX.COM LAGOS NG", "EXPENSE") == (9, "Subscriptions")
+    assert index.lookup("POS SHOPRITE LEKKI 2231", "EXPENSE") == (4, "Shopping")
+    assert index.lookup("SHOPRITE IKEJA", "EXPENSE") == (1, "Food & Groceries")
+    assert index.lookup("NET", "EXPENSE") is None
+
+
+def test_apply_merchant_index_recategorizes_known_merchants_and_reports_the_rest():
+    index = MerchantIndex(version=0, entries={("uber", "EXPENSE"): (3, "Transport")})
+    transactions_in = [_tx("UBER TRIP 123"), _tx("New Cafe"), _tx("uber", category="Transport")]
+
+    categorized, unresolved = apply_merchant_index(index, transactions_in)
+
+    assert [tx.category for tx in categorized] == ["Transport", "Miscellaneous", "Transport"]
+    assert unresolved == [1]
+    assert categorized[2] is transactions_in[2]
+
+
+@pytest.mark.asyncio
+async def test_index_is_loaded_once_and_reloaded_after_learning():
+    service = MerchantIndexService()
+    db = FakeSession(
+        [SimpleNamespace(merchant_key="uber", transaction_type=TransactionTypeEnum.EXPENSE, category_id=3, category_name="Transport")],
+        [],
+        [SimpleNamespace(merchant_key="uber", transaction_type=TransactionTypeEnum.EXPENSE, category_id=5, category_name="Dining Out")],
+    )
+
+    first, _ = await service.categorize(db, "user-1", [_tx("UBER 1")])
+    second, _ = await service.categorize(db, "user-1", [_tx("UBER 2")])
+    await service.learn(
+        db,
+        "user-1",
+        [("Uber Eats 44", "EXPENSE", 5), ("UBER EATS", "EXPENSE", 5), ("UBER EATS", "EXPENSE", 3), ("4421", "EXPENSE", 3)],
+        source=USER,
+    )
+    # the learned rows are invisible to other sessions until they commit, so the index stays cached
+    uncommitted, _ = await service.categorize(db, "user-1", [_tx("UBER 3")])
+    await db.commit()
+    third, _ = await service.categorize(db, "user-1", [_tx("UBER 4")])
+
+    assert [tx.category for tx in first + second + uncommitted + third] == ["Transport", "Transport", "Transport", "Dining Out"]
+    assert len(db.statements) == 3
+    assert [(row["merchant_key"], row["category_id"]) for row in db.params[1]] == [("uber eats", 5)]
+    assert "ON CONFLICT (user_id, merchant_key, transaction_type) DO UPDATE" in str(db.statements[1].compile(dialect=postgresql.dialect()))
+    assert service.cache_stats()["rows_resolved"] == 4
+
+
+@pytest.mark.asyncio
+async def test_learned_assignments_never_overwrite_existing_entries():
+    db = FakeSession([])
+
+    await MerchantIndexService().learn(db, "user-1", [("Bolt", "EXPENSE", 3)])
+
+    assert "ON CONFLICT (user_id, merchant_key, transaction_type) DO NOTHING" in str(db.statements[0].compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_a_counterparty_paid_and_paying_keeps_a_category_per_type():
+    service = MerchantIndexService()
+    db = FakeSession([], [
+        SimpleNamespace(merchant_key="acme ltd", transaction_type=TransactionTypeEnum.EXPENSE, category_id=6, category_name="Shopping"),
+        SimpleNamespace(merchant_key="acme ltd", transaction_type=TransactionTypeEnum.INCOME, category_id=8, category_name="Salary"),
+    ])
+
+    await service.learn(db, "user-1", [("ACME LTD", "EXPENSE", 6), ("ACME LTD", TransactionTypeEnum.INCOME, 8)], source=USER)
+    categorized, unresolved = await service.categorize(db, "user-1", [
+        _tx("ACME LTD 0042", transaction_type="EXPENSE"),
+        _tx("ACME LTD PAYROLL", transaction_type="INCOME"),
+    ])
+
+    assert [(row["merchant_key"], row["transaction_type"], row["category_id"]) for row in db.params[0]] == [
+        ("acme ltd", "EXPENSE", 6),
+        ("acme ltd", "INCOME", 8),
+    ]
+    assert [tx.category for tx in categorized] == ["Shopping", "Salary"]
+    assert unresolved == []
+
+
+@pytest.mark.asyncio
+async def test_rebuild_votes_per_merchant_and_type():
+    db = FakeSession([
+        SimpleNamespace(user_id="user-1", to_from="ACME LTD", transaction_type=TransactionTypeEnum.EXPENSE, category_id=6, uses=3),
+        SimpleNamespace(user_id="user-1", to_from="ACME LTD", transaction_type=TransactionTypeEnum.INCOME, category_id=8, uses=1),
+        SimpleNamespace(user_id="user-1", to_from="ACME LTD 77", transaction_type=TransactionTypeEnum.INCOME, category_id=6, uses=2),
+    ])
+
+    written = await MerchantIndexService().rebuild(db, "user-1")
+
+    assert written == 2
+    assert [(row["merchant_key"], row["transaction_type"], row["category_id"]) for row in db.params[2]] == [
+        ("acme ltd", "EXPENSE", 6),
+        ("acme ltd", "INCOME", 6),
+    ]
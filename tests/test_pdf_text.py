@@ -0,0 +1,59 @@
+from backend.services import pdf_text
+from backend.services.pdf_text import extract_page_range, iter_pdf_pages
+from tests.pdf_factory import make_table_pdf
+
+HEADER = ["Date", "Reference", "Debit", "Credit", "Balance", "Remarks"]
+
+
+def _statement(tmp_path, pages):
+    rows = [["02-Mar-2024", f"REF{i}", "2,500.00", "", "60,000.00", f"PAGE {i // 5}"] for i in range(pages * 5)]
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(make_table_pdf(HEADER, rows, rows_per_page=5))
+    return str(path)
+
+
+def test_extract_page_range_returns_requested_pages(tmp_path):
+    path = _statement(tmp_path, 6)
+
+    texts = extract_page_range(path, 2, 4)
+
+    assert len(texts) == 2
+    assert "PAGE 2" in texts[0] and "PAGE 3" in texts[1]
+
+
+def test_process_pool_reassembles_pages_in_order(tmp_path):
+    path = _statement(tmp_path, 11)
+    try:
+        pooled = list(iter_pdf_pages(path, processes=2, pages_per_task=3, min_parallel_pages=1))
+    finally:
+        pdf_text.shutdown_pdf_executor()
+
+    assert pooled == list(iter_pdf_pages(path, processes=1))
+    assert [f"PAGE {i}" in text for i, text in enumerate(pooled)] == [True] * 11
+
+
+def test_small_pdfs_stay_in_thread(tmp_path, monkeypatch):
+    path = _statement(tmp_path, 3)
+
+    def no_pool(processes):
+        raise AssertionError("small PDFs must not start the process pool")
+
+    monkeypatch.setattr(pdf_text, "_get_executor", no_pool)
+
+    assert len(list(iter_pdf_pages(path, processes=4, min_parallel_pages=16))) == 3
+
+
+def test_executor_is_created_once_under_concurrent_first_use():
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            executors = list(threads.map(lambda _: pdf_text._get_executor(2), range(32)))
+        first = executors[0]
+        assert all(executor is first for executor in executors)
+
+        # asking for another size must not shut down the pool other readers are using
+        assert pdf_text._get_executor(3) is not first
+        assert first.submit(sum, [1, 2]).result() == 3
+    finally:
+        pdf_text.shutdown_pdf_executor()
@@ -0,0 +1,93 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.database.models.transaction_model import TransactionTypeEnum
+from backend.services.data_version_service import data_version_service
+from backend.services.rollup_service import aggregate_rollup_deltas, rollup_service
+
+
+def _tx(day, amount, category_id=1, transaction_type="EXPENSE"):
+    return SimpleNamespace(
+        user_id="user-123",
+        date=day,
+        amount=amount,
+        category_id=category_id,
+        transaction_type=transaction_type,
+    )
+
+
+def test_aggregate_rollup_deltas_groups_by_month_category_and_type():
+    rows = aggregate_rollup_deltas([
+        _tx(datetime.date(2024, 1, 3), 10.0),
+        _tx(datetime.date(2024, 1, 28), 15.5),
+        _tx(datetime.date(2024, 2, 1), 7.0),
+        _tx(datetime.date(2024, 1, 5), 100.0, category_id=2, transaction_type=TransactionTypeEnum.INCOME),
+    ])
+
+    by_key = {(r["year"], r["month"], r["category_id"], r["transaction_type"]): r for r in rows}
+    assert len(rows) == 3
+    assert by_key[(2024, 1, 1, "EXPENSE")]["total_amount"] == 25.5
+    assert by_key[(2024, 1, 1, "EXPENSE")]["transaction_count"] == 2
+    assert by_key[(2024, 2, 1, "EXPENSE")]["transaction_count"] == 1
+    assert by_key[(2024, 1, 2, "INCOME")]["total_amount"] == 100.0
+
+
+def test_aggregate_rollup_deltas_empty_input():
+    assert aggregate_rollup_deltas([]) == []
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(stmt)
+        return SimpleNamespace(rowcount=7)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_rollup_upsert_writes_rows_in_primary_key_order():
+    db = RecordingSession()
+
+    await rollup_service.apply_transactions(db, [
+        _tx(datetime.date(2024, 3, 1), 5.0, category_id=2),
+        _tx(datetime.date(2024, 1, 1), 5.0, category_id=9),
+        _tx(datetime.date(2024, 1, 1), 5.0, category_id=2, transaction_type="INCOME"),
+        _tx(datetime.date(2024, 1, 1), 5.0, category_id=2),
+    ])
+
+    params = db.statements[0].compile(dialect=postgresql.dialect()).params
+    written = [
+        (params[f"month_m{i}"], params[f"category_id_m{i}"], params[f"transaction_type_m{i}"])
+        for i in range(4)
+    ]
+    # statement order would lock (3, 2) before (1, 9); key order is the same for every writer
+    assert written == [(1, 2, "EXPENSE"), (1, 2, "INCOME"), (1, 9, "EXPENSE"), (3, 2, "EXPENSE")]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_bumps_the_rebuilt_users_data_version_in_the_same_commit():
+    data_version_service.response_cache.set(("user-123", 4, "/transactions/summary"), {"total": 1})
+    db = RecordingSession()
+
+    assert await rollup_service.rebuild(db, "user-123") == 7
+
+    bump = db.statements[2].compile()
+    assert str(bump).startswith("UPDATE users SET data_version=")
+    assert bump.params["user_id_1"] == "user-123"
+    assert db.commits == 1
+    assert data_version_service.response_cache.get(("user-123", 4, "/transactions/summary")) is None
+
+    everyone = RecordingSession()
+    await rollup_service.rebuild(everyone)
+    assert "WHERE" not in str(everyone.statements[2])
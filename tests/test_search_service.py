@@ -0,0 +1,114 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.database.models.transaction_model import TransactionTypeEnum
+from backend.services.search_service import EmptySearchQueryError, SearchService, to_prefix_tsquery
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+
+class FakeSession:
+    def __init__(self, *results, scalars=()):
+        self.results = list(results)
+        self.scalars = list(scalars)
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult(self.results.pop(0))
+
+    async def scalar(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return self.scalars.pop(0)
+
+
+def _row(rank=0.5):
+    return SimpleNamespace(
+        transaction_id="tx-1",
+        date=datetime.date(2024, 3, 1),
+        amount=12.5,
+        transaction_type=TransactionTypeEnum.EXPENSE,
+        category_name="Transport",
+        to_from="UBER *TRIP",
+        description="Card payment",
+        rank=rank,
+    )
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_prefix_tsquery_keeps_only_words():
+    assert to_prefix_tsquery("Netfl") == "netfl:*"
+    assert to_prefix_tsquery("costa  coffee!") == "costa:* & coffee:*"
+    assert to_prefix_tsquery("a' | !b:*") == "a:* & b:*"
+    assert to_prefix_tsquery("&|!()") == ""
+
+
+def test_fulltext_query_uses_the_owner_key_and_stored_vector():
+    sql = _sql(SearchService().build_search_query("user-123", "uber", 20, 40))
+
+    assert "ARRAY[transactions.user_id] @> ARRAY[" in sql
+    assert "transactions.search_vector @@ to_tsquery('simple'::regconfig" in sql
+    assert "ORDER BY ts_rank(transactions.search_vector" in sql
+    assert "LIMIT" in sql and "OFFSET" in sql
+
+
+def test_empty_query_is_rejected():
+    with pytest.raises(EmptySearchQueryError):
+        SearchService().build_search_query("user-123", "!!", 20)
+
+
+@pytest.mark.asyncio
+async def test_search_returns_ranked_items_without_fallback_when_fulltext_matches():
+    service = SearchService()
+    db = FakeSession([_row(0.0607927), _row()])
+
+    items, has_more, mode = await service.search_transactions(db, "user-123", "uber", limit=1)
+
+    assert mode == "fulltext" and has_more
+    assert items[0]["to_from"] == "UBER *TRIP" and items[0]["rank"] == 0.0608
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_trigram_matching_when_nothing_matches():
+    service = SearchService()
+    db = FakeSession([], [_row()], scalars=[1])
+
+    items, has_more, mode = await service.search_transactions(db, "user-123", "netflx", limit=20)
+
+    assert mode == "fuzzy" and len(items) == 1 and not has_more
+    assert "word_similarity" in _sql(db.statements[-1])
+
+
+@pytest.mark.asyncio
+async def test_search_past_the_last_fulltext_page_does_not_switch_to_fuzzy():
+    service = SearchService()
+    service.trigram_available = True
+    db = FakeSession([], scalars=["tx-1"])
+
+    items, has_more, mode = await service.search_transactions(db, "user-123", "uber", limit=20, offset=100)
+
+    assert (items, has_more, mode) == ([], False, "fulltext")
+
+
+@pytest.mark.asyncio
+async def test_search_without_pg_trgm_stays_fulltext():
+    service = SearchService()
+    db = FakeSession([], scalars=[0])
+
+    items, _, mode = await service.search_transactions(db, "user-123", "netflx", limit=20)
+
+    assert items == [] and mode == "fulltext"
+    assert service.trigram_available is False
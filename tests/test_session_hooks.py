@@ -0,0 +1,28 @@
+from sqlalchemy.orm import Session
+
+from backend.services.session_hooks import on_commit
+
+
+def test_hooks_run_on_commit_only():
+    calls = []
+    session = Session()
+    session.begin()
+    on_commit(session, lambda: calls.append("committed"), on_rollback=lambda: calls.append("rolled back"))
+    session.commit()
+    session.commit()  # an empty follow-up commit does not run them again
+
+    assert calls == ["committed"]
+
+
+def test_hooks_survive_a_savepoint_and_are_discarded_with_the_transaction():
+    calls = []
+    session = Session()
+    session.begin()
+    on_commit(session, lambda: calls.append("committed"), on_rollback=lambda: calls.append("rolled back"))
+    savepoint = session.begin_nested()
+    savepoint.rollback()
+    assert calls == []
+
+    session.rollback()
+
+    assert calls == ["rolled back"]
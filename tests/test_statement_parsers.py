@@ -0,0 +1,59 @@
+import datetime
+
+import pytest
+
+from backend.schemas.transaction_schema import TransactionTypeEnum
+from backend.services.statement_parsers import (
+    STATEMENT_PARSERS,
+    layout_fingerprint,
+    parse_statement_tables,
+)
+from backend.services.transaction_service import transaction_service
+from tests.pdf_factory import make_table_pdf
+
+GTBANK_HEADER = ["Trans. Date", "Value Date", "Reference", "Debits", "Credits", "Balance", "Originating Branch", "Remarks"]
+
+
+def _gtbank_rows(count):
+    rows = [["01-Mar-2024", "", "", "", "", "50,000.00", "", "Opening Balance"]]
+    for i in range(count):
+        debit, credit = ("2,500.00", "") if i % 2 else ("", "10,000.00")
+        rows.append(["02-Mar-2024", "02-Mar-2024", f"REF{i}", debit, credit, "60,000.00", "Lekki", f"POS UBER TRIP {i}"])
+    return rows
+
+
+def test_fingerprint_normalizes_case_and_whitespace():
+    assert layout_fingerprint([" Trans.  Date", "DEBITS\n", None]) == "trans. date|debits|"
+    assert layout_fingerprint(GTBANK_HEADER) in STATEMENT_PARSERS
+
+
+def test_registered_layout_is_parsed_across_pages(tmp_path):
+    path = tmp_path / "gtbank.pdf"
+    path.write_bytes(make_table_pdf(GTBANK_HEADER, _gtbank_rows(45), rows_per_page=20, repeat_header=False))
+
+    parsed = parse_statement_tables(str(path))
+
+    assert parsed.parser == "gtbank"
+    assert len(parsed.transactions) == 45  # opening balance row skipped
+    first, second = parsed.transactions[:2]
+    assert first.date == datetime.date(2024, 3, 2)
+    assert first.transaction_type == TransactionTypeEnum.INCOME and first.amount == 10000.0
+    assert first.category == "Income"
+    assert second.transaction_type == TransactionTypeEnum.EXPENSE and second.amount == 2500.0
+    assert second.category == "Miscellaneous"
+    assert second.to_from == second.description == "POS UBER TRIP 1"
+
+
+def test_unknown_layout_falls_back(tmp_path):
+    path = tmp_path / "unknown.pdf"
+    path.write_bytes(make_table_pdf(["Date", "Narration", "Amount"], [["02-Mar-2024", "Uber", "2,500.00"]]))
+
+    assert parse_statement_tables(str(path)) is None
+
+
+@pytest.mark.asyncio
+async def test_text_statements_skip_table_parsing(tmp_path):
+    path = tmp_path / "statement.txt"
+    path.write_text("02-Mar-2024 UBER 2,500.00 DR\n")
+
+    assert await transaction_service.parse_statement_tables(str(path), "statement.txt") is None
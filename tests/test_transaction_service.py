@@ -0,0 +1,606 @@
+import asyncio
+import datetime
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.database.models.transaction_model import TransactionTypeEnum
+import backend.services.transaction_service as transaction_service_module
+from backend.services.transaction_service import (
+    PAGE_BREAK,
+    DuplicateTransactionError,
+    InvalidCursorError,
+    StatementChunk,
+    TransactionFilter,
+    UnknownQueryFieldError,
+    _month_bounds,
+    assign_fingerprints,
+    build_transaction_query,
+    decode_cursor,
+    encode_cursor,
+    merge_chunk_results,
+    split_statement_text,
+    transaction_fingerprint,
+    transaction_service,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from tests.pdf_factory import make_table_pdf
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def all(self):
+        return list(self._rows)
+
+
+class FakeSession:
+    def __init__(self, rows=None, scalar_value=None):
+        self.rows = rows or []
+        self.scalar_value = scalar_value
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+    async def scalar(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return self.scalar_value
+
+
+def test_month_bounds_rolls_over_december():
+    assert _month_bounds(3, 2024) == (datetime.date(2024, 3, 1), datetime.date(2024, 4, 1))
+    assert _month_bounds(12, 2024) == (datetime.date(2024, 12, 1), datetime.date(2025, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_income_summary_reads_monthly_rollups():
+    db = FakeSession(scalar_value=1250.5)
+
+    summary = await transaction_service.get_income_summary(db, "user-123")
+
+    assert summary == {"total_income": 1250.5}
+    sql = str(db.statements[0])
+    assert "sum(monthly_rollups.total_amount)" in sql
+    assert "FROM monthly_rollups" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_summary_builds_totals_from_grouped_rows():
+    db = FakeSession(rows=[
+        SimpleNamespace(transaction_type=TransactionTypeEnum.INCOME, category_name="Income", total=3000.0),
+        SimpleNamespace(transaction_type=TransactionTypeEnum.EXPENSE, category_name="Transport", total=120.0),
+        SimpleNamespace(transaction_type=TransactionTypeEnum.EXPENSE, category_name="Dining Out", total=80.0),
+    ])
+
+    summary = await transaction_service.get_summary(
+        db, "user-123", start_date=datetime.date(2024, 1, 1), end_date=datetime.date(2024, 2, 1)
+    )
+
+    assert summary["total_income"] == 3000.0
+    assert summary["total_expense"] == 200.0
+    assert summary["income_by_category"] == {"Income": 3000.0}
+    assert summary["expense_by_category"] == {"Transport": 120.0, "Dining Out": 80.0}
+    assert len(db.statements) == 1
+    assert "FROM monthly_rollups" in str(db.statements[0])
+
+
+@pytest.mark.asyncio
+async def test_get_summary_uses_raw_rows_for_partial_month_windows():
+    db = FakeSession(rows=[])
+
+    await transaction_service.get_summary(
+        db, "user-123", start_date=datetime.date(2024, 1, 15), end_date=datetime.date(2024, 2, 1)
+    )
+
+    sql = str(db.statements[0])
+    assert "sum(transactions.amount)" in sql
+    assert "monthly_rollups" not in sql
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    cursor = encode_cursor(datetime.date(2024, 5, 17), "tx-abc")
+
+    assert decode_cursor(cursor) == (datetime.date(2024, 5, 17), "tx-abc")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_cursor_page_uses_keyset_and_skips_count():
+    rows = [
+        SimpleNamespace(
+            transaction_id=f"tx-{i}",
+            description="Coffee",
+            date=datetime.date(2024, 5, 20 - i),
+            amount=4.5,
+            transaction_type=TransactionTypeEnum.EXPENSE,
+            category_name="Dining Out",
+        )
+        for i in range(3)
+    ]
+    db = FakeSession(rows=rows)
+    cursor = encode_cursor(datetime.date(2024, 5, 21), "tx-z")
+
+    items, total, next_cursor = await transaction_service.list_transactions(
+        db, "user-123", 2, cursor=cursor, include_total=False
+    )
+
+    assert [item["transaction_id"] for item in items] == ["tx-0", "tx-1"]
+    assert total is None
+    assert decode_cursor(next_cursor) == (datetime.date(2024, 5, 19), "tx-1")
+    assert len(db.statements) == 1
+    sql = str(db.statements[0])
+    assert "OFFSET" not in sql
+    assert "(transactions.date, transactions.transaction_id) <" in sql
+
+
+def test_transaction_query_binds_every_filter_and_projects_requested_columns():
+    filters = TransactionFilter(
+        start_date=datetime.date(2024, 1, 1),
+        end_date=datetime.date(2024, 2, 1),
+        transaction_types=("EXPENSE",),
+        category_ids=(7, 3, 7),
+        min_amount=20,
+        counterparty="50%_off",
+    )
+
+    compiled = build_transaction_query("user-123", filters, ["amount", "category_id"], 50).compile(
+        dialect=postgresql.dialect()
+    )
+    sql = str(compiled)
+
+    assert sql.startswith(
+        "SELECT transactions.date AS date, transactions.transaction_id AS transaction_id, "
+        "transactions.amount AS amount, transactions.category_id AS category_id \nFROM transactions \nWHERE"
+    )
+    assert "JOIN categories" not in sql and "description" not in sql
+    assert "transactions.category_id = ANY (" in sql
+    assert "50" not in sql and "EXPENSE" not in sql
+    assert compiled.params["param_1"] == [3, 7]
+    assert "%50\\%\\_off%" in compiled.params.values()
+
+
+def test_transaction_query_text_does_not_depend_on_how_many_categories():
+    one = build_transaction_query("user-123", TransactionFilter(category_ids=(1,)), ["amount"], 50)
+    many = build_transaction_query("user-123", TransactionFilter(category_ids=(1, 2, 3, 4)), ["amount"], 50)
+    both_types = build_transaction_query(
+        "user-123", TransactionFilter(transaction_types=("INCOME", "EXPENSE")), ["amount"], 50
+    )
+
+    assert str(one.compile(dialect=postgresql.dialect())) == str(many.compile(dialect=postgresql.dialect()))
+    assert "transaction_type" not in str(both_types)
+
+
+def test_transaction_query_rejects_unknown_fields():
+    with pytest.raises(UnknownQueryFieldError):
+        build_transaction_query("user-123", TransactionFilter(), ["amount", "password"], 50)
+
+
+@pytest.mark.asyncio
+async def test_query_transactions_returns_only_requested_fields_with_a_cursor():
+    rows = [
+        SimpleNamespace(transaction_id=f"tx-{i}", date=datetime.date(2024, 5, 20 - i), amount=4.5)
+        for i in range(3)
+    ]
+    db = FakeSession(rows=rows)
+
+    items, next_cursor = await transaction_service.query_transactions(
+        db, "user-123", TransactionFilter(), ["amount"], limit=2
+    )
+
+    assert items == [{"amount": 4.5}, {"amount": 4.5}]
+    assert decode_cursor(next_cursor) == (datetime.date(2024, 5, 19), "tx-1")
+    assert len(db.statements) == 1
+
+
+class FakeBulkSession(FakeSession):
+    """Echoes back the ids of inserted transaction rows whose fingerprint is not in `stored`."""
+
+    def __init__(self, driver="asyncpg", stored=()):
+        super().__init__()
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(driver=driver))
+        self.params = []
+        self.committed = False
+        self.info = {}
+        self.stored = set(stored)
+
+    async def execute(self, statement, params=None, *args, **kwargs):
+        self.params.append(params)
+        self.statements.append(statement)
+        if isinstance(params, list) and params and "fingerprint" in params[0]:
+            inserted = [row for row in params if row["fingerprint"] not in self.stored]
+            return FakeResult([SimpleNamespace(transaction_id=row["transaction_id"]) for row in inserted])
+        return FakeResult([])
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_write_transactions_bulk_resolves_categories_once_and_inserts_in_one_statement(monkeypatch):
+    from backend.services.category_service import CategoryService
+    from backend.schemas.transaction_schema import TransactionCreate
+
+    lookups = []
+
+    async def fake_resolve(self, db, user_id, names):
+        names = list(names)
+        lookups.append(names)
+        return {"transport": 1, "dining out": 2}
+
+    monkeypatch.setattr(CategoryService, "resolve_category_ids", fake_resolve)
+    db = FakeBulkSession()
+    transactions_in = [
+        TransactionCreate(
+            date="2024-03-0%d" % (i + 1),
+            amount=10.0 + i,
+            category="Transport" if i % 2 else "Dining Out",
+            transaction_type="EXPENSE",
+            to_from="Merchant",
+            description="Card payment",
+        )
+        for i in range(5)
+    ]
+
+    written = await transaction_service.write_transactions_bulk(db, transactions_in, "user-123")
+
+    assert written == 5
+    assert len(lookups) == 1
+    assert "ON CONFLICT (user_id, fingerprint) DO NOTHING" in str(db.statements[0].compile(dialect=postgresql.dialect()))
+    # one multi-row transactions insert, one rollup upsert, one merchant index upsert and the data version bump
+    assert len(db.statements) == 4
+    assert "INSERT INTO transactions" in str(db.statements[0])
+    assert [row["category_id"] for row in db.params[0]] == [2, 1, 2, 1, 2]
+    assert "monthly_rollups" in str(db.statements[1])
+    assert "merchant_categories" in str(db.statements[2])
+    # every row has the same counterparty, so it is learned once under its most common category
+    assert [(row["merchant_key"], row["category_id"]) for row in db.params[2]] == [("merchant", 2)]
+    assert "UPDATE users SET data_version" in str(db.statements[3])
+    assert db.committed
+
+
+@pytest.mark.asyncio
+async def test_write_transactions_bulk_files_blank_categories_under_the_catch_all(monkeypatch):
+    from backend.services.category_service import CategoryService
+    from backend.schemas.transaction_schema import TransactionCreate
+
+    async def fake_resolve(self, db, user_id, names):
+        return {"miscellaneous": 11, "transport": 1}
+
+    monkeypatch.setattr(CategoryService, "resolve_category_ids", fake_resolve)
+    db = FakeBulkSession()
+    transactions_in = [
+        TransactionCreate(date="2024-03-01", amount=3.0, category=" ", transaction_type="EXPENSE", to_from="Kiosk", description="Snacks"),
+        TransactionCreate(date="2024-03-02", amount=9.0, category="Transport", transaction_type="EXPENSE", to_from="Uber", description="Ride"),
+    ]
+
+    assert await transaction_service.write_transactions_bulk(db, transactions_in, "user-123") == 2
+    assert [row["category_id"] for row in db.params[0]] == [11, 1]
+    # the catch-all says nothing about the merchant, so only Uber is learned
+    assert [row["merchant_key"] for row in db.params[2]] == ["uber"]
+
+
+class ManualSession(FakeBulkSession):
+    """Savepoint inserts collide with fingerprints a concurrent identical entry commits first."""
+
+    def __init__(self, taken):
+        super().__init__()
+        self.taken = set(taken)
+        self.added = []
+
+    async def execute(self, statement, params=None, *args, **kwargs):
+        if "SELECT transactions.fingerprint" in str(statement):
+            self.statements.append(statement)
+            return SimpleNamespace(scalars=lambda: list(self.stored))
+        return await super().execute(statement, params, *args, **kwargs)
+
+    def add(self, obj):
+        self.added.append(obj.fingerprint)
+
+    def begin_nested(self):
+        session = self
+
+        class Savepoint:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, exc_type, exc, tb):
+                fingerprint = session.added[-1]
+                if exc_type is None and fingerprint in session.taken:
+                    # the other entry commits while this insert waits on the unique index
+                    session.stored.add(fingerprint)
+                    raise IntegrityError(
+                        "INSERT INTO transactions", {},
+                        Exception('duplicate key value violates unique constraint "uq_transactions_user_fingerprint"'),
+                    )
+                return False
+
+        return Savepoint()
+
+
+async def _manual_entry(monkeypatch, db):
+    from backend.services.category_service import CategoryService
+
+    async def fake_resolve(self, db, user_id, names):
+        return {"dining out": 2}
+
+    monkeypatch.setattr(CategoryService, "resolve_category_ids", fake_resolve)
+    return await transaction_service.create_transaction(db, _statement_rows()[0], "user-123")
+
+
+def _coffee(occurrence):
+    return transaction_fingerprint("user-123", datetime.date(2024, 3, 1), 4.5, "EXPENSE", "Cafe", "Coffee", occurrence)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_manual_entries_take_the_next_occurrence(monkeypatch):
+    db = ManualSession(taken=[_coffee(0)])
+    tx = await _manual_entry(monkeypatch, db)
+
+    assert await transaction_service.write_transactions_to_db(db, [tx], "user-123")
+
+    assert db.added == [_coffee(0), _coffee(1)]
+    assert tx.fingerprint == _coffee(1)
+    assert db.committed
+
+
+@pytest.mark.asyncio
+async def test_manual_entry_that_keeps_colliding_is_reported_as_a_duplicate(monkeypatch):
+    monkeypatch.setattr(transaction_service_module, "MANUAL_FINGERPRINT_ATTEMPTS", 2)
+    db = ManualSession(taken=[_coffee(0), _coffee(1)])
+    tx = await _manual_entry(monkeypatch, db)
+
+    with pytest.raises(DuplicateTransactionError):
+        await transaction_service.write_transactions_to_db(db, [tx], "user-123")
+    assert not db.committed
+
+
+def _statement_rows():
+    from backend.schemas.transaction_schema import TransactionCreate
+
+    return [
+        TransactionCreate(date="2024-03-01", amount=4.5, category="Dining Out", transaction_type="EXPENSE", to_from="Cafe", description="Coffee"),
+        TransactionCreate(date="2024-03-01", amount=4.5, category="Dining Out", transaction_type="EXPENSE", to_from="CAFE ", description="coffee"),
+        TransactionCreate(date="2024-03-02", amount=20.0, category="Transport", transaction_type="EXPENSE", to_from="Uber", description="Ride"),
+    ]
+
+
+def test_fingerprints_are_deterministic_and_number_same_day_repeats():
+    first = assign_fingerprints("user-1", _statement_rows())
+    again = assign_fingerprints("user-1", _statement_rows())
+
+    assert first == again
+    # the two coffees differ only in case and whitespace, so they are repeats of one transaction
+    assert first[0] == transaction_fingerprint("user-1", datetime.date(2024, 3, 1), 4.5, "EXPENSE", "cafe", "COFFEE")
+    assert first[1] == transaction_fingerprint("user-1", datetime.date(2024, 3, 1), 4.5, "EXPENSE", "cafe", "COFFEE", 1)
+    assert len(set(first)) == 3
+    assert assign_fingerprints("user-2", _statement_rows())[0] != first[0]
+
+
+@pytest.mark.asyncio
+async def test_write_transactions_bulk_skips_rows_already_stored(monkeypatch):
+    from backend.services.category_service import CategoryService
+
+    async def fake_resolve(self, db, user_id, names):
+        return {"dining out": 2, "transport": 1}
+
+    monkeypatch.setattr(CategoryService, "resolve_category_ids", fake_resolve)
+    # an overlapping earlier upload already stored the first coffee
+    db = FakeBulkSession(stored=assign_fingerprints("user-123", _statement_rows()[:1]))
+
+    written = await transaction_service.write_transactions_bulk(db, _statement_rows(), "user-123")
+
+    assert written == 2
+    rollup_params = db.statements[1].compile(dialect=postgresql.dialect()).params
+    assert sum(value for key, value in rollup_params.items() if key.startswith("transaction_count")) == 2
+
+
+@pytest.mark.asyncio
+async def test_write_transactions_bulk_writes_nothing_else_when_every_row_is_stored(monkeypatch):
+    from backend.services.category_service import CategoryService
+
+    async def fake_resolve(self, db, user_id, names):
+        return {"dining out": 2, "transport": 1}
+
+    monkeypatch.setattr(CategoryService, "resolve_category_ids", fake_resolve)
+    db = FakeBulkSession(stored=assign_fingerprints("user-123", _statement_rows()))
+
+    written = await transaction_service.write_transactions_bulk(db, _statement_rows(), "user-123")
+
+    assert written == 0
+    # no rollup change and no data version bump, so cached summaries stay valid
+    assert len(db.statements) == 1
+    assert db.committed
+
+
+class FakeGenaiModels:
+    """Stands in for genai.Client().aio.models: one transaction per "PAGE n" marker in the prompt text."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_content(self, model, contents, config):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            text_to_parse = contents.split("Text to parse:", 1)[1]
+            pages = [int(n) for n in re.findall(r"PAGE (\d+)", text_to_parse)]
+            payload = [
+                {
+                    "date": f"2024-01-{page:02d}",
+                    "amount": 100 + page,
+                    "category": "Transport",
+                    "transaction_type": "EXPENSE",
+                    "to_from": f"Merchant {page}",
+                    "description": f"Ride {page}",
+                }
+                for page in pages
+            ]
+            return SimpleNamespace(text=json.dumps(payload))
+        finally:
+            self.in_flight -= 1
+
+
+class FakeGenaiClient:
+    def __init__(self, delay=0.0):
+        self.aio = SimpleNamespace(models=FakeGenaiModels(delay))
+
+
+def _statement(pages):
+    return PAGE_BREAK.join(f"PAGE {n}\nheader line\nfooter line" for n in range(1, pages + 1))
+
+
+def test_split_statement_text_is_page_aligned_with_overlap_context():
+    chunks = split_statement_text(_statement(7), pages_per_chunk=3, overlap_lines=2)
+
+    assert [chunk.index for chunk in chunks] == [0, 1, 2]
+    assert "PAGE 1" in chunks[0].text and "PAGE 3" in chunks[0].text and "PAGE 4" not in chunks[0].text
+    assert "PAGE 7" in chunks[2].text
+    assert chunks[0].context == ""
+    assert chunks[1].context == "header line\nfooter line"
+
+
+def test_merge_chunk_results_drops_only_boundary_duplicates():
+    def tx(description):
+        return transaction_service_module.TransactionCreate(
+            date="2024-01-05", amount=20, category="Transport",
+            transaction_type="EXPENSE", to_from="Uber", description=description,
+        )
+
+    chunks = [
+        StatementChunk(index=0, text="..."),
+        StatementChunk(index=1, text="...", context="05/01/2024 uber trip 20.00"),
+    ]
+    merged = merge_chunk_results(chunks, [
+        [tx("Uber trip"), tx("Uber trip")],
+        [tx("Uber trip"), tx("Lunch")],
+    ])
+
+    # the first chunk's same-day repeat stays; the re-extracted context line is dropped
+    assert [t.description for t in merged] == ["Uber trip", "Uber trip", "Lunch"]
+
+
+@pytest.mark.asyncio
+async def test_extraction_runs_chunks_concurrently_with_bounded_parallelism(monkeypatch):
+    fake_client = FakeGenaiClient(delay=0.2)
+    monkeypatch.setattr(transaction_service_module, "client", fake_client)
+    monkeypatch.setattr(transaction_service_module, "STATEMENT_CHUNK_PAGES", 2)
+    monkeypatch.setattr(transaction_service_module, "STATEMENT_CHUNK_CONCURRENCY", 3)
+
+    started = time.perf_counter()
+    transactions = await transaction_service.extraction_transactions_from_text(_statement(12))
+    elapsed = time.perf_counter() - started
+
+    assert [tx.date.day for tx in transactions] == list(range(1, 13))
+    assert fake_client.aio.models.calls == 6
+    assert fake_client.aio.models.max_in_flight == 3
+    # 6 chunks at 3-way parallelism take ~2 rounds, not 6
+    assert elapsed < 6 * 0.2
+
+
+@pytest.mark.asyncio
+async def test_gemini_calls_are_bounded_across_concurrent_statements(monkeypatch):
+    import weakref
+
+    fake_client = FakeGenaiClient(delay=0.05)
+    monkeypatch.setattr(transaction_service_module, "client", fake_client)
+    monkeypatch.setattr(transaction_service_module, "STATEMENT_CHUNK_PAGES", 1)
+    monkeypatch.setattr(transaction_service_module, "STATEMENT_CHUNK_CONCURRENCY", 4)
+    monkeypatch.setattr(transaction_service_module, "GEMINI_MAX_CONCURRENCY", 3)
+    monkeypatch.setattr(transaction_service_module, "_gemini_slots", weakref.WeakKeyDictionary())
+
+    results = await asyncio.gather(*(
+        transaction_service.extraction_transactions_from_text(_statement(4)) for _ in range(3)
+    ))
+
+    assert [len(transactions) for transactions in results] == [4, 4, 4]
+    # three statements at 4 chunks each would run 12 calls at once without the global limit
+    assert fake_client.aio.models.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_cancels_the_statements_other_chunks(monkeypatch):
+    class FailingFirstChunk(FakeGenaiModels):
+        async def generate_content(self, model, contents, config):
+            if "PAGE 1\n" in contents.split("Text to parse:", 1)[1]:
+                raise ValueError("model returned garbage")
+            return await super().generate_content(model, contents, config)
+
+    fake_client = FakeGenaiClient()
+    fake_client.aio.models = FailingFirstChunk(delay=5)
+    monkeypatch.setattr(transaction_service_module, "client", fake_client)
+    monkeypatch.setattr(transaction_service_module, "STATEMENT_CHUNK_PAGES", 1)
+    monkeypatch.setattr(transaction_service_module, "STATEMENT_CHUNK_RETRIES", 0)
+
+    started = time.perf_counter()
+    with pytest.raises(ValueError):
+        await transaction_service.extraction_transactions_from_text(_statement(4))
+
+    assert time.perf_counter() - started < 1
+    # the slow chunks were started, then cancelled rather than left holding model slots
+    assert fake_client.aio.models.calls >= 2
+    assert fake_client.aio.models.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_extraction_times_out_slow_model_calls(monkeypatch):
+    monkeypatch.setattr(transaction_service_module, "client", FakeGenaiClient(delay=5))
+    monkeypatch.setattr(transaction_service_module, "GEMINI_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(transaction_service_module, "STATEMENT_CHUNK_RETRIES", 0)
+
+    with pytest.raises(TimeoutError):
+        await transaction_service.extraction_transactions_from_text(_statement(1))
+
+
+PEAK_RSS_SCRIPT = """
+import resource, sys
+from backend.services.transaction_service import iter_statement_pages
+for _ in iter_statement_pages(sys.argv[1], "statement.pdf"):
+    pass
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def _peak_rss_kb(path):
+    # a fresh interpreter per run, so ru_maxrss reflects this statement alone; pages are
+    # read in-process (no pool) so the parent's RSS covers all of the parsing
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), PDF_WORKER_PROCESSES="1")
+    result = subprocess.run(
+        [sys.executable, "-c", PEAK_RSS_SCRIPT, str(path)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def test_pdf_page_reading_peak_rss_is_independent_of_page_count(tmp_path):
+    header = ["Date", "Reference", "Debit", "Credit", "Balance", "Remarks"]
+    row = ["02-Mar-2024", "REF", "2,500.00", "", "60,000.00", "POS UBER TRIP"]
+    small, large = tmp_path / "small.pdf", tmp_path / "large.pdf"
+    small.write_bytes(make_table_pdf(header, [row] * 10 * 30, rows_per_page=30))
+    large.write_bytes(make_table_pdf(header, [row] * 100 * 30, rows_per_page=30))
+
+    growth_kb = _peak_rss_kb(large) - _peak_rss_kb(small)
+
+    # keeping every page's parse state alive would cost several MB per page here
+    assert growth_kb < 40 * 1024, f"peak RSS grew {growth_kb} KB for 10x the pages"
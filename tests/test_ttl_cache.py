@@ -0,0 +1,51 @@
+from backend.services import ttl_cache
+from backend.services.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    clock.now += 10
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    clock.now += 60
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_per_entry_ttl_is_capped_and_non_positive_ttl_skips(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    cache.set("long", 1, ttl=3600)
+    cache.set("expired", 2, ttl=-1)
+    clock.now += 61
+
+    assert cache.get("long") is None
+    assert cache.get("expired") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,67 @@
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from backend.middleware.upload_limit import UploadSizeLimitMiddleware
+
+LIMIT = 1024
+
+
+def _client():
+    app = FastAPI()
+    received = []
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        body = await request.body()
+        received.append(len(body))
+        return {"bytes": len(body)}
+
+    @app.post("/other")
+    async def other(request: Request):
+        return {"bytes": len(await request.body())}
+
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=LIMIT, paths=("/upload",))
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test"), received
+
+
+@pytest.mark.asyncio
+async def test_oversized_content_length_is_rejected_before_the_body_is_read():
+    client, received = _client()
+    async with client:
+        response = await client.post("/upload", content=b"x" * (LIMIT + 1))
+        within = await client.post("/upload", content=b"x" * LIMIT)
+
+    assert response.status_code == 413
+    assert within.status_code == 200 and within.json() == {"bytes": LIMIT}
+    # only the request within the limit reached the route
+    assert received == [LIMIT]
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_without_length_is_cut_off_once_it_passes_the_limit():
+    client, received = _client()
+    sent = 0
+
+    async def chunks():
+        nonlocal sent
+        for _ in range(10):
+            sent += 512
+            yield b"x" * 512
+
+    async with client:
+        response = await client.post("/upload", content=chunks())
+
+    assert response.status_code == 413
+    assert received == []
+    assert sent < 10 * 512
+
+
+@pytest.mark.asyncio
+async def test_other_paths_are_not_limited():
+    client, _ = _client()
+    async with client:
+        response = await client.post("/other", content=b"x" * (LIMIT * 4))
+
+    assert response.status_code == 200 and response.json() == {"bytes": LIMIT * 4}
@@ -1,8 +1,24 @@
+import asyncio
+import threading
+
 import pytest
 from datetime import timedelta
 from fastapi import HTTPException
 
-from backend.services.user_service import user_service, User
+from backend.services.user_service import (
+    AuthenticatedUser,
+    PasswordHashExecutor,
+    PasswordHashingBusyError,
+    User,
+    user_service,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_auth_caches():
+    user_service.clear_caches()
+    yield
+    user_service.clear_caches()
 
 
 def test_hash_and_verify_password_round_trip():
@@ -41,7 +57,14 @@ async def test_get_current_user_returns_user(monkeypatch):
 
     user = await user_service.get_current_user(token=token, db=None)
 
-    assert user is fake_user
+    assert user == AuthenticatedUser(
+        user_id="user-123",
+        email="demo@example.com",
+        first_name="Demo",
+        last_name="User",
+        create_date=None,
+    )
+    assert not isinstance(user, User)
 
 
 @pytest.mark.asyncio
@@ -55,3 +78,74 @@ async def test_get_current_user_raises_on_invalid_token(monkeypatch):
         await user_service.get_current_user(token="invalid.token.value", db=None)
 
     assert excinfo.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_is_cached_until_invalidated(monkeypatch):
+    fake_user = User(user_id="user-123", email="demo@example.com", password="hashed", first_name="Demo", last_name="User")
+    token = user_service.create_access_token(fake_user.user_id, expires_delta=timedelta(minutes=5))
+    lookups = []
+
+    async def fake_get_user_by_id(db, user_id):
+        lookups.append(user_id)
+        return fake_user
+
+    monkeypatch.setattr(user_service, "get_user_by_id", fake_get_user_by_id)
+    before = user_service.cache_stats()
+
+    first = await user_service.get_current_user(token=token, db=None)
+    for _ in range(2):
+        assert await user_service.get_current_user(token=token, db=None) is first
+    assert first.user_id == "user-123"
+    assert lookups == ["user-123"]
+
+    user_service.invalidate_user("user-123")
+    await user_service.get_current_user(token=token, db=None)
+
+    assert lookups == ["user-123", "user-123"]
+    after = user_service.cache_stats()
+    assert after["db_queries_avoided"] - before["db_queries_avoided"] == 2
+    assert after["tokens"]["hits"] - before["tokens"]["hits"] == 3
+    assert after["tokens"]["misses"] - before["tokens"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_user_is_not_cached(monkeypatch):
+    token = user_service.create_access_token("ghost", expires_delta=timedelta(minutes=5))
+
+    async def fake_get_user_by_id(db, user_id):
+        return None
+
+    monkeypatch.setattr(user_service, "get_user_by_id", fake_get_user_by_id)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await user_service.get_current_user(token=token, db=None)
+    assert user_service.cache_stats()["users"]["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_run_off_the_event_loop():
+    hashed = await user_service.hash_password_async("S3cureP@ss!")
+
+    assert await user_service.verify_password_async("S3cureP@ss!", hashed) is True
+    assert await user_service.verify_password_async("wrong", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_password_hash_executor_sheds_load_past_queue_limit():
+    executor = PasswordHashExecutor(workers=1, max_pending=2)
+    release = threading.Event()
+
+    def slow_hash():
+        release.wait(5)
+        return "hashed"
+
+    running = [asyncio.create_task(executor.run(slow_hash)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHashingBusyError):
+        await executor.run(slow_hash)
+    release.set()
+    assert await asyncio.gather(*running) == ["hashed", "hashed"]
+    assert executor.rejected == 1 and executor.pending == 0